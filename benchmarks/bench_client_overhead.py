@@ -0,0 +1,85 @@
+"""Measure per-request overhead of the API client with the network stubbed.
+
+Everything `APIClient` does around the HTTP call is timed: building
+headers and url, serializing the payload, parsing the response and
+validating the model.
+
+Usage:
+    python benchmarks/bench_client_overhead.py [requests]
+"""
+import sys
+import time
+from unittest import mock
+from uuid import uuid4
+
+from gencove.client import APIClient
+from gencove.serialization import dumps_payload
+
+PROJECT_ID = str(uuid4())
+
+
+class Response:
+    """Stubbed `requests.Response`."""
+
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+
+def run(label, call, response, requests):
+    """Time `requests` calls and print time per request."""
+    with mock.patch("gencove.client.get", return_value=response), mock.patch(
+        "gencove.client.post", return_value=response
+    ):
+        call()
+        start = time.perf_counter()
+        for _ in range(requests):
+            call()
+        elapsed = time.perf_counter() - start
+    print(
+        "{:<30} {:>8.1f}us/request".format(
+            label, elapsed / requests * 1000000
+        )
+    )
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    api_client = APIClient("https://api.example.com")
+    api_client.set_api_key("key")
+    empty_page = Response(
+        dumps_payload({"meta": {"next": None}, "results": []})
+    )
+    run(
+        "get (raw)",
+        lambda: api_client._get(  # pylint: disable=protected-access
+            "/api/v2/projects/", authorized=True
+        ),
+        empty_page,
+        requests,
+    )
+    run(
+        "get_project_samples",
+        lambda: api_client.get_project_samples(PROJECT_ID),
+        empty_page,
+        requests,
+    )
+    run(
+        "get_project_samples (lazy)",
+        lambda: api_client.get_project_samples(PROJECT_ID, lazy=True),
+        empty_page,
+        requests,
+    )
+    run(
+        "post",
+        lambda: api_client._post(  # pylint: disable=protected-access
+            "/api/v2/sample-sheet/", {"id": PROJECT_ID}, authorized=True
+        ),
+        Response(b"{}"),
+        requests,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compare validated and lazy models on a synthetic project samples listing.
+
+Usage:
+    python benchmarks/bench_lazy_models.py [rows]
+"""
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+from gencove.command.projects.samples.utils import get_line
+from gencove.models import LazyModel, ProjectSamples
+
+
+def build_page(rows):
+    """Build a raw API response with the given number of samples."""
+    return {
+        "meta": {"count": rows, "next": None, "previous": None},
+        "results": [
+            {
+                "id": str(uuid4()),
+                "created": "2020-07-28T12:46:22.719862Z",
+                "modified": "2020-07-28T12:46:22.719862Z",
+                "client_id": "client-{}".format(idx),
+                "physical_id": None,
+                "legacy_id": None,
+                "last_status": {
+                    "id": str(uuid4()),
+                    "status": "succeeded",
+                    "note": "",
+                    "created": "2020-07-28T12:46:22.719862Z",
+                },
+                "archive_last_status": {
+                    "id": str(uuid4()),
+                    "status": "available",
+                    "created": "2020-07-28T12:46:22.719862Z",
+                    "transition_cutoff": "2020-08-28T12:46:22.719862Z",
+                },
+                "files": [
+                    {
+                        "id": str(uuid4()),
+                        "s3_path": "bucket/path/file.vcf.gz",
+                        "size": 1000,
+                        "download_url": "https://foo.com/file.vcf.gz",
+                        "file_type": "impute-vcf",
+                    }
+                ],
+            }
+            for idx in range(rows)
+        ],
+    }
+
+
+def run(build, page):
+    """Build the response models and print lines like list-samples does."""
+    response = build(page)
+    return [get_line(sample) for sample in response.results]
+
+
+def measure(name, build, page):
+    """Print time and peak memory of building and printing the listing.
+
+    Memory is traced in a separate run as tracing skews the timing.
+    """
+    start = time.perf_counter()
+    lines = run(build, page)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run(build, page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        "{:<10} {:>8.2f}s {:>10.1f}MB peak ({} rows)".format(
+            name, elapsed, peak / 1024 / 1024, len(lines)
+        )
+    )
+
+
+def main():
+    """Run benchmark."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    page = build_page(rows)
+    measure("validated", lambda data: ProjectSamples(**data), page)
+    measure("lazy", lambda data: LazyModel(ProjectSamples, data), page)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measure CLI startup time.
+
+Runs `gencove --version` and `gencove webhooks --help` in fresh
+interpreters and reports the median wall time of each. Exits with status 1
+if a median is above the given limit, so it can be used to guard against
+startup regressions.
+
+Usage:
+    python benchmarks/bench_startup.py [runs] [max_ms]
+"""
+import statistics
+import subprocess  # nosec
+import sys
+import time
+
+COMMANDS = [
+    ["--version"],
+    ["webhooks", "--help"],
+]
+
+
+def measure(args, runs):
+    """Return median wall time of a python invocation in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(  # nosec
+            [sys.executable] + args,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_ms = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    baseline = measure(["-c", "pass"], runs)
+    print("{:<30} {:>8.1f}ms".format("python (no gencove)", baseline))
+    failed = False
+    for args in COMMANDS:
+        median = measure(["-m", "gencove.cli"] + args, runs)
+        print("{:<30} {:>8.1f}ms".format("gencove " + " ".join(args), median))
+        if max_ms is not None and median > max_ms:
+            failed = True
+    if failed:
+        print("Startup is slower than {}ms".format(max_ms))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
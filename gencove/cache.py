@@ -0,0 +1,121 @@
+"""On-disk cache of API responses.
+
+Every entry is a file named after the hash of its request. Entries are
+written to a temporary file and renamed in place, so several processes can
+share the cache directory without locking: readers see either the old or
+the new entry, never a partial one. File modification time is refreshed
+on every hit and least recently used entries are removed once the cache
+grows over its size limit. The directory is scanned for entries to evict
+on the first write of a process and then every few writes, so the cache
+can briefly exceed the limit by that many entries.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from gencove.serialization import dumps, loads
+
+# bytes kept in the cache directory before least recently used entries
+# are removed
+CACHE_MAX_SIZE = 50 * 1024 * 1024
+# writes between scans of the cache directory for entries to evict
+EVICT_EVERY_WRITES = 20
+CACHE_SUFFIX = ".json"
+
+
+class ResponseCache:
+    """Cache of parsed API responses in a directory.
+
+    Args:
+        directory (str): where entries are stored, created if missing
+        max_size (int, optional): bytes kept before entries are evicted
+        evict_every (int, optional): writes between evictions
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_size=CACHE_MAX_SIZE,
+        evict_every=EVICT_EVERY_WRITES,
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self.evict_every = evict_every
+        self._writes = 0
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        """Hash request parts, i.e. url and query parameters, into a key."""
+        data = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """Return cached entry or None.
+
+        Returns:
+            dict: `body` of the response, `etag` if the server sent one and
+                `stored`, the timestamp of the last response from the server
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                entry = loads(entry_file.read())
+            os.utime(path)
+        except (OSError, ValueError):
+            # missing, evicted by another process or corrupted
+            return None
+        if not isinstance(entry, dict) or "body" not in entry:
+            return None
+        return entry
+
+    def set(self, key, body, etag=None):
+        """Store response body, replacing previous entry."""
+        data = dumps({"stored": time.time(), "etag": etag, "body": body})
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as entry_file:
+                entry_file.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # cache is an optimization, failing to write must not fail
+            # the command
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        if self._writes % self.evict_every == 0:
+            self.evict()
+        self._writes += 1
+
+    def evict(self):
+        """Remove least recently used entries over the size limit."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.name.endswith(CACHE_SUFFIX):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                total += stat.st_size
+        if total <= self.max_size:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                # already removed by another process
+                pass
+            total -= size
+            if total <= self.max_size:
+                return
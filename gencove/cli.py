@@ -1,29 +1,66 @@
 """Python library which enables you to use Gencoves' research backend."""
+import importlib
+import sys
+import types
+
 import click
 
 from gencove import version
-from gencove.command.basespace import basespace
-from gencove.command.download import download
-from gencove.command.projects import projects
-from gencove.command.samples import samples
-from gencove.command.upload import upload
-from gencove.command.uploads import uploads
-from gencove.command.webhook import webhooks
 
+# command name: (module, attribute), modules are imported only when the
+# command is invoked
+COMMANDS = {
+    "basespace": ("gencove.command.basespace", "basespace"),
+    "download": ("gencove.command.download", "download"),
+    "upload": ("gencove.command.upload", "upload"),
+    "uploads": ("gencove.command.uploads", "uploads"),
+    "projects": ("gencove.command.projects", "projects"),
+    "samples": ("gencove.command.samples", "samples"),
+    "webhooks": ("gencove.command.webhook", "webhooks"),
+}
+
+
+def load_command(name):
+    """Import command module and return the command."""
+    module_name, attribute = COMMANDS[name]
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class LazyGroup(click.Group):
+    """Group which imports its subcommands when they are used."""
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(COMMANDS))
 
-@click.group()
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in COMMANDS:
+            self.add_command(load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup)
 @click.version_option(version=version.version())
 def cli():
     """Gencove's command line interface."""
 
 
-cli.add_command(basespace)
-cli.add_command(download)
-cli.add_command(upload)
-cli.add_command(uploads)
-cli.add_command(projects)
-cli.add_command(samples)
-cli.add_command(webhooks)
+# pylint: disable=too-few-public-methods
+class _CommandsModule(types.ModuleType):
+    """Module which keeps `from gencove.cli import <command>` working.
+
+    Commands are imported on first attribute access. Module level
+    `__getattr__` would do the same, but needs Python 3.7.
+    """
+
+    def __getattr__(self, name):
+        if name in COMMANDS:
+            return load_command(name)
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(self.__name__, name)
+        )
+
+
+sys.modules[__name__].__class__ = _CommandsModule
 
 
 if __name__ == "__main__":
@@ -3,15 +3,13 @@
 Exclude imports from linters due to install aliases breaking the rules.
 """
 
-import datetime
-import json
+import hashlib
+import os
 import time
-from uuid import UUID
 from builtins import str as text  # noqa
+from functools import lru_cache
 from urllib.parse import parse_qs, urljoin, urlparse
 
-from pydantic import BaseModel
-
 from requests import (  # pylint: disable=W0622
     ConnectTimeout,
     ConnectionError,
@@ -19,8 +17,10 @@ from requests import (  # pylint: disable=W0622
     get,
     post,
 )
+from requests.exceptions import ChunkedEncodingError
 
 from gencove import constants  # noqa: I100
+from gencove.cache import ResponseCache
 from gencove.constants import (
     SampleArchiveStatus,
     SampleAssignmentStatus,
@@ -36,6 +36,7 @@ from gencove.models import (
     BaseSpaceProject,
     BatchDetail,
     CreateJWT,
+    LazyModel,
     PipelineCapabilities,
     Project,
     ProjectBatchTypes,
@@ -43,6 +44,7 @@ from gencove.models import (
     ProjectMergeVCFs,
     ProjectSamples,
     Projects,
+    ResponseMeta,
     SampleDetails,
     SampleMetadata,
     SampleQC,
@@ -51,26 +53,15 @@ from gencove.models import (
     UploadSamples,
     UploadsPostData,
 )
+from gencove.serialization import (  # noqa: F401 pylint: disable=W0611
+    CustomEncoder,
+    JSONObjectStream,
+    dumps_payload,
+    loads,
+)
 from gencove.version import version as cli_version
 
 
-class CustomEncoder(json.JSONEncoder):
-    """JSON encoder that knows how to encode `datetime`, `UUID`
-    and `pydantic.BaseModel` objects.
-    """
-
-    # pylint: disable=method-hidden
-    def default(self, o):
-        """Override default method of JSONEncoder."""
-        if isinstance(o, datetime.datetime):
-            return o.isoformat()
-        if isinstance(o, BaseModel):
-            return {**o.dict(exclude_unset=True), **o.dict(exclude_none=True)}
-        if isinstance(o, UUID):
-            return str(o)
-        return json.JSONEncoder.default(self, o)
-
-
 class APIError(Exception):
     """Base API Error."""
 
@@ -115,6 +106,111 @@ class APIClientTimeout(APIClientError):
     """
 
 
+@lru_cache(maxsize=None)
+def default_headers():
+    """Headers sent with every request.
+
+    Computed once per process, returned as tuple of pairs so it can be
+    shared between threads.
+    """
+    return (
+        ("content-type", "application/json"),
+        ("date", None),
+        ("Gencove-cli-version", cli_version()),
+    )
+
+
+# pylint: disable=too-few-public-methods
+class StreamedPage:
+    """Paginated API response parsed while it is being read.
+
+    `results` is a generator of models, so only one result is held in
+    memory at a time. `meta` is available right away if the API sends it
+    before the results, otherwise once the results have been consumed.
+
+    If the connection is interrupted while the response is read, the page
+    is requested again with `reopen` and results which were already
+    returned are skipped.
+
+    Args:
+        response (requests.Response): streamed response
+        model (BaseModel): paginated response model, i.e. ProjectSamples
+        lazy (bool): return `LazyModel` instead of validated models
+        reopen (callable, optional): returns the response again
+    """
+
+    def __init__(self, response, model, lazy=False, reopen=None):
+        self._item_model = model.__fields__["results"].type_
+        self._lazy = lazy
+        self._reopen = reopen
+        self._meta = None
+        self._stream = JSONObjectStream(self._iter_chunks(response))
+        self._items = self._iter_items(response)
+        self.results = self._iter_results()
+
+    @staticmethod
+    def _iter_chunks(response):
+        try:
+            yield from response.iter_content(
+                chunk_size=constants.STREAM_CHUNK_SIZE
+            )
+        except (ConnectionError, ChunkedEncodingError, ReadTimeout):
+            raise APIClientTimeout(  # pylint: disable=W0707
+                "API server connection was interrupted"
+            )
+        finally:
+            response.close()
+
+    def _iter_items(self, response):
+        read = 0
+        retries = 0
+        while True:
+            try:
+                for index, item in enumerate(self._stream):
+                    # returned before the page was requested again
+                    if index < read:
+                        continue
+                    read += 1
+                    yield item
+                break
+            except APIClientTimeout:
+                if self._reopen is None or retries >= constants.STREAM_RETRIES:
+                    raise
+                retries += 1
+                echo_debug(
+                    "Page was interrupted after {} results, reading it again",
+                    read,
+                )
+                response.close()
+                time.sleep(retries)
+                response = self._reopen()
+                self._stream = JSONObjectStream(self._iter_chunks(response))
+        # parser stops at the end of the document, release connection
+        response.close()
+
+    def _iter_results(self):
+        for item in self._items:
+            if self._lazy:
+                yield LazyModel(self._item_model, item)
+            else:
+                yield self._item_model(**item)
+
+    @property
+    def meta(self):
+        """Response meta, reads the rest of the response if needed."""
+        if self._meta is None:
+            if "meta" not in self._stream.fields:
+                for _ in self._items:
+                    pass
+            data = self._stream.fields.get("meta") or {}
+            self._meta = (
+                LazyModel(ResponseMeta, data)
+                if self._lazy
+                else ResponseMeta(**data)
+            )
+        return self._meta
+
+
 # pylint: disable=too-many-public-methods
 class APIClient:
     """Gencove API client."""
@@ -127,13 +223,17 @@ class APIClient:
         self._jwt_refresh_token = None
         self._api_key = None
         self.host = host if host is not None else constants.HOST
+        # responses are cached per user, the token changes on every login
+        self._cache_identity = None
+        cache_dir = os.environ.get("GENCOVE_CACHE_DIR")
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
 
     @staticmethod
     def _serialize_post_payload(payload):
-        return json.dumps(payload, cls=CustomEncoder)
+        return dumps_payload(payload)
 
     # pylint: disable=bad-option-value,bad-continuation,too-many-arguments
-    # pylint: disable=too-many-branches
+    # pylint: disable=too-many-branches,too-many-locals
     def _request(
         self,
         endpoint="",
@@ -142,13 +242,11 @@ class APIClient:
         custom_headers=None,
         timeout=60,
         sensitive=False,
+        stream=False,
+        raw=False,
     ):
         url = urljoin(text(self.host), text(endpoint))
-        headers = {
-            "content-type": "application/json",
-            "date": None,
-            "Gencove-cli-version": cli_version(),
-        }
+        headers = dict(default_headers())
         if custom_headers:
             headers.update(custom_headers)
 
@@ -156,16 +254,20 @@ class APIClient:
             params = {}
 
         echo_debug(
-            "Contacting url: {} with payload: {}".format(
-                url, "[SENSITIVE CONTENT]" if sensitive else params
-            )
+            "Contacting url: {} with payload: {}",
+            url,
+            "[SENSITIVE CONTENT]" if sensitive else params,
         )
         start = time.time()
 
         try:
             if method == "get":
                 response = get(
-                    url=url, params=params, headers=headers, timeout=timeout
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                    stream=stream,
                 )
             else:
                 post_payload = APIClient._serialize_post_payload(params)
@@ -190,23 +292,40 @@ class APIClient:
                 "API server did not respond in timely manner"
             )
 
-        echo_debug(
-            "API response is {} status is {} in {}ms".format(
-                "[SENSITIVE CONTENT]" if sensitive else response.content,
+        if stream and 200 <= response.status_code < 300:
+            echo_debug(
+                "API response is streamed, status is {} in {}ms",
                 response.status_code,
                 (time.time() - start) * 1000,
             )
+            return response
+
+        if raw and (
+            200 <= response.status_code < 300 or response.status_code == 304
+        ):
+            echo_debug(
+                "API response status is {} in {}ms",
+                response.status_code,
+                (time.time() - start) * 1000,
+            )
+            return response
+
+        echo_debug(
+            "API response is {} status is {} in {}ms",
+            "[SENSITIVE CONTENT]" if sensitive else response.content,
+            response.status_code,
+            (time.time() - start) * 1000,
         )
 
         # pylint: disable=no-member
         if response.status_code >= 200 and response.status_code < 300:
-            return response.json() if response.text else {}
+            return loads(response.content) if response.content else {}
 
         http_error_msg = ""
         if 400 <= response.status_code < 500:
             http_error_msg = "API Client Error: {}".format(response.reason)
-            if response.text:
-                response_json = response.json()
+            if response.content:
+                response_json = loads(response.content)
                 if "detail" in response_json:
                     http_error_msg += ": {}".format(response_json["detail"])
                 else:
@@ -295,17 +414,43 @@ class APIClient:
         sensitive=False,
         refreshed=False,
         model=None,
+        lazy=False,
+        stream=False,
+        cache_ttl=None,
     ):
         headers = {} if not authorized else self._get_authorization()
         try:
-            response = self._request(
-                endpoint,
-                params=query_params,
-                method="get",
-                timeout=timeout,
-                custom_headers=headers,
-                sensitive=sensitive,
-            )
+            if cache_ttl and self.cache is not None and not stream:
+                response = self._cached_request(
+                    endpoint, query_params, timeout, headers, cache_ttl
+                )
+            else:
+                response = self._request(
+                    endpoint,
+                    params=query_params,
+                    method="get",
+                    timeout=timeout,
+                    custom_headers=headers,
+                    sensitive=sensitive,
+                    stream=stream,
+                )
+            if stream:
+                return StreamedPage(
+                    response,
+                    model,
+                    lazy,
+                    reopen=lambda: self._request(
+                        endpoint,
+                        params=query_params,
+                        method="get",
+                        timeout=timeout,
+                        custom_headers=headers,
+                        sensitive=sensitive,
+                        stream=stream,
+                    ),
+                )
+            if model and lazy:
+                return LazyModel(model, response)
             if model:
                 return model(**response)
             return response
@@ -320,12 +465,52 @@ class APIClient:
                     sensitive,
                     True,
                     model,
+                    lazy,
+                    stream,
+                    cache_ttl,
                 )
 
             raise err
 
+    # pylint: disable=too-many-arguments
+    def _cached_request(self, endpoint, params, timeout, headers, ttl):
+        """Get response from the cache or the API.
+
+        Entries younger than ttl are used without contacting the API, older
+        entries are revalidated with their ETag if the server sent one.
+        """
+        key = ResponseCache.key(
+            self.host, endpoint, params, self._cache_identity
+        )
+        entry = self.cache.get(key)
+        if entry is not None and time.time() - entry["stored"] < ttl:
+            echo_debug("Using cached response for {}", endpoint)
+            return entry["body"]
+        if entry is not None and entry.get("etag"):
+            headers = dict(headers)
+            headers["If-None-Match"] = entry["etag"]
+        response = self._request(
+            endpoint,
+            params=params,
+            method="get",
+            timeout=timeout,
+            custom_headers=headers,
+            raw=True,
+        )
+        if response.status_code == 304:
+            echo_debug("Cached response for {} is still valid", endpoint)
+            body = entry["body"]
+            etag = response.headers.get("ETag") or entry["etag"]
+        else:
+            body = loads(response.content) if response.content else {}
+            etag = response.headers.get("ETag")
+        self.cache.set(key, body, etag)
+        return body
+
     @staticmethod
-    def _add_query_params(next_link, query_params=None, limit=200):
+    def _add_query_params(
+        next_link, query_params=None, limit=constants.PAGE_SIZE
+    ):
         if not query_params:
             query_params = {}
         query_params.update({"offset": 0, "limit": limit})
@@ -338,6 +523,9 @@ class APIClient:
     def set_api_key(self, api_key):
         """Set api key on this instance."""
         self._api_key = api_key
+        self._cache_identity = hashlib.sha256(
+            api_key.encode("utf-8")
+        ).hexdigest()
 
     def refresh_token(self, refresh_token):
         """Refresh jwt token."""
@@ -361,6 +549,7 @@ class APIClient:
         """Log user in."""
         jwt = self.get_jwt(email, password)
         self._set_jwt(jwt.access, jwt.refresh)
+        self._cache_identity = email
 
     def get_upload_details(self, gncv_file_path):
         """Get file upload details.
@@ -395,11 +584,28 @@ class APIClient:
         sample_archive_status=SampleArchiveStatus.ALL.value,
         sort_by=SampleSortBy.MODIFIED.value,
         sort_order=SortOrder.DESC.value,
+        lazy=False,
+        stream=False,
+        limit=None,
     ):
-        """List single project's associated samples."""
+        """List single project's associated samples.
+
+        If lazy is True, results are returned as `LazyModel` objects which
+        validate fields only when they are accessed.
+
+        If stream is True, a `StreamedPage` is returned: results are parsed
+        one by one while the response is read, which allows for larger
+        pages without holding whole page in memory.
+
+        If limit is not set, default page size is used.
+        """
         project_endpoint = self.endpoints.PROJECT_SAMPLES.value.format(
             id=project_id
         )
+        if limit is None:
+            limit = (
+                constants.STREAMED_PAGE_SIZE if stream else constants.PAGE_SIZE
+            )
         params = self._add_query_params(
             next_link,
             {
@@ -409,12 +615,15 @@ class APIClient:
                 "status": sample_status,
                 "archive_status": sample_archive_status,
             },
+            limit=limit,
         )
         return self._get(
             project_endpoint,
             query_params=params,
             authorized=True,
             model=ProjectSamples,
+            lazy=lazy,
+            stream=stream,
         )
 
     def add_samples_to_project(self, samples, project_id, metadata=None):
@@ -464,6 +673,7 @@ class APIClient:
         next_link=None,
         sort_by=SampleSheetSortBy.CREATED.value,
         sort_order=SortOrder.DESC.value,
+        lazy=False,
     ):
         """Fetch user samples.
 
@@ -475,6 +685,8 @@ class APIClient:
                 response['meta']['next'].
             sort_by(str): upload fastq field to sort by
             sort_order(str): asc or desc sorting
+            lazy(bool): return `LazyModel` which validates fields only
+                when they are accessed
         """
         params = self._add_query_params(
             next_link,
@@ -490,6 +702,7 @@ class APIClient:
             query_params=params,
             authorized=True,
             model=SampleSheet,
+            lazy=lazy,
         )
 
     def list_projects(self, next_link=None):
@@ -531,6 +744,7 @@ class APIClient:
             self.endpoints.PIPELINE_CAPABILITES.value.format(id=pipeline_id),
             authorized=True,
             model=PipelineCapabilities,
+            cache_ttl=constants.PIPELINE_CAPABILITIES_CACHE_TTL,
         )
         return resp
 
@@ -545,6 +759,7 @@ class APIClient:
             query_params=params,
             authorized=True,
             model=ProjectBatchTypes,
+            cache_ttl=constants.PROJECT_BATCH_TYPES_CACHE_TTL,
         )
 
     def get_project_batches(self, project_id, next_link=None):
@@ -690,6 +905,7 @@ class APIClient:
             query_params=params,
             authorized=True,
             model=BaseSpaceProject,
+            cache_ttl=constants.BASESPACE_PROJECTS_CACHE_TTL,
         )
 
     def list_biosamples(self, basespace_project_id, next_link=None):
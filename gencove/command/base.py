@@ -99,6 +99,6 @@ class Command(object):  # pylint: disable=R0205
         echo_error(msg, **kwargs)
 
     @staticmethod
-    def echo_debug(msg, **kwargs):
+    def echo_debug(msg, *args, **kwargs):
         """Output debug message."""
-        echo_debug(msg, **kwargs)
+        echo_debug(msg, *args, **kwargs)
@@ -2,7 +2,11 @@
 """
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    output_format_option,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import BioSamplesList
@@ -10,9 +14,11 @@ from .main import BioSamplesList
 
 @click.command("list")
 @click.argument("basespace_project_id")
+@output_format_option
 @add_options(common_options)
-def biosamples_list(
+def biosamples_list(  # pylint: disable=too-many-arguments
     basespace_project_id,
+    output_format,
     host,
     email,
     password,
@@ -34,5 +40,5 @@ def biosamples_list(
     BioSamplesList(
         basespace_project_id,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, output_format=output_format),
     ).run()
@@ -1,8 +1,9 @@
 """List BioSamples from BaseSpace project subcommand."""
 import backoff
 
-from .utils import get_line
+from .utils import COLUMNS, get_row
 from ....base import Command
+from ....utils import RowWriter
 from ..... import client
 
 
@@ -29,13 +30,14 @@ class BioSamplesList(Command):
             )
         )
         try:
-            for biosamples in self.get_paginated_biosamples():
-                if not biosamples:
-                    self.echo_debug("No BaseSpace BioSamples were found.")
-                    return
+            with RowWriter(COLUMNS, self.options.output_format) as writer:
+                for biosamples in self.get_paginated_biosamples():
+                    if not biosamples:
+                        self.echo_debug("No BaseSpace BioSamples were found.")
+                        return
 
-                for biosample in biosamples:
-                    self.echo_data(get_line(biosample))
+                    for biosample in biosamples:
+                        writer.write(get_row(biosample))
         except client.APIClientError as err:
             self.echo_error("There was an error listing BioSamples.")
             if err.status_code == 404:
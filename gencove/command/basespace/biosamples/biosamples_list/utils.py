@@ -1,20 +1,24 @@
 """Utilities for processing BaseSpace BioSamples."""
-from gencove.command.utils import sanitize_string
 
+# column names of rows, used as csv header and jsonl keys
+COLUMNS = (
+    "basespace_date_created",
+    "basespace_id",
+    "basespace_bio_sample_name",
+)
 
-def get_line(biosample):
+
+def get_row(biosample):
     """Build a list of relevant data to be printed.
 
     Args:
         biosample (BaseSpaceBioSample): instance of BaseSpaceBioSample
 
     Returns:
-        list(str): list of relevant data to be printed
+        list(str): relevant data to be printed
     """
-    return "\t".join(
-        [
-            str(biosample.basespace_date_created),
-            str(biosample.basespace_id),
-            sanitize_string(biosample.basespace_bio_sample_name),
-        ]
-    )
+    return [
+        str(biosample.basespace_date_created),
+        str(biosample.basespace_id),
+        biosample.basespace_bio_sample_name,
+    ]
@@ -2,15 +2,21 @@
 """
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    output_format_option,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import BaseSpaceList
 
 
 @click.command("list")
+@output_format_option
 @add_options(common_options)
 def basespace_list(
+    output_format,
     host,
     email,
     password,
@@ -27,5 +33,5 @@ def basespace_list(
     """
     BaseSpaceList(
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, output_format=output_format),
     ).run()
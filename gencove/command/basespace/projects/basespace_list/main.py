@@ -1,8 +1,9 @@
 """List BaseSpace projects subcommand."""
 import backoff
 
-from .utils import get_line
+from .utils import COLUMNS, get_row
 from ....base import Command
+from ....utils import RowWriter
 from ..... import client
 
 
@@ -48,13 +49,15 @@ class BaseSpaceList(Command):
         self.echo_debug("Listing BaseSpace projects.")
 
         try:
-            for basespace_projects in self.get_paginated_basespace_projects():
-                if not basespace_projects:
-                    self.echo_debug("No BaseSpace projects were found.")
-                    return
+            basespace_project_pages = self.get_paginated_basespace_projects()
+            with RowWriter(COLUMNS, self.options.output_format) as writer:
+                for basespace_projects in basespace_project_pages:
+                    if not basespace_projects:
+                        self.echo_debug("No BaseSpace projects were found.")
+                        return
 
-                for basespace_project in basespace_projects:
-                    self.echo_data(get_line(basespace_project))
+                    for basespace_project in basespace_projects:
+                        writer.write(get_row(basespace_project))
 
         except client.APIClientError as err:
             self.echo_error("There was an error listing BaseSpace projects.")
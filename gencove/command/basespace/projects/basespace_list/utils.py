@@ -1,20 +1,20 @@
 """Utilities for processing BaseSpace projects."""
-from gencove.command.utils import sanitize_string
 
+# column names of rows, used as csv header and jsonl keys
+COLUMNS = ("basespace_date_created", "basespace_id", "basespace_name")
 
-def get_line(basespace_project):
+
+def get_row(basespace_project):
     """Build a list of relevant data to be printed.
 
     Args:
         basespace_project (BaseSpaceProject): instance of BaseSpace project
 
     Returns:
-        list(str): list of relevant data to be printed
+        list(str): relevant data to be printed
     """
-    return "\t".join(
-        [
-            str(basespace_project.basespace_date_created),
-            str(basespace_project.basespace_id),
-            sanitize_string(basespace_project.basespace_name),
-        ]
-    )
+    return [
+        str(basespace_project.basespace_date_created),
+        str(basespace_project.basespace_id),
+        basespace_project.basespace_name,
+    ]
@@ -6,7 +6,25 @@ import os
 
 import click
 
-from gencove.constants import HOST
+from gencove.command.utils import find_invalid_uuids, read_sample_ids
+from gencove.constants import (
+    HOST,
+    MAX_PAGE_SIZE,
+    OutputFormat,
+    PAGE_SIZE_AUTO,
+    WAIT_FAILED_EXIT_CODE,
+    WAIT_TIMEOUT_EXIT_CODE,
+)
+from gencove.utils import (
+    MB,
+    MEMORY_BUDGET,
+    MIN_PART_SIZE,
+    enum_as_dict,
+    parse_size,
+)
+
+# number of invalid sample ids shown in the error message
+MAX_INVALID_SHOWN = 10
 
 common_options = [  # pylint: disable=invalid-name
     click.option(
@@ -44,3 +62,154 @@ def add_options(options):  # pylint: disable=missing-function-docstring
         return func
 
     return _add_options
+
+
+def validate_page_size(ctx, param, value):  # pylint: disable=unused-argument
+    """Validate that page size is a number of items or "auto"."""
+    if value is None or value == PAGE_SIZE_AUTO:
+        return value
+    try:
+        page_size = int(value)
+    except ValueError:
+        page_size = 0
+    if not 0 < page_size <= MAX_PAGE_SIZE:
+        raise click.BadParameter(
+            "must be a number between 1 and {} or '{}'".format(
+                MAX_PAGE_SIZE, PAGE_SIZE_AUTO
+            )
+        )
+    return page_size
+
+
+page_size_option = click.option(  # pylint: disable=invalid-name
+    "--page-size",
+    callback=validate_page_size,
+    help="Number of items requested per page of results. "
+    f"Use '{PAGE_SIZE_AUTO}' to adapt page size to API response times.",
+)
+
+wait_timeout_option = click.option(  # pylint: disable=invalid-name
+    "--wait-timeout",
+    type=click.IntRange(min=1),
+    help="Seconds to wait at most. Defaults to no limit.",
+)
+
+wait_options = [  # pylint: disable=invalid-name
+    click.option(
+        "--wait",
+        is_flag=True,
+        help="Wait for the job to finish, polling its status. Exits with "
+        f"{WAIT_FAILED_EXIT_CODE} if the job fails and with "
+        f"{WAIT_TIMEOUT_EXIT_CODE} if it does not finish in time.",
+    ),
+    wait_timeout_option,
+]
+
+output_format_option = click.option(  # pylint: disable=invalid-name
+    "--format",
+    "output_format",
+    type=click.Choice(enum_as_dict(OutputFormat).values()),
+    default=OutputFormat.TSV.value,
+    help="Output format. Values are not modified in csv and jsonl output, "
+    "tabs are replaced with spaces in tsv output. Defaults to tsv",
+)
+
+
+def validate_max_memory(ctx, param, value):  # pylint: disable=unused-argument
+    """Validate memory budget and convert it to bytes."""
+    try:
+        max_memory = parse_size(value)
+    except ValueError:
+        max_memory = 0
+    if max_memory < MIN_PART_SIZE:
+        raise click.BadParameter(
+            "must be a size of at least {}M, i.e. 512M or 2G".format(
+                MIN_PART_SIZE // MB
+            )
+        )
+    return max_memory
+
+
+def validate_shard(ctx, param, value):  # pylint: disable=unused-argument
+    """Validate shard and convert it to (index, count) tuple."""
+    if value is None:
+        return value
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        index, count = 0, 0
+    if not 0 < index <= count:
+        raise click.BadParameter(
+            "must be a shard index and number of shards, i.e. 1/4"
+        )
+    return index, count
+
+
+shard_option = click.option(  # pylint: disable=invalid-name
+    "--shard",
+    callback=validate_shard,
+    help="Process only a part of samples, i.e. 1/4 for the first of four "
+    "parts. Samples are split by their id, so shards do not overlap.",
+)
+
+
+def validate_sample_ids_file(ctx, param, value):  # pylint: disable=W0613
+    """Read unique sample ids from a file and validate them."""
+    if value is None:
+        return value
+    sample_ids = tuple(read_sample_ids(value))
+    invalid = find_invalid_uuids(sample_ids)
+    if invalid:
+        raise click.BadParameter(
+            "{} sample ids are not valid: {}{}".format(
+                len(invalid),
+                ", ".join(invalid[:MAX_INVALID_SHOWN]),
+                ", ..." if len(invalid) > MAX_INVALID_SHOWN else "",
+            )
+        )
+    return sample_ids
+
+
+sample_ids_file_option = click.option(  # pylint: disable=invalid-name
+    "--sample-ids-file",
+    type=click.File("r"),
+    callback=validate_sample_ids_file,
+    help="A file with sample ids separated by commas or new lines, "
+    "use - to read from stdin. Cannot be used with --sample-ids.",
+)
+
+
+def get_sample_ids(sample_ids, sample_ids_file):
+    """Return sample ids of --sample-ids or --sample-ids-file option.
+
+    Args:
+        sample_ids (str): comma separated sample ids
+        sample_ids_file (tuple of str): sample ids read from a file
+
+    Returns:
+        tuple of str
+
+    Raises:
+        click.UsageError: if both options are used
+    """
+    if sample_ids and sample_ids_file is not None:
+        raise click.UsageError(
+            "Use either --sample-ids or --sample-ids-file, not both."
+        )
+    if sample_ids_file is not None:
+        return sample_ids_file
+    if sample_ids:
+        return tuple(s_id.strip() for s_id in sample_ids.split(","))
+    return tuple()
+
+
+max_memory_option = click.option(  # pylint: disable=invalid-name
+    "--max-memory",
+    default=lambda: os.environ.get(
+        "GENCOVE_MAX_MEMORY", "{}M".format(MEMORY_BUDGET // MB)
+    ),
+    callback=validate_max_memory,
+    help="Memory available for buffers of all file transfers, i.e. 512M "
+    "or 2G. Can be passed as GENCOVE_MAX_MEMORY environment variable. "
+    f"Defaults to {MEMORY_BUDGET // MB}M",
+)
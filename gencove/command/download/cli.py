@@ -1,11 +1,22 @@
 """Commands to be executed from command line."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    get_sample_ids,
+    max_memory_option,
+    page_size_option,
+    sample_ids_file_option,
+    shard_option,
+    wait_timeout_option,
+)
 from gencove.constants import (
     Credentials,
     DOWNLOAD_TEMPLATE,
     DownloadTemplateParts,
+    WAIT_FAILED_EXIT_CODE,
+    WAIT_TIMEOUT_EXIT_CODE,
 )
 from gencove.logger import echo_debug
 from gencove.utils import enum_as_dict
@@ -22,6 +33,7 @@ from .main import Download
     help="A comma separated list of sample ids for "
     "which to download the deliverables",
 )
+@sample_ids_file_option
 @click.option(
     "--file-types",
     help="A comma separated list of deliverable file types to download.",
@@ -36,6 +48,14 @@ from .main import Download
     help="Output a list of urls in a JSON format.",
     is_flag=True,
 )
+@click.option(
+    "--from-manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    help=(
+        "Download files listed in a JSON output of --download-urls, or in "
+        "JSON lines with one sample per line, without listing samples."
+    ),
+)
 @click.option(
     "--download-template",
     default=DOWNLOAD_TEMPLATE,
@@ -52,29 +72,51 @@ from .main import Download
         )
     ),
 )
+@click.option(
+    "--restore-archived",
+    is_flag=True,
+    help=(
+        "Request restore of archived samples of the project and download "
+        "them once they are restored. Exits with {} if a restore fails and "
+        "with {} if samples are not restored within --wait-timeout.".format(
+            WAIT_FAILED_EXIT_CODE, WAIT_TIMEOUT_EXIT_CODE
+        )
+    ),
+)
+@wait_timeout_option
+@page_size_option
+@shard_option
 @add_options(common_options)
 @click.option(
     "--no-progress",
     is_flag=True,
     help="If specified, no progress bar is shown.",
 )
-def download(  # pylint: disable=E0012,C0330,R0913
+@max_memory_option
+def download(  # pylint: disable=E0012,C0330,R0913,R0914
     destination,
     project_id,
     sample_ids,
+    sample_ids_file,
     file_types,
     skip_existing,
     download_urls,
+    from_manifest,
     download_template,
+    restore_archived,
+    wait_timeout,
+    page_size,
+    shard,
     host,
     email,
     password,
     api_key,
     no_progress,
+    max_memory,
 ):  # noqa: D413,D301,D412 # pylint: disable=C0301
     """Download deliverables of a project.
 
-    Must specify either project id or sample ids.
+    Must specify either project id, sample ids or a manifest.
 
     Examples:
 
@@ -86,6 +128,10 @@ def download(  # pylint: disable=E0012,C0330,R0913
 
             gencove download ./results --sample-ids 59f5c1fd-cce0-4c4c-90e2-0b6c6c525d71,7edee497-12b5-4a1d-951f-34dc8dce1c1d
 
+        Download samples listed in a file, one per line:
+
+            gencove download ./results --sample-ids-file sample_ids.txt
+
         Download specific deliverables:
 
             gencove download ./results --project-id d9eaa54b-aaac-4b85-92b0-0b564be6d7db --file-types alignment-bam,impute-vcf,fastq-r1,fastq-r2
@@ -94,6 +140,18 @@ def download(  # pylint: disable=E0012,C0330,R0913
 
             gencove download - --project-id d9eaa54b-aaac-4b85-92b0-0b564be6d7db --download-urls
 
+        Download files from a previously output list of urls:
+
+            gencove download ./results --from-manifest urls.json
+
+        Download the first of four disjoint parts of a project:
+
+            gencove download ./results --project-id d9eaa54b-aaac-4b85-92b0-0b564be6d7db --shard 1/4
+
+        Download all samples, restoring archived samples:
+
+            gencove download ./results --project-id d9eaa54b-aaac-4b85-92b0-0b564be6d7db --restore-archived
+
     \f
 
     Args:
@@ -102,6 +160,8 @@ def download(  # pylint: disable=E0012,C0330,R0913
         sample_ids (list(str), optional): specific samples for which
             to download the results. if not specified, download deliverables
             for all samples.
+        sample_ids_file (tuple(str), optional): sample ids read from a file
+            or stdin, instead of sample_ids.
         file_types (list(str), optional): specific deliverables to download
             results for. if not specified, all file types will be downloaded.
         skip_existing (bool, optional, default True): skip downloading existing
@@ -109,12 +169,25 @@ def download(  # pylint: disable=E0012,C0330,R0913
         download_urls (bool, optional): output the files available for a
             download. if the destination parameter is "-", it goes to the
             stdout.
+        from_manifest (str, optional): path to JSON output of
+            download_urls, or JSON lines with a sample per line. files are
+            downloaded concurrently, logging in only to refresh expired
+            download urls.
+        restore_archived (bool, optional): request restore of archived
+            samples of the project and download each of them once it is
+            restored, while other samples are downloaded.
+        wait_timeout (int, optional): seconds to wait for archived samples
+            to be restored at most.
+        page_size (int or str, optional): number of samples requested per
+            page or "auto" to adapt page size to API response times.
+        shard (tuple(int, int), optional): download only samples of the
+            shard with the given 1-based index out of a number of shards.
         no_progress (bool, optional, default False): do not show progress
             bar.
+        max_memory (int): bytes of memory available for download buffers.
     """  # noqa: E501
-    s_ids = tuple()
+    s_ids = get_sample_ids(sample_ids, sample_ids_file)
     if sample_ids:
-        s_ids = tuple(s_id.strip() for s_id in sample_ids.split(","))
         echo_debug("Sample ids translation: {}".format(s_ids))
 
     f_types = tuple()
@@ -132,6 +205,12 @@ def download(  # pylint: disable=E0012,C0330,R0913
             host=host,
             skip_existing=skip_existing,
             download_template=download_template,
+            page_size=page_size,
+            max_memory=max_memory,
+            from_manifest=from_manifest,
+            shard=shard,
+            restore_archived=restore_archived,
+            wait_timeout=wait_timeout,
         ),
         download_urls,
         no_progress,
@@ -1,15 +1,12 @@
 """Download command constants."""
 import re
 from enum import Enum, unique
-from typing import Optional, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 from uuid import UUID
 
 from pydantic import BaseModel  # pylint: disable=no-name-in-module
 
-from gencove.constants import (  # noqa: I100
-    DownloadTemplateParts,
-    Optionals,
-)
+from gencove.constants import Optionals  # noqa: I100
 
 
 @unique
@@ -65,21 +62,47 @@ class DownloadOptions(Optionals):
 
     skip_existing: Optional[bool]
     download_template: Optional[str]
+    page_size: Optional[Union[int, str]]
+    max_memory: Optional[int]
+    from_manifest: Optional[str]
+    shard: Optional[Tuple[int, int]]
+    restore_archived: Optional[bool]
 
 
-DEFAULT_FILENAME_TOKEN = "{{{}}}".format(
-    DownloadTemplateParts.DEFAULT_FILENAME.value
-)
+# pylint: disable=too-few-public-methods
+class DownloadPlanItem(BaseModel):
+    """DownloadPlanItem model
+
+    A single file of the download plan. Files without a download url are
+    saved from the API responses (i.e. QC metrics and metadata).
+    """
+
+    sample_id: str
+    file_type: str
+    file_path: str
+    download_url: Optional[str]
+
+    class Config:
+        """Plan is not changed once it is built."""
+
+        allow_mutation = False
+
+
+# pylint: disable=too-few-public-methods
+class ManifestFile(BaseModel):
+    """ManifestFile model"""
+
+    id: Optional[str]
+    download_url: str
 
 
 # pylint: disable=too-few-public-methods
-class FilePrefix(BaseModel):
-    """FilePrefix model"""
+class ManifestSample(BaseModel):
+    """ManifestSample model, a sample as output by `--download-urls`"""
 
-    dirs: str
-    filename: str
-    file_extension: str
-    use_default_filename: bool
+    gencove_id: str
+    client_id: Optional[str]
+    files: Dict[str, ManifestFile]
 
 
 FILENAME_RE = re.compile("filename=(.+)")
@@ -91,3 +114,7 @@ FILE_TYPES_MAPPER = {}
 
 QC_FILE_TYPE = "qc"
 METADATA_FILE_TYPE = "metadata"
+# threads saving QC metrics and metadata alongside deliverable downloads
+SAVE_FILE_WORKERS = 4
+# archived samples of a project requested to be restored at once
+RESTORE_CHUNK_SIZE = 200
@@ -4,5 +4,6 @@
 class DownloadTemplateError(Exception):
     """Error that indicates an issue with the template.
 
-    Caused by download overwriting previously downloaded files.
+    Caused by malformed template or by template which would save multiple
+    files to the same path.
     """
@@ -1,31 +1,55 @@
 """Download command executor."""
-import json
+import queue
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import backoff
 
+import click
+
 import requests
 
 from gencove import client  # noqa: I100
 from gencove.command.base import Command
 from gencove.command.download.exceptions import DownloadTemplateError
-from gencove.constants import SampleArchiveStatus
+from gencove.constants import (
+    MAX_POLL_INTERVAL,
+    POLL_INTERVAL,
+    POLL_INTERVAL_FACTOR,
+    STREAMED_PAGE_SIZE,
+    SampleArchiveStatus,
+    WAIT_FAILED_EXIT_CODE,
+    WAIT_TIMEOUT_EXIT_CODE,
+)
 from gencove.exceptions import ValidationError
+from gencove.progress import TransferProgress
+from gencove.serialization import dumps
+from gencove.utils import MAX_CONCURRENCY, batchify, memory_budget
 
 from .constants import (
     ALLOWED_ARCHIVE_STATUSES_RE,
     ALLOWED_STATUSES_RE,
+    DownloadPlanItem,
     METADATA_FILE_TYPE,
     QC_FILE_TYPE,
+    RESTORE_CHUNK_SIZE,
+    SAVE_FILE_WORKERS,
 )
 from .utils import (
-    build_file_path,
+    DownloadTemplate,
+    create_directories,
     download_file,
     fatal_process_sample_error,
-    get_download_template_format_params,
+    find_collisions,
+    get_filename_from_download_url,
+    read_manifest,
     save_metadata_file,
     save_qc_file,
 )
+from ..utils import PageSizer, in_shard, map_concurrently
 
 
 # pylint: disable=too-many-instance-attributes
@@ -47,16 +71,53 @@ class Download(Command):
         self.filters = filters
         self.options = options
         self.sample_ids = set()
-        self.downloaded_files = set()
+        # (sample id, file type): download url refreshed after error 403
+        self.refreshed_urls = {}
+        self.refresh_lock = threading.Lock()
+        self.manifest = None
         self.download_urls = download_urls
         self.download_files = []
         self.no_progress = no_progress
+        self.file_types_re = re.compile(
+            "|".join(filters.file_types), re.IGNORECASE
+        )
+        self.template = None
+        # sample id: archive status of samples waiting to be restored
+        self.archived_samples = {}
+        # ids of samples whose restore failed
+        self.failed_restores = []
+        self.planned_paths = set()
+        self.poll_error = None
+        self.page_sizer = PageSizer(options.page_size, STREAMED_PAGE_SIZE)
+        if options.max_memory:
+            memory_budget.resize(options.max_memory)
 
     def initialize(self):
         """Initialize download command."""
         if self.filters.project_id and self.filters.sample_ids:
             raise ValidationError("Bad configuration. Exiting")
 
+        if self.options.from_manifest:
+            if self.filters.project_id or self.filters.sample_ids:
+                raise ValidationError(
+                    "Cannot use project id or sample ids with a manifest."
+                )
+            try:
+                manifest = read_manifest(self.options.from_manifest)
+            except ValueError as err:
+                raise ValidationError(
+                    "Invalid manifest {}: {}".format(
+                        self.options.from_manifest, err
+                    )
+                ) from err
+            self.manifest = [
+                sample
+                for sample in manifest
+                if in_shard(sample.gencove_id, self.options.shard)
+            ]
+            # login only if download urls have to be refreshed
+            return
+
         self.login()
 
         if self.filters.project_id:
@@ -69,13 +130,24 @@ class Download(Command):
             try:
                 samples_generator = self._get_paginated_samples()
                 for sample in samples_generator:
-                    self.sample_ids.add(sample.id)
+                    if in_shard(sample.id, self.options.shard):
+                        self.sample_ids.add(sample.id)
             except client.APIClientError as err:
                 raise ValidationError(
                     "Project id {} not found.".format(self.filters.project_id)
                 ) from err
         else:
-            self.sample_ids = self.filters.sample_ids
+            self.sample_ids = tuple(
+                sample_id
+                for sample_id in self.filters.sample_ids or ()
+                if in_shard(sample_id, self.options.shard)
+            )
+        if self.options.shard:
+            self.echo_debug(
+                "Shard {}/{} has {} samples",
+                *self.options.shard,
+                len(self.sample_ids),
+            )
 
     def validate(self):
         """Validate command configuration before execution.
@@ -83,7 +155,24 @@ class Download(Command):
         Raises:
             ValidationError : something is wrong with configuration
         """
-        if not self.filters.project_id and not self.filters.sample_ids:
+        if self.options.restore_archived and not self.filters.project_id:
+            raise ValidationError(
+                "Restoring archived samples requires a project id."
+            )
+        if self.options.wait_timeout and not self.options.restore_archived:
+            raise ValidationError(
+                "Wait timeout can be used only when restoring archived "
+                "samples."
+            )
+        if self.options.restore_archived and self.download_urls:
+            raise ValidationError(
+                "Cannot output download urls while restoring archived "
+                "samples."
+            )
+
+        if self.manifest is not None:
+            self.validate_manifest()
+        elif not self.filters.project_id and not self.filters.sample_ids:
             raise ValidationError(
                 "Must specify one of: project id or sample ids"
             )
@@ -93,7 +182,7 @@ class Download(Command):
                 "Must specify only one of: project id or sample ids"
             )
 
-        if not self.sample_ids:
+        if not self.sample_ids and not self.manifest:
             raise ValidationError("No samples to process. Exiting.")
 
         if all(
@@ -106,6 +195,11 @@ class Download(Command):
                 "Cannot have - as a destination without download-urls."
             )
 
+        try:
+            self.template = DownloadTemplate(self.options.download_template)
+        except DownloadTemplateError as err:
+            raise ValidationError(str(err)) from err
+
         if self.download_urls:
             self.echo_debug("Requesting download list in JSON format.")
         if self.download_to == "-":
@@ -117,31 +211,161 @@ class Download(Command):
                 )
             )
 
+    def validate_manifest(self):
+        """Validate configuration of downloading from a manifest.
+
+        Raises:
+            ValidationError : something is wrong with configuration
+        """
+        if self.download_urls or self.download_to == "-":
+            raise ValidationError(
+                "Cannot output download urls of a manifest."
+            )
+        self.echo_debug(
+            "Downloading {} samples from manifest {}",
+            len(self.manifest),
+            self.options.from_manifest,
+        )
+
+    def validate_login_success(self):
+        """Check if login succeeded, unless downloading from a manifest."""
+        if self.manifest is None:
+            super().validate_login_success()
+
     def execute(self):
         if self.download_to != "-":
             self.echo_info("Processing samples")
-        for sample_id in self.sample_ids:
-            try:
-                self.process_sample(sample_id)
-            except DownloadTemplateError:
-                return
+        if self.manifest is not None:
+            plan = self.plan_manifest()
+        else:
+            plan = self.build_plan()
         if self.download_urls:
             self.output_list()
+            return
+        if self._warn_collisions(plan):
+            return
+        create_directories(plan)
+        if self.manifest is not None:
+            self.transfer_files(plan)
+        else:
+            self.download_samples(plan)
 
-    @backoff.on_exception(
-        backoff.expo,
-        requests.exceptions.HTTPError,
-        giveup=fatal_process_sample_error,
-        max_tries=10,
-    )
-    def process_sample(self, sample_id):
-        """Process sample.
+    def _warn_collisions(self, plan):
+        """Warn about files of the plan which would be saved to one path.
+
+        Returns:
+            bool: True if there are any
+        """
+        collisions = find_collisions(plan)
+        if collisions:
+            self.echo_warning(
+                "Bad template! Multiple files have the same name. "
+                "Please fix the template and try again."
+            )
+            for file_path, count in collisions:
+                self.echo_warning(
+                    "{} files would be saved to {}".format(count, file_path)
+                )
+        return bool(collisions)
+
+    def download_samples(self, plan):
+        """Download planned files of samples, restoring archived samples.
+
+        Args:
+            plan(tuple of DownloadPlanItem): planned files
+
+        Returns:
+            None
+        """
+        self.planned_paths = {item.file_path for item in plan}
+        if self.archived_samples:
+            self.request_restore()
+        # QC metrics and metadata are small API responses, they are saved
+        # on their own threads while deliverables are downloaded
+        with ThreadPoolExecutor(max_workers=SAVE_FILE_WORKERS) as lane:
+            saved_files = []
+            try:
+                for item in self.iter_plan(plan):
+                    if item.download_url is None:
+                        saved_files.append(
+                            lane.submit(self.save_sample_file, item)
+                        )
+                    else:
+                        self.download_sample_file(item)
+            except BaseException:
+                for future in saved_files:
+                    future.cancel()
+                raise
+            for future in saved_files:
+                future.result()
+        self._report_unrestored()
+
+    def _report_unrestored(self):
+        """Exit with an error if some archived samples were not downloaded.
+
+        Raises:
+            click.exceptions.Exit: with WAIT_FAILED_EXIT_CODE if a restore
+                failed or WAIT_TIMEOUT_EXIT_CODE if samples were not
+                restored in time
+        """
+        if self.failed_restores:
+            self.echo_error(
+                "{} archived samples could not be restored and were not "
+                "downloaded.".format(len(self.failed_restores))
+            )
+            raise click.exceptions.Exit(WAIT_FAILED_EXIT_CODE)
+        if self.archived_samples:
+            self.echo_error(
+                "{} archived samples were not restored in time and were not "
+                "downloaded.".format(len(self.archived_samples))
+            )
+            raise click.exceptions.Exit(WAIT_TIMEOUT_EXIT_CODE)
+
+    def build_plan(self):
+        """Render file paths of all files of all samples.
+
+        Returns:
+            tuple of DownloadPlanItem
+        """
+        plan = []
+        for sample_id in self.sample_ids:
+            plan.extend(self.plan_sample(sample_id))
+        return tuple(plan)
+
+    def plan_manifest(self):
+        """Render file paths of all files in the manifest.
+
+        Returns:
+            tuple of DownloadPlanItem
+        """
+        plan = []
+        for sample in self.manifest:
+            for file_type, sample_file in sample.files.items():
+                if self.filters.file_types and not self.file_types_re.match(
+                    file_type
+                ):
+                    continue
+                plan.append(
+                    self.plan_item(
+                        sample.gencove_id,
+                        sample.client_id,
+                        file_type,
+                        get_filename_from_download_url(
+                            sample_file.download_url
+                        ),
+                        sample_file.download_url,
+                    )
+                )
+        return tuple(plan)
+
+    def plan_sample(self, sample_id):
+        """Plan files of a sample.
 
         Check if a sample is in appropriate state and if it is,
-        get its files one by one.
+        return its files with their file system paths.
 
-        If downloading and a download failed with error 403, reprocess the
-        sample in order to get fresh download url.
+        Returns:
+            list of DownloadPlanItem
         """
         try:
             sample = self.api_client.get_sample_details(sample_id)
@@ -152,17 +376,37 @@ class Download(Command):
                     sample_id
                 )
             )
-            return
+            return []
+        return self.plan_sample_details(sample)
 
+    def plan_sample_details(self, sample):
+        """Plan files of a sample from its details.
+
+        Archived samples are set aside to be restored if restoring archived
+        samples was requested.
+
+        Raises:
+            ValidationError: if the sample is archived
+
+        Returns:
+            list of DownloadPlanItem
+        """
         self.echo_debug(
-            "Processing sample id {}, status {}".format(
-                sample.id, sample.last_status.status
-            )
+            "Processing sample id {}, status {}",
+            sample.id,
+            sample.last_status.status,
         )
 
-        if not ALLOWED_ARCHIVE_STATUSES_RE.match(
-            sample.archive_last_status.status
-        ):
+        archive_status = sample.archive_last_status.status
+        if not ALLOWED_ARCHIVE_STATUSES_RE.match(archive_status):
+            if self.options.restore_archived:
+                self.echo_debug(
+                    "Sample {} is {}, it will be downloaded once restored",
+                    sample.id,
+                    archive_status,
+                )
+                self.archived_samples[sample.id] = archive_status
+                return []
             raise ValidationError(
                 "Sample with id {} is archived and cannot be downloaded - "
                 "please restore the sample and try again.".format(sample.id)
@@ -172,35 +416,20 @@ class Download(Command):
             self.echo_warning(
                 "Sample #{} has no deliverable.".format(sample.id),
             )
-            return
-
-        file_types_re = re.compile(
-            "|".join(self.filters.file_types), re.IGNORECASE
-        )
-
-        file_with_prefix = self.options.download_template.format(
-            **get_download_template_format_params(sample.client_id, sample.id)
-        )
-        self.echo_debug(
-            "file path with prefix is: {}".format(file_with_prefix)
-        )
-        if all(
-            [
-                self.download_to != "-",
-                not self.download_urls,
-                file_types_re.match(QC_FILE_TYPE),
-            ]
-        ):
-            self.download_sample_qc_metrics(file_with_prefix, sample_id)
-
-        if all(
-            [
-                self.download_to != "-",
-                not self.download_urls,
-                file_types_re.match(METADATA_FILE_TYPE),
-            ]
-        ):
-            self.download_sample_metadata(file_with_prefix, sample_id)
+            return []
+
+        plan = []
+        if not self.download_urls:
+            for file_type in (QC_FILE_TYPE, METADATA_FILE_TYPE):
+                if self.file_types_re.match(file_type):
+                    plan.append(
+                        self.plan_item(
+                            sample.id,
+                            sample.client_id,
+                            file_type,
+                            "{}_{}.json".format(sample.id, file_type),
+                        )
+                    )
 
         self.download_files.append(
             {
@@ -225,7 +454,7 @@ class Download(Command):
 
         for sample_file in sample.files:
             # pylint: disable=E0012,C0330
-            if self.filters.file_types and not file_types_re.match(
+            if self.filters.file_types and not self.file_types_re.match(
                 sample_file.file_type
             ):
                 self.echo_debug(
@@ -234,120 +463,361 @@ class Download(Command):
                 continue
 
             if not self.download_urls:
-                file_path = build_file_path(
-                    sample_file, file_with_prefix, self.download_to
-                )
-                self.validate_and_download(
-                    file_path,
-                    download_file,
-                    file_path,
-                    sample_file.download_url,
-                    self.options.skip_existing,
-                    self.no_progress,
+                plan.append(
+                    self.plan_item(
+                        sample.id,
+                        sample.client_id,
+                        sample_file.file_type,
+                        get_filename_from_download_url(
+                            sample_file.download_url
+                        ),
+                        sample_file.download_url,
+                    )
                 )
             self.download_files[-1]["files"][sample_file.file_type] = {
                 "id": sample_file.id,
                 "download_url": sample_file.download_url,
             }
+        return plan
 
-    def validate_and_download(
-        self, download_to_path, download_func, *args, **kwargs
-    ):
-        """Check if this file was already downloaded, if yes - exit.
-
-        Args:
-            download_to_path(str): system file path to donwload to
-            download_func(function): function that will do the download logic
-            *args: arguments that will be passed to download function
-            **kwargs: keyword arguments that will be passed to download func
-
-        Returns:
-            None
+    def request_restore(self):
+        """Request restore of archived samples, a chunk at a time.
 
-        Raises:
-            DownloadTemplateError: if the file was found in already downloaded
-             list
+        Samples whose restore was already requested are not requested
+        again. Samples of chunks which were not accepted are not waited for.
         """
-        if download_to_path in self.downloaded_files:
-            self.echo_warning(
-                "Bad template! Multiple files have the same name. "
-                "Please fix the template and try again."
+        sample_ids = [
+            sample_id
+            for sample_id, status in self.archived_samples.items()
+            if status == SampleArchiveStatus.ARCHIVED.value
+        ]
+        for chunk in batchify(sample_ids, batch_size=RESTORE_CHUNK_SIZE):
+            if not chunk:
+                # batchify ends with an empty batch for full chunks
+                continue
+            self.echo_debug("Requesting restore of {} samples", len(chunk))
+            try:
+                self.api_client.restore_project_samples(
+                    project_id=self.filters.project_id,
+                    sample_ids=[str(sample_id) for sample_id in chunk],
+                )
+            except client.APIClientError as err:
+                if err.status_code != 400:
+                    raise
+                self.echo_warning(
+                    "Restore of {} samples was not accepted: {}".format(
+                        len(chunk), err.message
+                    )
+                )
+                for sample_id in chunk:
+                    del self.archived_samples[sample_id]
+        if self.archived_samples:
+            self.echo_info(
+                "Downloading {} archived samples once they are "
+                "restored".format(len(self.archived_samples))
             )
 
-            raise DownloadTemplateError
+    def iter_plan(self, plan):
+        """Generate planned files, adding files of samples being restored.
 
-        download_func(*args, **kwargs)
+        Samples being restored are polled on their own thread. Their files
+        are generated as soon as they are restored, ahead of the rest of
+        the plan.
 
-        self.echo_debug("Adding file path: {}".format(download_to_path))
-        self.downloaded_files.add(download_to_path)
+        Args:
+            plan(tuple of DownloadPlanItem): planned files
 
-    def download_sample_qc_metrics(self, file_with_prefix, sample_id):
-        """Download and save to file on user file system.
+        Yields:
+            DownloadPlanItem
+        """
+        if not self.archived_samples:
+            yield from plan
+            return
+        restored = queue.Queue()
+        stop = threading.Event()
+        poller = threading.Thread(
+            target=self.poll_restored, args=(restored, stop), daemon=True
+        )
+        poller.start()
+        pending = deque(plan)
+        polling = True
+        try:
+            while polling or pending:
+                try:
+                    # wait for restored samples once the plan is done
+                    item = restored.get(block=not pending)
+                except queue.Empty:
+                    yield pending.popleft()
+                    continue
+                if item is None:
+                    polling = False
+                else:
+                    yield item
+        finally:
+            stop.set()
+        if self.poll_error is not None:
+            raise self.poll_error
+
+    def poll_restored(self, restored, stop):
+        """Plan files of archived samples once they are restored.
+
+        Polls all samples being restored at once, less often while none of
+        them is restored. Samples whose restore failed are reported and no
+        longer polled, see `_check_restore`. Runs until no sample is being
+        restored, the wait timeout passes or stop is set.
 
         Args:
-            file_with_prefix(str): file path based on download template,
-                prefilled with sample data
-            sample_id(str of uuid): sample gencove id
+            restored(queue.Queue): receives planned files, followed by None
+            stop(threading.Event): set when files are no longer downloaded
 
         Returns:
             None
         """
-        file_path = build_file_path(
-            dict(file_type=QC_FILE_TYPE),
-            file_with_prefix,
-            self.download_to,
-            "{}_{}.json".format(sample_id, QC_FILE_TYPE),
+        deadline = None
+        if self.options.wait_timeout is not None:
+            deadline = time.monotonic() + self.options.wait_timeout
+        interval = POLL_INTERVAL
+        try:
+            while self.archived_samples:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    interval = min(interval, remaining)
+                if stop.wait(interval):
+                    break
+                interval = min(
+                    interval * POLL_INTERVAL_FACTOR, MAX_POLL_INTERVAL
+                )
+                try:
+                    samples = list(
+                        map_concurrently(
+                            self.api_client.get_sample_details,
+                            list(self.archived_samples),
+                        )
+                    )
+                except client.APIClientTimeout:
+                    self.echo_debug("Polling restored samples timed out")
+                    continue
+                for sample in samples:
+                    if self._check_restore(sample, restored):
+                        interval = POLL_INTERVAL
+        except client.APIClientError as err:
+            # raised in the main thread by iter_plan
+            self.poll_error = err
+        finally:
+            restored.put(None)
+
+    def _check_restore(self, sample, restored):
+        """Queue files of a polled sample if it is restored.
+
+        Samples stay archived for a while after their restore is requested,
+        so they fail only if they are archived again after the restore
+        started, or have any other status.
+
+        Returns:
+            bool: True if the sample is restored
+        """
+        status = sample.archive_last_status.status
+        if ALLOWED_ARCHIVE_STATUSES_RE.match(status):
+            self.queue_restored_sample(sample, restored)
+            return True
+        previous_status = self.archived_samples[sample.id]
+        if status == SampleArchiveStatus.RESTORE_REQUESTED.value or (
+            status == previous_status == SampleArchiveStatus.ARCHIVED.value
+        ):
+            self.archived_samples[sample.id] = status
+            return False
+        del self.archived_samples[sample.id]
+        self.failed_restores.append(sample.id)
+        self.echo_error(
+            "Restore of sample {} failed, it is {}.".format(sample.id, status)
         )
+        return False
+
+    def queue_restored_sample(self, sample, restored):
+        """Plan files of a restored sample and queue them for download."""
+        del self.archived_samples[sample.id]
+        self.echo_info("Sample {} restored".format(sample.id))
+        for item in self.plan_sample_details(sample):
+            if item.file_path in self.planned_paths:
+                self.echo_warning(
+                    "Bad template! Skipping {} of sample {}, another file "
+                    "is saved to {}".format(
+                        item.file_type, sample.id, item.file_path
+                    )
+                )
+                continue
+            self.planned_paths.add(item.file_path)
+            create_directories((item,))
+            restored.put(item)
 
-        self.validate_and_download(
-            file_path,
-            save_qc_file,
-            file_path,
-            self.api_client,
+    # pylint: disable=too-many-arguments
+    def plan_item(
+        self,
+        sample_id,
+        client_id,
+        file_type,
+        source_filename,
+        download_url=None,
+    ):
+        """Render file system path of a single file of a sample."""
+        file_path = self.template.file_path(
+            self.download_to,
+            client_id,
             sample_id,
-            self.options.skip_existing,
+            file_type,
+            source_filename,
+        )
+        self.echo_debug("Planned file path: {}", file_path)
+        return DownloadPlanItem(
+            sample_id=str(sample_id),
+            file_type=file_type,
+            file_path=file_path,
+            download_url=download_url,
         )
 
-    def download_sample_metadata(self, file_with_prefix, sample_id):
-        """Get metadata and save to file on user file system.
+    def save_sample_file(self, item):
+        """Get QC metrics or metadata and save to file on user file system.
 
         Args:
-            file_with_prefix(str): file path based on download template,
-                prefilled with sample data
-            sample_id(str of uuid): sample gencove id
+            item(DownloadPlanItem): planned file without download url
 
         Returns:
             None
         """
-        file_path = build_file_path(
-            dict(file_type=METADATA_FILE_TYPE),
-            file_with_prefix,
-            self.download_to,
-            "{}_{}.json".format(sample_id, METADATA_FILE_TYPE),
+        save_file = (
+            save_qc_file
+            if item.file_type == QC_FILE_TYPE
+            else save_metadata_file
         )
-
-        self.validate_and_download(
-            file_path,
-            save_metadata_file,
-            file_path,
+        save_file(
+            item.file_path,
             self.api_client,
-            sample_id,
+            item.sample_id,
             self.options.skip_existing,
         )
 
+    def transfer_files(self, plan):
+        """Download planned files concurrently.
+
+        Args:
+            plan(tuple of DownloadPlanItem): planned files
+
+        Returns:
+            None
+        """
+        progress = None
+        if not self.no_progress:
+            progress = TransferProgress("Downloading")
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+                futures = [
+                    executor.submit(self.download_sample_file, item, progress)
+                    for item in plan
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            if progress:
+                progress.close()
+
+    @backoff.on_exception(
+        backoff.expo,
+        requests.exceptions.HTTPError,
+        giveup=fatal_process_sample_error,
+        max_tries=10,
+    )
+    def download_sample_file(self, item, progress=None):
+        """Download a planned file.
+
+        If a download failed with error 403, the download urls of the
+        sample are refreshed and the download is retried.
+
+        Args:
+            item(DownloadPlanItem): planned file
+            progress(TransferProgress, optional): progress shared by
+                concurrent downloads
+
+        Returns:
+            None
+        """
+        download_url = self.refreshed_urls.get(
+            (item.sample_id, item.file_type), item.download_url
+        )
+        kwargs = {"progress": progress} if progress else {}
+        try:
+            download_file(
+                item.file_path,
+                download_url,
+                self.options.skip_existing,
+                self.no_progress,
+                **kwargs,
+            )
+        except requests.exceptions.HTTPError as err:
+            if not fatal_process_sample_error(err):
+                self.refresh_download_urls(item, download_url)
+            raise
+
+    def refresh_download_urls(self, item, expired_url):
+        """Get fresh download urls of all files of the sample of an item.
+
+        Samples are refreshed one at a time, so that concurrent downloads
+        of the same sample refresh it only once.
+
+        Raises:
+            ValidationError: if logging in failed
+        """
+        with self.refresh_lock:
+            key = (item.sample_id, item.file_type)
+            if self.refreshed_urls.get(key, item.download_url) != expired_url:
+                return
+            if not self.is_logged_in and not self.login():
+                raise ValidationError(
+                    "Please check your credentials and try again"
+                )
+            self.echo_debug(
+                "Refreshing download urls of sample {}", item.sample_id
+            )
+            sample = self.api_client.get_sample_details(item.sample_id)
+            for sample_file in sample.files:
+                self.refreshed_urls[
+                    (item.sample_id, sample_file.file_type)
+                ] = sample_file.download_url
+
     def _get_paginated_samples(self):
         """Generate for project samples that traverses all pages."""
+        archive_status = SampleArchiveStatus.AVAILABLE.value
+        if self.options.restore_archived:
+            archive_status = SampleArchiveStatus.ALL.value
         get_samples = True
         next_page = None
         while get_samples:
-            self.echo_debug("Getting page: {}".format(next_page or 1))
-            req = self.api_client.get_project_samples(
-                self.filters.project_id,
-                next_page,
-                sample_archive_status=SampleArchiveStatus.AVAILABLE.value,
+            self.echo_debug(
+                "Getting page: {}, page size: {}",
+                next_page or 1,
+                self.page_sizer.size,
             )
-            for sample in req.results:
-                yield sample
+            start = time.monotonic()
+            try:
+                req = self.api_client.get_project_samples(
+                    self.filters.project_id,
+                    next_page,
+                    sample_archive_status=archive_status,
+                    lazy=True,
+                    stream=True,
+                    limit=self.page_sizer.size,
+                )
+            except client.APIClientTimeout:
+                if not self.page_sizer.shrink():
+                    raise
+                continue
+            yield from self.page_sizer.measure(req.results, start)
             next_page = req.meta.next
             get_samples = next_page is not None
 
@@ -355,20 +825,10 @@ class Download(Command):
         """Output reformatted JSON of each individual sample."""
         self.echo_debug("Outputting JSON.")
         if self.download_to == "-":
-            self.echo_data(
-                json.dumps(
-                    self.download_files, indent=4, cls=client.CustomEncoder
-                )
-            )
+            self.echo_data(dumps(self.download_files, indent=4))
         else:
             with open(self.download_to, "w") as json_file:
-                json_file.write(
-                    json.dumps(
-                        self.download_files,
-                        indent=4,
-                        cls=client.CustomEncoder,
-                    )
-                )
+                json_file.write(dumps(self.download_files, indent=4))
             self.echo_info(
                 "Samples and their deliverables download URLs outputted to "
                 "{}".format(self.download_to)
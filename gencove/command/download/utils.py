@@ -1,7 +1,8 @@
 """Download command utilities."""
-import json
 import os
 import re
+import string
+from collections import Counter
 from urllib.parse import parse_qs, urlparse
 
 import backoff
@@ -9,35 +10,24 @@ import backoff
 import requests
 
 from gencove import client  # noqa: I100
+from gencove.command.download.exceptions import DownloadTemplateError
 from gencove.constants import (  # noqa: I100
     DownloadTemplateParts,
     MAX_RETRY_TIME_SECONDS,
 )
 from gencove.logger import echo_debug, echo_info, echo_warning
-from gencove.models import SampleFile
-from gencove.utils import get_progress_bar
+from gencove.progress import TransferProgress, write_chunks
+from gencove.serialization import dumps, loads
+from gencove.utils import MAX_CONCURRENCY, memory_budget
 
 from .constants import (
     CHUNK_SIZE,
-    DEFAULT_FILENAME_TOKEN,
     FILENAME_RE,
     FILE_TYPES_MAPPER,
-    FilePrefix,
+    ManifestSample,
 )
 
 
-def _get_prefix_parts(full_prefix):
-    """Extract directories prefix parts from."""
-    prefix_parts = full_prefix.split("/")
-    file_name, _, file_ext = prefix_parts[-1].partition(".")
-    return FilePrefix(
-        dirs="/".join(prefix_parts[:-1]),
-        filename=file_name,
-        file_extension=file_ext,
-        use_default_filename=(DEFAULT_FILENAME_TOKEN in full_prefix),
-    )
-
-
 def get_filename_from_download_url(url):
     """Deduce filename from url.
 
@@ -66,86 +56,109 @@ def deliverable_type_from_filename(filename):
     """Deduce deliverable type based on dot notation."""
     filetype = ".".join(filename.split(".")[1:])
     echo_debug(
-        "Deduced filetype to be: {} "
-        "from filename: {}".format(filetype, filename)
+        "Deduced filetype to be: {} from filename: {}", filetype, filename
     )
     return filetype
 
 
-def _create_filepath(download_to, prefix_dirs, filename):
-    """Build full file path and ensure that directory structure exists.
+def _file_format_params(file_type, source_filename):
+    """Return values of the download template tokens of a single file."""
+    return {
+        DownloadTemplateParts.FILE_TYPE.value: (
+            FILE_TYPES_MAPPER.get(file_type) or file_type
+        ),
+        DownloadTemplateParts.FILE_EXTENSION.value: (
+            deliverable_type_from_filename(source_filename)
+        ),
+        DownloadTemplateParts.DEFAULT_FILENAME.value: source_filename,
+    }
+
+
+class DownloadTemplate:
+    """Download template, parsed once and rendered for every file.
 
     Args:
-        download_to (str): top level directory path
-        prefix_dirs (str): subdirectories structure to create under
-            download_to.
-        filename (str): name of the file inside download_to/file_prefix
-            structure.
+        template (str): download template, i.e.
+            "{client_id}/{gencove_id}/{default_filename}"
+
+    Raises:
+        DownloadTemplateError: if the template is malformed or has unknown
+            tokens
     """
-    echo_debug("_create_filepath Downloading to: {}".format(download_to))
-    echo_debug("_create_filepath file prefix is: {}".format(prefix_dirs))
 
-    path = os.path.join(download_to, prefix_dirs)
-    # Cross-platform cross-python-version directory creation
-    if not os.path.exists(path):
-        echo_debug("creating path: {}".format(path))
-        os.makedirs(path)
+    tokens = frozenset(part.value for part in DownloadTemplateParts)
+
+    def __init__(self, template):
+        try:
+            parsed = list(string.Formatter().parse(template))
+        except ValueError as err:
+            raise DownloadTemplateError(
+                "Malformed download template: {}".format(err)
+            ) from err
+        unknown = {
+            field
+            for _, field, _, _ in parsed
+            if field is not None and field not in self.tokens
+        }
+        if unknown:
+            raise DownloadTemplateError(
+                "Unknown download template tokens: {}".format(
+                    ", ".join(sorted(unknown))
+                )
+            )
+        self.template = template
+        self._parts = tuple(
+            (literal, field) for literal, field, _, _ in parsed
+        )
 
-    file_path = os.path.join(path, filename)
-    echo_debug("Deduced full file path is {}".format(file_path))
-    return file_path
+    def render(self, **values):
+        """Substitute tokens with values.
 
+        Raises:
+            KeyError: if a token used in the template has no value
+        """
+        return "".join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._parts
+        )
 
-def build_file_path(
-    deliverable, file_with_prefix, download_to, filename=None
-):
-    """Create and return file system path where the file will be downloaded to.
+    # pylint: disable=too-many-arguments
+    def file_path(
+        self, download_to, client_id, gencove_id, file_type, source_filename
+    ):
+        """Return file system path of a sample file under download_to."""
+        return os.path.join(
+            download_to,
+            self.render(
+                **{
+                    **get_download_template_format_params(
+                        client_id, gencove_id
+                    ),
+                    **_file_format_params(file_type, source_filename),
+                }
+            ),
+        )
+
+
+def find_collisions(plan):
+    """Find file paths which are the target of more than one file.
 
     Args:
-        deliverable (dict): used to get download url and file type
-        file_with_prefix (str): used as a template for download path
-        download_to (str): general location where to download the file to
+        plan (tuple of DownloadPlanItem): planned files
 
     Returns:
-         str : file path on current file system
+        list of (str, int): sorted file paths and their number of files
     """
-    prefix = _get_prefix_parts(file_with_prefix)
-    download_url, file_type = "", ""
-    if isinstance(deliverable, SampleFile):
-        download_url, file_type = (
-            deliverable.download_url,
-            deliverable.file_type,
-        )
-    else:
-        download_url, file_type = (
-            deliverable.get("download_url"),
-            deliverable.get("file_type"),
-        )
-    source_filename = (
-        filename if filename else get_filename_from_download_url(download_url)
-    )
+    counts = Counter(item.file_path for item in plan)
+    return sorted((path, count) for path, count in counts.items() if count > 1)
 
-    destination_filename = prefix.filename
-    if prefix.file_extension:
-        destination_filename = "{}.{}".format(
-            prefix.filename, prefix.file_extension
-        )
 
-    # turning off formatting for improved code readability
-    # fmt: off
-    destination_filename = destination_filename.format(
-        **{
-            DownloadTemplateParts.FILE_TYPE.value: FILE_TYPES_MAPPER.get(file_type) or file_type,  # noqa: E501  # pylint: disable=line-too-long
-            DownloadTemplateParts.FILE_EXTENSION.value: deliverable_type_from_filename(source_filename),  # noqa: E501  # pylint: disable=line-too-long
-            DownloadTemplateParts.DEFAULT_FILENAME.value: source_filename,
-        }
-    )
-    # fmt: on
-
-    echo_debug(
-        "Calculated destination filename: {}".format(destination_filename)
-    )
-    return _create_filepath(download_to, prefix.dirs, destination_filename)
+def create_directories(plan):
+    """Create every directory of the planned files once."""
+    for path in sorted({os.path.dirname(item.file_path) for item in plan}):
+        if path:
+            echo_debug("creating path: {}", path)
+            os.makedirs(path, exist_ok=True)
 
 
 def fatal_request_error(err=None):
@@ -174,7 +187,11 @@ def fatal_request_error(err=None):
     giveup=fatal_request_error,
 )
 def download_file(
-    file_path, download_url, skip_existing=True, no_progress=False
+    file_path,
+    download_url,
+    skip_existing=True,
+    no_progress=False,
+    progress=None,
 ):
     """Download a file to file system.
 
@@ -184,6 +201,8 @@ def download_file(
         download_url (str): url of the file to download
         skip_existing (bool): skip already downloaded files
         no_progress (bool): don't show progress bar
+        progress (TransferProgress, optional): progress shared by
+            concurrent downloads, closed by the caller
 
     Returns:
         str : file path
@@ -202,11 +221,13 @@ def download_file(
         headers = dict()
         echo_info("Downloading file to {}".format(file_path))
 
-    stream_params = dict(
-        stream=True, allow_redirects=False, headers=headers, timeout=30
-    )
-
-    with requests.get(download_url, **stream_params) as req:
+    with requests.get(
+        download_url,
+        stream=True,
+        allow_redirects=False,
+        headers=headers,
+        timeout=30,
+    ) as req:
         req.raise_for_status()
         total = int(req.headers["content-length"])
         # pylint: disable=E0012,C0330
@@ -218,26 +239,32 @@ def download_file(
             echo_info("Skipping existing file: {}".format(file_path))
             return file_path
 
-        echo_debug("Starting to download file to: {}".format(file_path))
-
-        with open(file_path_tmp, file_mode) as downloaded_file:
-            if not no_progress:
-                pbar = get_progress_bar(
-                    int(req.headers["content-length"]), "Downloading: "
+        echo_debug("Starting to download file to: {}", file_path)
+
+        # leave room in the memory budget for concurrent transfers
+        chunk_size = min(CHUNK_SIZE, memory_budget.size // MAX_CONCURRENCY)
+        own_progress = None
+        if progress is None and not no_progress:
+            progress = own_progress = TransferProgress("Downloading")
+        try:
+            with open(
+                file_path_tmp, file_mode
+            ) as downloaded_file, memory_budget.reserve(chunk_size):
+                write_chunks(
+                    req.iter_content(chunk_size=chunk_size),
+                    downloaded_file,
+                    None if no_progress else progress,
+                    file_path,
+                    total,
                 )
-                pbar.start()
-            for chunk in req.iter_content(chunk_size=CHUNK_SIZE):
-                downloaded_file.write(chunk)
-                if not no_progress:
-                    pbar.update(pbar.value + len(chunk))
-            if not no_progress:
-                pbar.finish()
+        finally:
+            if own_progress:
+                own_progress.close()
 
         # Cross-platform cross-python-version file overwriting
         if os.path.exists(file_path):
             echo_debug(
-                "Found old file under same name: {}. "
-                "Removing it.".format(file_path)
+                "Found old file under same name: {}. Removing it.", file_path
             )
             os.remove(file_path)
         os.rename(file_path_tmp, file_path)
@@ -245,6 +272,32 @@ def download_file(
         return file_path
 
 
+def read_manifest(path):
+    """Read samples and their download urls from a manifest.
+
+    Manifest is the JSON output of `--download-urls` or the same samples
+    as JSON lines, one sample per line.
+
+    Args:
+        path (str): manifest file path
+
+    Returns:
+        list of ManifestSample
+
+    Raises:
+        ValueError: if the manifest is not valid
+    """
+    with open(path) as manifest_file:
+        content = manifest_file.read()
+    if content.lstrip().startswith("["):
+        samples = loads(content)
+    else:
+        samples = [
+            loads(line) for line in content.splitlines() if line.strip()
+        ]
+    return [ManifestSample.parse_obj(sample) for sample in samples]
+
+
 def save_metadata_file(path, api_client, sample_id, skip_existing=True):
     """Helper function to save metadata to json file.
 
@@ -293,7 +346,7 @@ def save_qc_file(path, api_client, sample_id, skip_existing=True):
         raise
     echo_info("Downloading file to: {}".format(path))
     with open(path, "w") as qc_file:
-        content = json.dumps(sample_qcs, cls=client.CustomEncoder)
+        content = dumps(sample_qcs)
         qc_file.write(content)
     echo_info("Finished downloading a file: {}".format(path))
 
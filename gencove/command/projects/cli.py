@@ -4,15 +4,19 @@ import click
 
 from .create_batch.cli import create_project_batch
 from .create_merged_vcf.cli import create_merged_vcf
+from .export_metadata.cli import export_metadata
 from .get_batch.cli import get_batch
 from .get_merged_vcf.cli import get_merged_vcf
 from .list.cli import list_projects
 from .list_batch_types.cli import list_project_batch_types
 from .list_batches.cli import list_project_batches
+from .qc_summary.cli import qc_summary
+from .query_samples.cli import query_samples
 from .restore_samples.cli import restore_project_samples
 from .run_prefix.cli import run_prefix
 from .samples.cli import list_project_samples
 from .status_merged_vcf.cli import status_merged_vcf
+from .sync.cli import sync
 
 
 @click.group()
@@ -31,3 +35,7 @@ projects.add_command(run_prefix)
 projects.add_command(create_merged_vcf)
 projects.add_command(status_merged_vcf)
 projects.add_command(get_merged_vcf)
+projects.add_command(export_metadata)
+projects.add_command(qc_summary)
+projects.add_command(sync)
+projects.add_command(query_samples)
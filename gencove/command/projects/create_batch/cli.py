@@ -1,7 +1,13 @@
 """Project batch types list shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    get_sample_ids,
+    sample_ids_file_option,
+    wait_options,
+)
 from gencove.constants import Credentials, Optionals
 from gencove.logger import echo_debug
 
@@ -23,29 +29,43 @@ from .main import CreateBatch
     help="A comma separated list of sample ids for "
     "which to create a batch; if not specified use all samples in project",
 )
+@sample_ids_file_option
+@add_options(wait_options)
+@click.option(
+    "--no-progress",
+    is_flag=True,
+    help="If specified, no progress bar is shown.",
+)
 @add_options(common_options)
 def create_project_batch(  # pylint: disable=too-many-arguments
     project_id,
     batch_type,
     batch_name,
     sample_ids,
+    sample_ids_file,
+    wait,
+    wait_timeout,
+    no_progress,
     host,
     email,
     password,
     api_key,
 ):
-    """Create a batch in a project."""
+    """Create a batch in a project.
+
+    With --wait, the batch is waited for and its deliverable is downloaded
+    once it is created.
+    """
+    s_ids = list(get_sample_ids(sample_ids, sample_ids_file))
     if sample_ids:
-        sample_ids = [s_id.strip() for s_id in sample_ids.split(",")]
-        echo_debug("Sample ids translation: {}".format(sample_ids))
-    else:
-        sample_ids = []
+        echo_debug("Sample ids translation: {}".format(s_ids))
 
     CreateBatch(
         project_id,
         batch_type,
         batch_name,
-        sample_ids,
+        s_ids,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, wait=wait, wait_timeout=wait_timeout),
+        no_progress,
     ).run()
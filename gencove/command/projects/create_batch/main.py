@@ -1,8 +1,12 @@
 """Create project's batch executor."""
 from gencove import client  # noqa: I100
 from gencove.command.base import Command
-from gencove.command.projects.list_batches.utils import get_line
-from gencove.command.utils import is_valid_uuid
+from gencove.command.projects.get_batch.main import (
+    download_batch_deliverable,
+    wait_for_batch,
+)
+from gencove.command.projects.list_batches.utils import COLUMNS, get_row
+from gencove.command.utils import RowWriter, is_valid_uuid
 from gencove.exceptions import ValidationError
 
 
@@ -18,8 +22,10 @@ class CreateBatch(Command):
         sample_ids,
         credentials,
         options,
+        no_progress=False,
     ):
         super().__init__(credentials, options)
+        self.no_progress = no_progress
         self.project_id = project_id
         self.batch_type = batch_type
         self.batch_name = batch_name
@@ -72,8 +78,20 @@ class CreateBatch(Command):
                 sample_ids=self.sample_ids,
             )
             self.echo_debug(created_batches_details)
-            for batch in created_batches_details.results:
-                self.echo_data(get_line(batch))
+            with RowWriter(COLUMNS) as writer:
+                for batch in created_batches_details.results:
+                    writer.write(get_row(batch))
+            if self.options.wait:
+                for batch in created_batches_details.results:
+                    download_batch_deliverable(
+                        wait_for_batch(
+                            self.api_client,
+                            batch.id,
+                            self.options.wait_timeout,
+                        ),
+                        None,
+                        self.no_progress,
+                    )
         except client.APIClientError as err:
             self.echo_debug(err)
             if err.status_code == 400:
@@ -1,7 +1,11 @@
 """Project create merged VCF shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    wait_options,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import CreateMergedVCF
@@ -9,17 +13,40 @@ from .main import CreateMergedVCF
 
 @click.command("create-merged-vcf")
 @click.argument("project_id")
+@add_options(wait_options)
+@click.option(
+    "--output-filename",
+    help="Output filename for merged VCF file, used with --wait.",
+    type=click.Path(),
+    required=False,
+    default=None,
+)
+@click.option(
+    "--no-progress",
+    is_flag=True,
+    help="If specified, no progress bar is shown.",
+)
 @add_options(common_options)
-def create_merged_vcf(
+def create_merged_vcf(  # pylint: disable=too-many-arguments
     project_id,
+    wait,
+    wait_timeout,
+    output_filename,
+    no_progress,
     host,
     email,
     password,
     api_key,
 ):
-    """Merge VCF files in a project."""
+    """Merge VCF files in a project.
+
+    With --wait, the merge is waited for and the merged VCF file is
+    downloaded once it is done.
+    """
     CreateMergedVCF(
         project_id,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, wait=wait, wait_timeout=wait_timeout),
+        output_filename,
+        no_progress,
     ).run()
@@ -1,4 +1,5 @@
 """Merge project's VCF files executor."""
+from ..get_merged_vcf.main import download_merged_vcf, wait_for_merged_vcf
 from ..status_merged_vcf.utils import get_line
 from ...base import Command
 from ...utils import is_valid_uuid
@@ -9,14 +10,19 @@ from ....exceptions import ValidationError
 class CreateMergedVCF(Command):
     """Merge project's VCF files executor."""
 
+    # pylint: disable=too-many-arguments
     def __init__(
         self,
         project_id,
         credentials,
         options,
+        output_filename=None,
+        no_progress=False,
     ):
         super().__init__(credentials, options)
         self.project_id = project_id
+        self.output_filename = output_filename
+        self.no_progress = no_progress
 
     def initialize(self):
         """Initialize subcommand."""
@@ -47,6 +53,18 @@ class CreateMergedVCF(Command):
                 "Issued merge request for project {}".format(self.project_id),
             )
             self.echo_data(get_line(created_merge_details))
+            if self.options.wait:
+                wait_for_merged_vcf(
+                    self.api_client,
+                    self.project_id,
+                    self.options.wait_timeout,
+                )
+                download_merged_vcf(
+                    self.api_client,
+                    self.project_id,
+                    self.output_filename,
+                    self.no_progress,
+                )
         except client.APIClientError as err:
             self.echo_debug(err)
             if err.status_code == 400:
@@ -0,0 +1,69 @@
+"""Project export metadata shell command definition."""
+import click
+
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    page_size_option,
+)
+from gencove.constants import Credentials
+from gencove.utils import enum_as_dict
+
+from .constants import ExportFormat, ExportMetadataOptions
+from .main import ExportMetadata
+
+
+@click.command("export-metadata")
+@click.argument("project_id")
+@click.option(
+    "--output",
+    default="-",
+    help="File to write metadata to, defaults to stdout.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(enum_as_dict(ExportFormat).values()),
+    help="Output format, defaults to output file extension or jsonl. "
+    "parquet requires pyarrow to be installed.",
+)
+@page_size_option
+@add_options(common_options)
+def export_metadata(  # pylint: disable=too-many-arguments
+    project_id,
+    output,
+    output_format,
+    page_size,
+    host,
+    email,
+    password,
+    api_key,
+):  # noqa: D413,D301,D412 # pylint: disable=C0301
+    """Export metadata of all samples in a project.
+
+    Examples:
+
+        Export metadata as JSON lines to stdout:
+
+            gencove projects export-metadata d9eaa54b-aaac-4b85-92b0-0b564be6d7db
+
+        Export metadata to CSV:
+
+            gencove projects export-metadata d9eaa54b-aaac-4b85-92b0-0b564be6d7db --output metadata.csv
+    \f
+
+    Args:
+        project_id (str): project id in Gencove's system.
+        output (str): path/to/output or "-" for stdout.
+        output_format (str, optional): jsonl, csv or parquet.
+        page_size (int or str, optional): number of samples requested per
+            page or "auto" to adapt page size to API response times.
+    """  # noqa: E501
+    ExportMetadata(
+        project_id,
+        output,
+        Credentials(email=email, password=password, api_key=api_key),
+        ExportMetadataOptions(
+            host=host, output_format=output_format, page_size=page_size
+        ),
+    ).run()
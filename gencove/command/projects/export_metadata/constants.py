@@ -0,0 +1,27 @@
+"""Export metadata constants."""
+from enum import Enum, unique
+from typing import Optional, Union
+
+from gencove.constants import Optionals
+
+
+@unique
+class ExportFormat(Enum):
+    """ExportFormat enum"""
+
+    JSONL = "jsonl"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+EXPORT_COLUMNS = ("sample_id", "client_id", "metadata")
+# rows held in memory before they are written as a parquet row group
+PARQUET_BATCH_SIZE = 1000
+
+
+# pylint: disable=too-few-public-methods
+class ExportMetadataOptions(Optionals):
+    """ExportMetadataOptions model"""
+
+    output_format: Optional[str]
+    page_size: Optional[Union[int, str]]
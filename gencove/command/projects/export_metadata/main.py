@@ -0,0 +1,123 @@
+"""Export project metadata subcommand."""
+import time
+
+import backoff
+
+from gencove.client import APIClientError, APIClientTimeout  # noqa: I100
+from gencove.command.base import Command
+from gencove.constants import STREAMED_PAGE_SIZE
+from gencove.exceptions import ValidationError
+
+from .constants import ExportFormat
+from .utils import get_output_format, has_pyarrow, open_writer
+from ...utils import PageSizer, is_valid_uuid, map_concurrently
+
+
+class ExportMetadata(Command):
+    """Export metadata command executor."""
+
+    def __init__(self, project_id, output, credentials, options):
+        super().__init__(credentials, options)
+        self.project_id = project_id
+        self.output = output
+        self.output_format = get_output_format(options.output_format, output)
+        self.page_sizer = PageSizer(options.page_size, STREAMED_PAGE_SIZE)
+
+    def initialize(self):
+        """Initialize export-metadata subcommand."""
+        self.login()
+
+    def validate(self):
+        """Validate command input.
+
+        Raises:
+            ValidationError - if something is wrong with command parameters.
+        """
+        if is_valid_uuid(self.project_id) is False:
+            raise ValidationError("Project ID is not valid. Exiting.")
+
+        if self.output_format == ExportFormat.PARQUET:
+            if not has_pyarrow():
+                raise ValidationError(
+                    "Parquet output requires pyarrow, install it with "
+                    "`pip install pyarrow`."
+                )
+            if self.output == "-":
+                raise ValidationError(
+                    "Parquet output cannot be written to stdout."
+                )
+
+    def execute(self):
+        self.echo_debug(
+            "Exporting metadata of project {} as {}",
+            self.project_id,
+            self.output_format.value,
+        )
+        exported = 0
+        try:
+            with open_writer(self.output_format, self.output) as writer:
+                for row in map_concurrently(
+                    self.get_sample_row, self.get_paginated_samples()
+                ):
+                    writer.write(row)
+                    exported += 1
+        except APIClientError as err:
+            if err.status_code == 404:
+                self.echo_error(
+                    "Project {} does not exist.".format(self.project_id)
+                )
+            raise
+        if self.output != "-":
+            self.echo_info(
+                "Metadata of {} samples exported to {}".format(
+                    exported, self.output
+                )
+            )
+
+    def get_paginated_samples(self):
+        """Generate project samples from all pages."""
+        more = True
+        next_link = None
+        while more:
+            self.echo_debug(
+                "Get samples page, page size: {}", self.page_sizer.size
+            )
+            start = time.monotonic()
+            try:
+                resp = self.api_client.get_project_samples(
+                    project_id=self.project_id,
+                    next_link=next_link,
+                    lazy=True,
+                    stream=True,
+                    limit=self.page_sizer.size,
+                )
+            except APIClientTimeout:
+                if not self.page_sizer.shrink():
+                    raise
+                continue
+            yield from self.page_sizer.measure(resp.results, start)
+            next_link = resp.meta.next
+            more = next_link is not None
+
+    def get_sample_row(self, sample):
+        """Get metadata of a sample.
+
+        Returns:
+            dict: exported row
+        """
+        return {
+            "sample_id": str(sample.id),
+            "client_id": sample.client_id,
+            "metadata": self.get_metadata(sample.id),
+        }
+
+    @backoff.on_exception(
+        backoff.expo,
+        (APIClientTimeout),
+        max_tries=2,
+        max_time=30,
+    )
+    def get_metadata(self, sample_id):
+        """Get metadata of a sample."""
+        # API always returns a dictionary with a "metadata" key
+        return self.api_client.get_metadata(sample_id=sample_id).metadata
@@ -0,0 +1,141 @@
+"""Export metadata utilities."""
+import csv
+import importlib.util
+import os
+from contextlib import contextmanager
+
+import click
+
+from gencove.serialization import dumps
+
+from .constants import EXPORT_COLUMNS, ExportFormat, PARQUET_BATCH_SIZE
+
+
+def has_pyarrow():
+    """Check if pyarrow is installed, without importing it."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def get_output_format(output_format, output):
+    """Return output format, deduced from output file extension if not set.
+
+    Args:
+        output_format (str, optional): one of ExportFormat values
+        output (str): path/to/output or "-" for stdout
+
+    Returns:
+        ExportFormat
+    """
+    if output_format:
+        return ExportFormat(output_format)
+    extension = os.path.splitext(output)[1].lstrip(".").lower()
+    try:
+        return ExportFormat(extension)
+    except ValueError:
+        return ExportFormat.JSONL
+
+
+class JSONLinesWriter:
+    """Write rows as JSON objects, one per line."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, row):
+        """Write a row."""
+        self.stream.write(dumps(row))
+        self.stream.write("\n")
+
+    def close(self):
+        """Nothing is buffered."""
+
+
+class CSVWriter:
+    """Write rows as CSV with metadata as a JSON string."""
+
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, row):
+        """Write a row."""
+        self.writer.writerow(
+            (row["sample_id"], row["client_id"], dumps(row["metadata"]))
+        )
+
+    def close(self):
+        """Nothing is buffered."""
+
+
+class ParquetWriter:
+    """Write rows as Parquet row groups with metadata as a JSON string.
+
+    Requires pyarrow, which is imported only when this writer is used.
+    """
+
+    def __init__(self, path):
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.parquet
+
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema(
+            [(column, pyarrow.string()) for column in EXPORT_COLUMNS]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._columns = {column: [] for column in EXPORT_COLUMNS}
+
+    def write(self, row):
+        """Buffer a row, write a row group when the buffer is full."""
+        self._columns["sample_id"].append(row["sample_id"])
+        self._columns["client_id"].append(row["client_id"])
+        self._columns["metadata"].append(dumps(row["metadata"]))
+        if len(self._columns["sample_id"]) >= PARQUET_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._columns["sample_id"]:
+            self._writer.write_table(
+                self._pyarrow.table(self._columns, schema=self._schema)
+            )
+            self._columns = {column: [] for column in EXPORT_COLUMNS}
+
+    def close(self):
+        """Write buffered rows and the file footer."""
+        self._flush()
+        self._writer.close()
+
+
+@contextmanager
+def open_writer(output_format, output):
+    """Open a writer of exported rows.
+
+    Args:
+        output_format (ExportFormat): format of the output
+        output (str): path/to/output or "-" for stdout
+
+    Yields:
+        writer with `write(row)` method
+    """
+    if output_format == ExportFormat.PARQUET:
+        writer = ParquetWriter(output)
+        yield writer
+        writer.close()
+        return
+    if output == "-":
+        stream = click.get_text_stream("stdout")
+    else:
+        # pylint: disable=consider-using-with
+        stream = open(output, "w", newline="")
+    try:
+        if output_format == ExportFormat.CSV:
+            writer = CSVWriter(stream)
+        else:
+            writer = JSONLinesWriter(stream)
+        yield writer
+        writer.close()
+    finally:
+        if output == "-":
+            stream.flush()
+        else:
+            stream.close()
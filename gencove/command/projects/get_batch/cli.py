@@ -1,7 +1,11 @@
 """Project batch get shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    wait_options,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import GetBatch
@@ -16,6 +20,7 @@ from .main import GetBatch
     required=False,
     default=None,
 )
+@add_options(wait_options)
 @add_options(common_options)
 @click.option(
     "--no-progress",
@@ -24,13 +29,24 @@ from .main import GetBatch
 )
 # pylint: disable=too-many-arguments
 def get_batch(
-    batch_id, output_filename, host, email, password, api_key, no_progress
+    batch_id,
+    output_filename,
+    wait,
+    wait_timeout,
+    host,
+    email,
+    password,
+    api_key,
+    no_progress,
 ):
-    """Get batch that is available for a project."""
+    """Get batch that is available for a project.
+
+    With --wait, the batch is waited for until it is created.
+    """
     GetBatch(
         batch_id,
         output_filename,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, wait=wait, wait_timeout=wait_timeout),
         no_progress,
     ).run()
@@ -5,12 +5,63 @@ import backoff
 # pylint: disable=wrong-import-order
 from gencove import client  # noqa: I100
 from gencove.command.base import Command
-from gencove.command.utils import is_valid_uuid
+from gencove.command.utils import is_valid_uuid, wait_for_job
+from gencove.constants import BATCH_SUCCEEDED_STATUSES
 from gencove.exceptions import ValidationError
+from gencove.logger import echo_warning
 
 from ... import download
 
 
+def download_batch_deliverable(batch, output_filename, no_progress):
+    """Download the deliverable of a batch.
+
+    Args:
+        batch (BatchDetail): batch with files
+        output_filename (str, optional): where to save the deliverable,
+            defaults to the name from download url
+        no_progress (bool): do not show progress
+    """
+    if not batch.files:
+        raise ValidationError(
+            "There are no deliverables available for batch {}.".format(
+                batch.id
+            )
+        )
+    if len(batch.files) > 1:
+        echo_warning(
+            "There is more than one deliverable available for "
+            "batch {}.".format(batch.id)
+        )
+    deliverable = batch.files[0]
+    download_path = (
+        output_filename
+        if output_filename
+        else download.utils.get_filename_from_download_url(
+            deliverable.download_url
+        )
+    )
+    download.utils.download_file(
+        download_path,
+        deliverable.download_url,
+        no_progress=no_progress,
+    )
+
+
+def wait_for_batch(api_client, batch_id, timeout=None):
+    """Wait for a batch to be created.
+
+    Returns:
+        BatchDetail: batch with its deliverables
+    """
+    return wait_for_job(
+        lambda: api_client.get_batch(batch_id=batch_id),
+        "Batch {}".format(batch_id),
+        BATCH_SUCCEEDED_STATUSES,
+        timeout,
+    )
+
+
 class GetBatch(Command):
     """Get batch command executor."""
 
@@ -41,32 +92,15 @@ class GetBatch(Command):
         self.echo_debug("Retrieving batch:")
 
         try:
-            batch = self.get_batch()
-            if not batch.files:
-                raise ValidationError(
-                    "There are no deliverables available for batch {}.".format(
-                        self.batch_id
-                    )
-                )
-            if len(batch.files) > 1:
-                self.echo_warning(
-                    "There is more than one deliverable available for "
-                    "batch {}.".format(self.batch_id)
+            if self.options.wait:
+                batch = wait_for_batch(
+                    self.api_client, self.batch_id, self.options.wait_timeout
                 )
-            deliverable = batch.files[0]
-            download_path = (
-                self.output_filename
-                if self.output_filename
-                else download.utils.get_filename_from_download_url(
-                    deliverable.download_url
-                )
-            )
-            download.utils.download_file(
-                download_path,
-                deliverable.download_url,
-                no_progress=self.no_progress,
+            else:
+                batch = self.get_batch()
+            download_batch_deliverable(
+                batch, self.output_filename, self.no_progress
             )
-
         except client.APIClientError as err:
             self.echo_debug(err)
             if err.status_code == 400:
@@ -1,7 +1,11 @@
 """Project get merged VCF shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    wait_options,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import GetMergedVCF
@@ -16,6 +20,7 @@ from .main import GetMergedVCF
     required=False,
     default=None,
 )
+@add_options(wait_options)
 @add_options(common_options)
 @click.option(
     "--no-progress",
@@ -26,17 +31,22 @@ from .main import GetMergedVCF
 def get_merged_vcf(
     project_id,
     output_filename,
+    wait,
+    wait_timeout,
     host,
     email,
     password,
     api_key,
     no_progress,
 ):
-    """Download merged VCF file in a project."""
+    """Download merged VCF file in a project.
+
+    With --wait, the job merging VCF files is waited for first.
+    """
     GetMergedVCF(
         project_id,
         output_filename,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, wait=wait, wait_timeout=wait_timeout),
         no_progress,
     ).run()
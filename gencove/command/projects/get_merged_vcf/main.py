@@ -3,9 +3,63 @@ import backoff
 
 from ... import download
 from ...base import Command
-from ...utils import is_valid_uuid
+from ...utils import is_valid_uuid, wait_for_job
 from .... import client
+from ....constants import MERGED_VCF_SUCCEEDED_STATUSES
 from ....exceptions import ValidationError
+from ....logger import echo_debug
+
+MERGED_VCF_FILE_TYPE = "impute-vcf-merged"
+
+
+@backoff.on_exception(
+    backoff.expo,
+    (client.APIClientTimeout),
+    max_tries=5,
+    max_time=30,
+)
+def download_merged_vcf(api_client, project_id, output_filename, no_progress):
+    """Download merged VCF file of a project, retrying on timeouts.
+
+    Args:
+        api_client (APIClient): logged in client
+        project_id (str): project id
+        output_filename (str, optional): where to save the file, defaults
+            to the name from download url
+        no_progress (bool): do not show progress
+    """
+    project = api_client.get_project(project_id)
+    echo_debug(project)
+    merged_vcf = next(
+        (f for f in project.files if f.file_type == MERGED_VCF_FILE_TYPE),
+        None,
+    )
+    if merged_vcf is None:
+        raise ValidationError(
+            "No files to process for project {}".format(project_id)
+        )
+    download_path = (
+        output_filename
+        if output_filename
+        else download.utils.get_filename_from_download_url(
+            merged_vcf.download_url
+        )
+    )
+    download.utils.download_file(
+        download_path,
+        merged_vcf.download_url,
+        no_progress=no_progress,
+    )
+
+
+def wait_for_merged_vcf(api_client, project_id, timeout=None):
+    """Wait for the job merging VCF files of a project to finish."""
+    return wait_for_job(
+        lambda: api_client.retrieve_merged_vcf(project_id),
+        "Merging VCF files of project {}".format(project_id),
+        MERGED_VCF_SUCCEEDED_STATUSES,
+        timeout,
+    )
 
 
 class GetMergedVCF(Command):
@@ -38,47 +92,27 @@ class GetMergedVCF(Command):
         if is_valid_uuid(self.project_id) is False:
             raise ValidationError("Project ID is not valid. Exiting.")
 
-    @backoff.on_exception(
-        backoff.expo,
-        (client.APIClientTimeout),
-        max_tries=5,
-        max_time=30,
-    )
     def execute(self):
         """Download merged VCF file for a given project."""
+        if self.options.wait:
+            wait_for_merged_vcf(
+                self.api_client, self.project_id, self.options.wait_timeout
+            )
+        self.download()
+
+    def download(self):
+        """Download merged VCF file."""
         self.echo_debug(
             "Downloading merged VCF file for project {}".format(
                 self.project_id
             )
         )
         try:
-            project = self.api_client.get_project(self.project_id)
-            self.echo_debug(project)
-            merged_vcf = next(
-                (
-                    f
-                    for f in project.files
-                    if f.file_type == "impute-vcf-merged"
-                ),
-                None,
-            )
-            if merged_vcf is None:
-                raise ValidationError(
-                    "No files to process for project {}".format(
-                        self.project_id
-                    )
-                )
-            download_path = (
-                self.output_filename
-                if self.output_filename
-                else download.utils.get_filename_from_download_url(
-                    merged_vcf.download_url
-                )
-            )
-            download.utils.download_file(
-                download_path,
-                merged_vcf.download_url,
-                no_progress=self.no_progress,
+            download_merged_vcf(
+                self.api_client,
+                self.project_id,
+                self.output_filename,
+                self.no_progress,
             )
         except client.APIClientError as err:
             self.echo_debug(err)
@@ -4,14 +4,20 @@ import backoff
 # pylint: disable=wrong-import-order
 from gencove.client import APIClientError, APIClientTimeout  # noqa: I100
 from gencove.command.base import Command
+from gencove.command.utils import RowWriter, map_concurrently
 from gencove.models import Project
 
-from .utils import get_line
+from .utils import COLUMNS, get_row
 
 
 class List(Command):
     """List projects command executor."""
 
+    def __init__(self, credentials, options):
+        super().__init__(credentials, options)
+        # pipeline id: PipelineCapabilities, most projects share a few
+        self.pipeline_capabilities = {}
+
     def initialize(self):
         """Initialize list subcommand."""
         self.login()
@@ -23,17 +29,18 @@ class List(Command):
         self.echo_debug("Retrieving projects")
 
         try:
-            for projects in self.get_paginated_projects():
-                if not projects:
-                    self.echo_debug("No projects were found.")
-                    return
-
-                augmented_projects = self.augment_projects_with_pipeline_capabilities(  # noqa: E501
-                    projects
-                )
-
-                for project in augmented_projects:
-                    self.echo_data(get_line(project))
+            with RowWriter(COLUMNS, self.options.output_format) as writer:
+                for projects in self.get_paginated_projects():
+                    if not projects:
+                        self.echo_debug("No projects were found.")
+                        return
+
+                    augmented_projects = self.augment_projects_with_pipeline_capabilities(  # noqa: E501
+                        projects
+                    )
+
+                    for project in augmented_projects:
+                        writer.write(get_row(project))
         except APIClientError as err:
             if err.status_code == 404:
                 self.echo_error("No projects found.")
@@ -78,6 +85,9 @@ class List(Command):
     def augment_projects_with_pipeline_capabilities(self, projects):
         """Fetch pipeline capabilities and append it to the project.
 
+        Capabilities are fetched once per pipeline for the whole run,
+        pipelines not seen before are fetched concurrently.
+
         Args:
             projects (list[Project]): list of projects
 
@@ -85,10 +95,27 @@ class List(Command):
             list[Project]: same list of projects with pipeline capabilities
                 uuid replaced with PipelineCapability
         """
-        for project in projects:
-            pipeline_capabilities = self.get_pipeline_capabilities(
+        missing = list(
+            {
                 project.pipeline_capabilities
+                for project in projects
+                if project.pipeline_capabilities
+                not in self.pipeline_capabilities
+            }
+        )
+        if missing:
+            self.echo_debug(
+                "Get {} pipeline capabilities".format(len(missing))
+            )
+            self.pipeline_capabilities.update(
+                zip(
+                    missing,
+                    map_concurrently(self.get_pipeline_capabilities, missing),
+                )
             )
+        for project in projects:
             project_dict = dict(project)
-            project_dict["pipeline_capabilities"] = pipeline_capabilities
+            project_dict["pipeline_capabilities"] = self.pipeline_capabilities[
+                project.pipeline_capabilities
+            ]
             yield Project(**project_dict)
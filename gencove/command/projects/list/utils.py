@@ -1,21 +1,21 @@
 """Utilities for processing projects."""
-from gencove.command.utils import sanitize_string
 
+# column names of rows, used as csv header and jsonl keys
+COLUMNS = ("created", "id", "name", "pipeline_capabilities")
 
-def get_line(project):
+
+def get_row(project):
     """Build a list of relevant data to be printed.
 
     Args:
         project (Project): instance of project
 
     Returns:
-        list(str): list of relevant data to be printed
+        list(str): relevant data to be printed
     """
-    return "\t".join(
-        [
-            str(project.created),
-            str(project.id),
-            sanitize_string(project.name),
-            sanitize_string(project.pipeline_capabilities.name),
-        ]
-    )
+    return [
+        str(project.created),
+        str(project.id),
+        project.name,
+        project.pipeline_capabilities.name,
+    ]
@@ -1,7 +1,11 @@
 """Project batch types list shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    output_format_option,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import ListBatchTypes
@@ -9,11 +13,14 @@ from .main import ListBatchTypes
 
 @click.command("list-batch-types")
 @click.argument("project_id")
+@output_format_option
 @add_options(common_options)
-def list_project_batch_types(project_id, host, email, password, api_key):
+def list_project_batch_types(  # pylint: disable=too-many-arguments
+    project_id, output_format, host, email, password, api_key
+):
     """List batch types that are available for a project."""
     ListBatchTypes(
         project_id,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, output_format=output_format),
     ).run()
@@ -5,10 +5,10 @@ import backoff
 # pylint: disable=wrong-import-order
 from gencove import client  # noqa: I100
 from gencove.command.base import Command
-from gencove.command.utils import is_valid_uuid
+from gencove.command.utils import RowWriter, is_valid_uuid
 from gencove.exceptions import ValidationError
 
-from .utils import get_line
+from .utils import COLUMNS, get_row
 
 
 class ListBatchTypes(Command):
@@ -36,13 +36,14 @@ class ListBatchTypes(Command):
         self.echo_debug("Retrieving project's batch types:")
 
         try:
-            for batch_types in self.get_paginated_batch_types():
-                if not batch_types:
-                    self.echo_debug("No matching batch types were found.")
-                    return
-
-                for batch_type in batch_types:
-                    self.echo_data(get_line(batch_type))
+            with RowWriter(COLUMNS, self.options.output_format) as writer:
+                for batch_types in self.get_paginated_batch_types():
+                    if not batch_types:
+                        self.echo_debug("No matching batch types were found.")
+                        return
+
+                    for batch_type in batch_types:
+                        writer.write(get_row(batch_type))
 
         except client.APIClientError as err:
             self.echo_debug(err)
@@ -1,18 +1,19 @@
 """Utilities for processing batch types."""
 
+# column names of rows, used as csv header and jsonl keys
+COLUMNS = ("key", "description")
 
-def get_line(batch_type):
+
+def get_row(batch_type):
     """Build a list of relevant data to be printed.
 
     Args:
         batch_type (dict): an object from project batch types response
 
     Returns:
-        str: tab delimited list of relevant data to be printed
+        list(str): relevant data to be printed
     """
-    return "\t".join(
-        [
-            batch_type.key,
-            batch_type.description,
-        ]
-    )
+    return [
+        batch_type.key,
+        batch_type.description,
+    ]
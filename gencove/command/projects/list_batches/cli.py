@@ -1,7 +1,11 @@
 """Project batches list shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    output_format_option,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import ListBatches
@@ -9,11 +13,14 @@ from .main import ListBatches
 
 @click.command("list-batches")
 @click.argument("project_id")
+@output_format_option
 @add_options(common_options)
-def list_project_batches(project_id, host, email, password, api_key):
+def list_project_batches(  # pylint: disable=too-many-arguments
+    project_id, output_format, host, email, password, api_key
+):
     """List batches that are available for a project."""
     ListBatches(
         project_id,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, output_format=output_format),
     ).run()
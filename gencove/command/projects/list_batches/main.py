@@ -5,10 +5,10 @@ import backoff
 # pylint: disable=wrong-import-order
 from gencove import client  # noqa: I100
 from gencove.command.base import Command
-from gencove.command.utils import is_valid_uuid
+from gencove.command.utils import RowWriter, is_valid_uuid
 from gencove.exceptions import ValidationError
 
-from .utils import get_line
+from .utils import COLUMNS, get_row
 
 
 class ListBatches(Command):
@@ -36,13 +36,14 @@ class ListBatches(Command):
         self.echo_debug("Retrieving project's batches:")
 
         try:
-            for batches in self.get_paginated_batches():
-                if not batches:
-                    self.echo_debug("No matching batches were found.")
-                    return
-
-                for batch in batches:
-                    self.echo_data(get_line(batch))
+            with RowWriter(COLUMNS, self.options.output_format) as writer:
+                for batches in self.get_paginated_batches():
+                    if not batches:
+                        self.echo_debug("No matching batches were found.")
+                        return
+
+                    for batch in batches:
+                        writer.write(get_row(batch))
         except client.APIClientError as err:
             self.echo_debug(err)
             if err.status_code == 400:
@@ -1,21 +1,22 @@
 """Utilities for processing batches."""
 
+# column names of rows, used as csv header and jsonl keys
+COLUMNS = ("id", "created", "status", "batch_type", "name")
 
-def get_line(batch):
+
+def get_row(batch):
     """Build a list of relevant data to be printed.
 
     Args:
         batch (dict): an object from project batches response
 
     Returns:
-        str: tab delimited list of relevant data to be printed
+        list(str): relevant data to be printed
     """
-    return "\t".join(
-        [
-            str(batch.id),
-            batch.last_status.created.isoformat(),
-            batch.last_status.status,
-            batch.batch_type,
-            batch.name,
-        ]  # noqa
-    )
+    return [
+        str(batch.id),
+        batch.last_status.created.isoformat(),
+        batch.last_status.status,
+        batch.batch_type,
+        batch.name,
+    ]
@@ -0,0 +1,66 @@
+"""Project QC summary shell command definition."""
+import click
+
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    page_size_option,
+)
+from gencove.constants import Credentials
+
+from .constants import OUTLIER_Z_SCORE, QCSummaryOptions
+from .main import QCSummary
+
+
+@click.command("qc-summary")
+@click.argument("project_id")
+@click.option(
+    "--z-score",
+    type=float,
+    default=OUTLIER_Z_SCORE,
+    help="Measured values further than this many standard deviations "
+    f"from the mean are outliers. Defaults to {OUTLIER_Z_SCORE}",
+)
+@click.option(
+    "--outliers",
+    type=click.Path(dir_okay=False),
+    help="File to write outlier samples of each QC key to, as TSV.",
+)
+@page_size_option
+@add_options(common_options)
+def qc_summary(  # pylint: disable=too-many-arguments
+    project_id,
+    z_score,
+    outliers,
+    page_size,
+    host,
+    email,
+    password,
+    api_key,
+):  # noqa: D413,D301,D412 # pylint: disable=C0301
+    """Summarize QC metrics of all completed samples in a project.
+
+    Outputs one row per QC key with the number of samples, pass and fail
+    counts, statistics of measured values and the number of outliers.
+
+    Examples:
+
+        Summarize QC and save outlier samples:
+
+            gencove projects qc-summary d9eaa54b-aaac-4b85-92b0-0b564be6d7db --outliers outliers.tsv
+    \f
+
+    Args:
+        project_id (str): project id in Gencove's system.
+        z_score (float): z-score above which a value is an outlier.
+        outliers (str, optional): path/to/outliers.tsv
+        page_size (int or str, optional): number of samples requested per
+            page or "auto" to adapt page size to API response times.
+    """  # noqa: E501
+    QCSummary(
+        project_id,
+        Credentials(email=email, password=password, api_key=api_key),
+        QCSummaryOptions(
+            host=host, z_score=z_score, outliers=outliers, page_size=page_size
+        ),
+    ).run()
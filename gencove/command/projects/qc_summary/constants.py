@@ -0,0 +1,34 @@
+"""QC summary constants."""
+from typing import Optional, Union
+
+from gencove.constants import Optionals
+
+# z-score above which a measured value is an outlier
+OUTLIER_Z_SCORE = 3.0
+PERCENTILES = (5, 50, 95)
+SUMMARY_COLUMNS = (
+    "key",
+    "samples",
+    "pass",
+    "fail",
+    "mean",
+    "std",
+    "min",
+    "p5",
+    "median",
+    "p95",
+    "max",
+    "outliers",
+)
+OUTLIER_COLUMNS = ("key", "sample_id", "value_measured", "z_score")
+QC_PASS = "pass"
+QC_FAIL = "fail"
+
+
+# pylint: disable=too-few-public-methods
+class QCSummaryOptions(Optionals):
+    """QCSummaryOptions model"""
+
+    z_score: Optional[float]
+    outliers: Optional[str]
+    page_size: Optional[Union[int, str]]
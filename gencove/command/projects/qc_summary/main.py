@@ -0,0 +1,132 @@
+"""Project QC summary subcommand."""
+import csv
+import time
+
+import backoff
+
+from gencove.client import APIClientError, APIClientTimeout  # noqa: I100
+from gencove.command.base import Command
+from gencove.constants import STREAMED_PAGE_SIZE, SampleStatus
+from gencove.exceptions import ValidationError
+
+from .constants import OUTLIER_COLUMNS, OUTLIER_Z_SCORE, SUMMARY_COLUMNS
+from .utils import QCColumns, format_number
+from ...utils import PageSizer, is_valid_uuid, map_concurrently
+
+
+class QCSummary(Command):
+    """QC summary command executor."""
+
+    def __init__(self, project_id, credentials, options):
+        super().__init__(credentials, options)
+        self.project_id = project_id
+        self.z_score = options.z_score or OUTLIER_Z_SCORE
+        self.outliers = options.outliers
+        self.page_sizer = PageSizer(options.page_size, STREAMED_PAGE_SIZE)
+
+    def initialize(self):
+        """Initialize qc-summary subcommand."""
+        self.login()
+
+    def validate(self):
+        """Validate command input.
+
+        Raises:
+            ValidationError - if something is wrong with command parameters.
+        """
+        if is_valid_uuid(self.project_id) is False:
+            raise ValidationError("Project ID is not valid. Exiting.")
+        if self.z_score <= 0:
+            raise ValidationError("Z-score must be a positive number.")
+
+    def execute(self):
+        self.echo_debug("Summarizing QC of project {}", self.project_id)
+        columns = QCColumns()
+        try:
+            for sample_id, results in map_concurrently(
+                self.get_sample_qc, self.get_paginated_samples()
+            ):
+                columns.add(sample_id, results)
+        except APIClientError as err:
+            if err.status_code == 404:
+                self.echo_error(
+                    "Project {} does not exist.".format(self.project_id)
+                )
+            raise
+
+        if not columns.keys():
+            self.echo_info("No QC metrics were found.")
+            return
+
+        self.echo_data("\t".join(SUMMARY_COLUMNS))
+        outliers = []
+        for key in columns.keys():
+            row, key_outliers = columns.summary(key, self.z_score)
+            self.echo_data("\t".join(row))
+            outliers.extend(
+                (key, sample_id, value, z_score)
+                for sample_id, value, z_score in key_outliers
+            )
+        if self.outliers:
+            self.output_outliers(outliers)
+
+    def output_outliers(self, outliers):
+        """Write outliers of all QC keys to a file."""
+        with open(self.outliers, "w", newline="") as outliers_file:
+            writer = csv.writer(outliers_file, delimiter="\t")
+            writer.writerow(OUTLIER_COLUMNS)
+            for key, sample_id, value, z_score in outliers:
+                writer.writerow(
+                    (
+                        key,
+                        sample_id,
+                        format_number(value),
+                        format_number(z_score),
+                    )
+                )
+        self.echo_info(
+            "{} outliers saved to {}".format(len(outliers), self.outliers)
+        )
+
+    def get_paginated_samples(self):
+        """Generate completed project samples from all pages."""
+        more = True
+        next_link = None
+        while more:
+            self.echo_debug(
+                "Get samples page, page size: {}", self.page_sizer.size
+            )
+            start = time.monotonic()
+            try:
+                resp = self.api_client.get_project_samples(
+                    project_id=self.project_id,
+                    next_link=next_link,
+                    sample_status=SampleStatus.COMPLETED.value,
+                    lazy=True,
+                    stream=True,
+                    limit=self.page_sizer.size,
+                )
+            except APIClientTimeout:
+                if not self.page_sizer.shrink():
+                    raise
+                continue
+            yield from self.page_sizer.measure(resp.results, start)
+            next_link = resp.meta.next
+            more = next_link is not None
+
+    @backoff.on_exception(
+        backoff.expo,
+        (APIClientTimeout),
+        max_tries=2,
+        max_time=30,
+    )
+    def get_sample_qc(self, sample):
+        """Get QC metrics of a sample.
+
+        Returns:
+            tuple: sample id and list of QualityControl
+        """
+        sample_id = str(sample.id)
+        return sample_id, self.api_client.get_sample_qc_metrics(
+            sample_id
+        ).results
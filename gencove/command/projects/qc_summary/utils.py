@@ -0,0 +1,110 @@
+"""QC summary utilities."""
+import math
+from array import array
+from collections import Counter, defaultdict
+
+from .constants import PERCENTILES, QC_FAIL, QC_PASS
+
+
+def percentile(sorted_values, q):
+    """Return q-th percentile, interpolating linearly between values.
+
+    Same as numpy's default `percentile` method.
+
+    Args:
+        sorted_values (sequence of float): non-empty, sorted
+        q (float): percentile between 0 and 100
+    """
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (
+        sorted_values[upper] - sorted_values[lower]
+    ) * (position - lower)
+
+
+def format_number(value):
+    """Format a statistic for the summary table."""
+    return "{:.6g}".format(value)
+
+
+class QCColumns:
+    """Measured values of all samples packed in one column per QC key.
+
+    Values are stored as arrays of doubles, with sample ids in a parallel
+    list, so that statistics are computed in a single pass per key instead
+    of per sample.
+    """
+
+    def __init__(self):
+        self.values = defaultdict(lambda: array("d"))
+        self.sample_ids = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def add(self, sample_id, results):
+        """Add QC results of a sample.
+
+        Args:
+            sample_id (str): sample id
+            results (list of QualityControl): sample QC metrics
+        """
+        for result in results or []:
+            if not result.quality_control_type or not result.quality_control:
+                continue
+            key = result.quality_control_type.key
+            quality_control = result.quality_control
+            self.statuses[key][(quality_control.status or "").lower()] += 1
+            if quality_control.value_measured is not None:
+                self.values[key].append(quality_control.value_measured)
+                self.sample_ids[key].append(sample_id)
+
+    def keys(self):
+        """Return QC keys in sorted order."""
+        return sorted(self.statuses)
+
+    def summary(self, key, z_score):
+        """Compute statistics and outliers of a QC key.
+
+        Args:
+            key (str): QC key
+            z_score (float): z-score above which a value is an outlier
+
+        Returns:
+            tuple: summary row (list of str) and outliers, a list of
+                (sample id, value, z-score)
+        """
+        values = self.values[key]
+        statuses = self.statuses[key]
+        row = [
+            key,
+            str(sum(statuses.values())),
+            str(statuses[QC_PASS]),
+            str(statuses[QC_FAIL]),
+        ]
+        if not values:
+            # mean, std, min, percentiles and max are not known
+            return row + [""] * (4 + len(PERCENTILES)) + ["0"], []
+        mean = math.fsum(values) / len(values)
+        std = math.sqrt(
+            math.fsum((value - mean) ** 2 for value in values) / len(values)
+        )
+        outliers = []
+        if std:
+            outliers = [
+                (sample_id, value, (value - mean) / std)
+                for sample_id, value in zip(self.sample_ids[key], values)
+                if abs(value - mean) > z_score * std
+            ]
+        sorted_values = sorted(values)
+        row.extend(
+            format_number(value)
+            for value in (
+                mean,
+                std,
+                sorted_values[0],
+                *(percentile(sorted_values, q) for q in PERCENTILES),
+                sorted_values[-1],
+            )
+        )
+        row.append(str(len(outliers)))
+        return row, outliers
@@ -0,0 +1,63 @@
+"""Query synced project samples shell command definition."""
+import click
+
+from gencove.command.common_cli_options import output_format_option
+from gencove.constants import (
+    Credentials,
+    SampleArchiveStatus,
+    SampleStatus,
+)
+from gencove.utils import enum_as_dict
+
+from .constants import QuerySamplesOptions
+from .main import QuerySamples
+from ..sync.constants import DEFAULT_DATABASE
+
+
+@click.command("query-samples")
+@click.argument("project_id")
+@click.option(
+    "--database",
+    type=click.Path(dir_okay=False),
+    default=DEFAULT_DATABASE,
+    help="SQLite database written by gencove projects sync. "
+    f"Defaults to {DEFAULT_DATABASE}",
+)
+@click.option("--search", help="Gencove sample ID or client ID substring")
+@click.option(
+    "--status",
+    help="Get samples with specific status",
+    type=click.Choice(enum_as_dict(SampleStatus).values()),
+    default=SampleStatus.ALL.value,
+)
+@click.option(
+    "--archive-status",
+    help="Get samples with specific archive status",
+    type=click.Choice(enum_as_dict(SampleArchiveStatus).values()),
+    default=SampleArchiveStatus.ALL.value,
+)
+@output_format_option
+def query_samples(  # pylint: disable=E0012,C0330,R0913
+    project_id,
+    database,
+    search,
+    status,
+    archive_status,
+    output_format,
+):
+    """List samples of a project synced with `gencove projects sync`.
+
+    Output is the same as of `gencove projects list-samples`, but samples
+    are read from the local database instead of the API.
+    """
+    QuerySamples(
+        project_id,
+        Credentials(email="", password="", api_key=""),
+        QuerySamplesOptions(
+            database=database,
+            status=status,
+            archive_status=archive_status,
+            search=search,
+            output_format=output_format,
+        ),
+    ).run()
@@ -0,0 +1,14 @@
+"""Describe constants in query-samples subcommand."""
+from typing import Optional
+
+from gencove.constants import Optionals
+
+
+# pylint: disable=too-few-public-methods
+class QuerySamplesOptions(Optionals):
+    """QuerySamplesOptions model"""
+
+    database: Optional[str]
+    status: Optional[str]
+    archive_status: Optional[str]
+    search: Optional[str]
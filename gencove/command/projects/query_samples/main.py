@@ -0,0 +1,63 @@
+"""Query synced project samples subcommand."""
+import os
+
+from gencove.command.base import Command
+from gencove.exceptions import ValidationError
+
+from ..samples.utils import COLUMNS
+from ..sync.constants import DEFAULT_DATABASE
+from ..sync.utils import SamplesDatabase, get_row
+from ...utils import RowWriter, is_valid_uuid
+
+
+class QuerySamples(Command):
+    """Query synced project samples command executor.
+
+    Samples are read from the local database written by `projects sync`,
+    the API is not contacted.
+    """
+
+    def __init__(self, project_id, credentials, options):
+        super().__init__(credentials, options)
+        self.project_id = project_id
+        self.database = options.database or DEFAULT_DATABASE
+        self.sample_status = options.status
+        self.sample_archive_status = options.archive_status
+        self.search_term = options.search
+
+    def initialize(self):
+        """Initialize query-samples subcommand, no login is needed."""
+
+    def validate(self):
+        """Validate command input."""
+        if is_valid_uuid(self.project_id) is False:
+            raise ValidationError("Project ID is not valid. Exiting.")
+        if not os.path.isfile(self.database):
+            raise ValidationError(
+                "Database {} does not exist. "
+                "Run gencove projects sync first.".format(self.database)
+            )
+
+    def validate_login_success(self):
+        """Login is not needed to read the local database."""
+
+    def execute(self):
+        with SamplesDatabase(self.database) as database:
+            if not database.is_synced(self.project_id):
+                raise ValidationError(
+                    "Project {} was not synced to {}. "
+                    "Run gencove projects sync first.".format(
+                        self.project_id, self.database
+                    )
+                )
+            rows = database.query_samples(
+                self.project_id,
+                status=self.sample_status,
+                archive_status=self.sample_archive_status,
+                search=self.search_term,
+            )
+        if not rows:
+            self.echo_debug("No matching samples were found.")
+        with RowWriter(COLUMNS, self.options.output_format) as writer:
+            for row in rows:
+                writer.write(get_row(row))
@@ -1,7 +1,12 @@
 """Project restore samples shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    get_sample_ids,
+    sample_ids_file_option,
+)
 from gencove.constants import Credentials, Optionals
 from gencove.logger import echo_debug
 
@@ -18,24 +23,25 @@ from .main import RestoreSamples
         "omitted, restores all archived samples in project."
     ),
 )
+@sample_ids_file_option
 @add_options(common_options)
 def restore_project_samples(  # pylint: disable=too-many-arguments
     project_id,
     sample_ids,
+    sample_ids_file,
     host,
     email,
     password,
     api_key,
 ):
     """Restore samples in a project."""
-    sample_ids = (
-        [s_id.strip() for s_id in sample_ids.split(",")] if sample_ids else []
-    )
-    echo_debug("Sample ids translation: {}".format(sample_ids))
+    s_ids = list(get_sample_ids(sample_ids, sample_ids_file))
+    if sample_ids:
+        echo_debug("Sample ids translation: {}".format(s_ids))
 
     RestoreSamples(
         project_id,
-        sample_ids,
+        s_ids,
         Credentials(email=email, password=password, api_key=api_key),
         Optionals(host=host),
     ).run()
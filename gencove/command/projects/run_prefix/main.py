@@ -99,6 +99,7 @@ class RunPrefix(Command):
             gncv_path=self.prefix,
             assigned_status=self.status,
             next_link=next_link,
+            lazy=True,
         )
 
     def _assign_samples(self, samples):
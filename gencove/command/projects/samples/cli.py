@@ -1,7 +1,13 @@
 """Samples list shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    output_format_option,
+    page_size_option,
+    shard_option,
+)
 from gencove.constants import (
     Credentials,
     SampleArchiveStatus,
@@ -30,9 +36,22 @@ from .main import ListSamples
     type=click.Choice(enum_as_dict(SampleArchiveStatus).values()),
     default=SampleArchiveStatus.ALL.value,
 )
+@page_size_option
+@shard_option
+@output_format_option
 @add_options(common_options)
 def list_project_samples(  # pylint: disable=E0012,C0330,R0913
-    project_id, search, status, archive_status, host, email, password, api_key
+    project_id,
+    search,
+    status,
+    archive_status,
+    page_size,
+    shard,
+    output_format,
+    host,
+    email,
+    password,
+    api_key,
 ):
     """List samples in a project."""
     ListSamples(
@@ -43,5 +62,8 @@ def list_project_samples(  # pylint: disable=E0012,C0330,R0913
             status=status,
             archive_status=archive_status,
             search=search,
+            page_size=page_size,
+            shard=shard,
+            output_format=output_format,
         ),
     ).run()
@@ -1,5 +1,5 @@
 """Describe constants in samples subcommand."""
-from typing import Optional
+from typing import Optional, Tuple, Union
 
 from gencove.constants import Optionals
 
@@ -11,3 +11,5 @@ class SamplesOptions(Optionals):
     status: Optional[str]
     archive_status: Optional[str]
     search: Optional[str]
+    page_size: Optional[Union[int, str]]
+    shard: Optional[Tuple[int, int]]
@@ -1,12 +1,15 @@
 """List projects subcommand."""
+import time
+
 import backoff
 
 # pylint: disable=wrong-import-order
 from gencove.client import APIClientError, APIClientTimeout  # noqa: I100
 from gencove.command.base import Command
+from gencove.constants import STREAMED_PAGE_SIZE
 
-from .utils import get_line
-from ...utils import is_valid_uuid
+from .utils import COLUMNS, get_row
+from ...utils import PageSizer, RowWriter, in_shard, is_valid_uuid
 from ....exceptions import ValidationError
 
 
@@ -19,6 +22,8 @@ class ListSamples(Command):
         self.sample_status = options.status
         self.sample_archive_status = options.archive_status
         self.search_term = options.search
+        self.shard = options.shard
+        self.page_sizer = PageSizer(options.page_size, STREAMED_PAGE_SIZE)
 
     def initialize(self):
         """Initialize list subcommand."""
@@ -39,13 +44,17 @@ class ListSamples(Command):
             )
         )
         try:
-            for samples in self.get_paginated_samples():
-                if not samples:
+            found = False
+            with RowWriter(COLUMNS, self.options.output_format) as writer:
+                for samples in self.get_paginated_samples():
+                    for sample in samples or []:
+                        found = True
+                        if not in_shard(sample.id, self.shard):
+                            continue
+                        writer.write(get_row(sample))
+                if not found:
                     self.echo_debug("No matching samples were found.")
                     return
-
-                for sample in samples:
-                    self.echo_data(get_line(sample))
         except APIClientError as err:
             if err.status_code == 404:
                 self.echo_error(
@@ -62,9 +71,17 @@ class ListSamples(Command):
         more = True
         next_link = None
         while more:
-            self.echo_debug("Get sample sheet page")
-            resp = self.get_samples(next_link)
-            yield resp.results
+            self.echo_debug(
+                "Get sample sheet page, page size: {}", self.page_sizer.size
+            )
+            start = time.monotonic()
+            try:
+                resp = self.get_samples(next_link)
+            except APIClientTimeout:
+                if not self.page_sizer.shrink():
+                    raise
+                continue
+            yield self.page_sizer.measure(resp.results, start)
             next_link = resp.meta.next
             more = next_link is not None
 
@@ -82,4 +99,7 @@ class ListSamples(Command):
             search=self.search_term,
             sample_status=self.sample_status,
             sample_archive_status=self.sample_archive_status,
+            lazy=True,
+            stream=True,
+            limit=self.page_sizer.size,
         )
@@ -1,21 +1,28 @@
 """Utilities for processing and validating samples."""
 
+# column names of rows, used as csv header and jsonl keys
+COLUMNS = (
+    "status_created",
+    "id",
+    "client_id",
+    "status",
+    "archive_status",
+)
 
-def get_line(sample):
+
+def get_row(sample):
     """Build a list of relevant data to be printed.
 
     Args:
         sample (dict): an object from project samples
 
     Returns:
-        list(str): list of relevant data to be printed
+        list(str): relevant data to be printed
     """
-    return "\t".join(
-        [
-            sample.last_status.created.isoformat(),
-            str(sample.id),
-            str(sample.client_id),
-            sample.last_status.status,
-            sample.archive_last_status.status,
-        ]
-    )
+    return [
+        sample.last_status.created.isoformat(),
+        str(sample.id),
+        str(sample.client_id),
+        sample.last_status.status,
+        sample.archive_last_status.status,
+    ]
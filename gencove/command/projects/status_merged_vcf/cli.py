@@ -1,7 +1,11 @@
 """Project status merged VCF shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    wait_options,
+)
 from gencove.constants import Credentials, Optionals
 
 from .main import StatusMergedVCF
@@ -9,17 +13,23 @@ from .main import StatusMergedVCF
 
 @click.command("status-merged-vcf")
 @click.argument("project_id")
+@add_options(wait_options)
 @add_options(common_options)
-def status_merged_vcf(
+def status_merged_vcf(  # pylint: disable=too-many-arguments
     project_id,
+    wait,
+    wait_timeout,
     host,
     email,
     password,
     api_key,
 ):
-    """Get status of merge VCF files job in a project."""
+    """Get status of merge VCF files job in a project.
+
+    With --wait, status is polled until the job finishes.
+    """
     StatusMergedVCF(
         project_id,
         Credentials(email=email, password=password, api_key=api_key),
-        Optionals(host=host),
+        Optionals(host=host, wait=wait, wait_timeout=wait_timeout),
     ).run()
@@ -3,8 +3,9 @@ import backoff
 
 from .utils import get_line
 from ...base import Command
-from ...utils import is_valid_uuid
+from ...utils import is_valid_uuid, wait_for_job
 from .... import client
+from ....constants import MERGED_VCF_SUCCEEDED_STATUSES
 from ....exceptions import ValidationError
 
 
@@ -48,9 +49,15 @@ class StatusMergedVCF(Command):
             "project {}".format(self.project_id)
         )
         try:
-            merge_details_status = self.api_client.retrieve_merged_vcf(
-                self.project_id
-            )
+            if self.options.wait:
+                merge_details_status = wait_for_job(
+                    self.get_merge_status,
+                    "Merging VCF files of project {}".format(self.project_id),
+                    MERGED_VCF_SUCCEEDED_STATUSES,
+                    self.options.wait_timeout,
+                )
+            else:
+                merge_details_status = self.get_merge_status()
             self.echo_debug(merge_details_status)
             if merge_details_status.last_status.status == "failed":
                 self.echo_warning("The job failed merging.")
@@ -68,3 +75,7 @@ class StatusMergedVCF(Command):
                     "running jobs associated with it.".format(self.project_id)
                 )
             raise
+
+    def get_merge_status(self):
+        """Get the status of the job merging VCF files."""
+        return self.api_client.retrieve_merged_vcf(self.project_id)
@@ -0,0 +1,67 @@
+"""Project sync shell command definition."""
+import click
+
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    page_size_option,
+)
+from gencove.constants import Credentials
+
+from .constants import DEFAULT_DATABASE, SyncOptions
+from .main import Sync
+
+
+@click.command("sync")
+@click.argument("project_id")
+@click.option(
+    "--database",
+    type=click.Path(dir_okay=False),
+    default=DEFAULT_DATABASE,
+    help="SQLite database to mirror project samples to. "
+    f"Defaults to {DEFAULT_DATABASE}",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    help="Sync all samples instead of only the ones modified since the "
+    "last sync, and remove samples no longer in the project.",
+)
+@page_size_option
+@add_options(common_options)
+def sync(  # pylint: disable=too-many-arguments
+    project_id,
+    database,
+    full,
+    page_size,
+    host,
+    email,
+    password,
+    api_key,
+):  # noqa: D413,D301,D412 # pylint: disable=C0301
+    """Mirror samples of a project into a local SQLite database.
+
+    Only samples modified since the previous sync are requested. Use
+    `gencove projects query-samples` to filter synced samples.
+
+    Examples:
+
+        Sync project samples:
+
+            gencove projects sync d9eaa54b-aaac-4b85-92b0-0b564be6d7db --database samples.db
+    \f
+
+    Args:
+        project_id (str): project id in Gencove's system.
+        database (str): path/to/samples.db
+        full (bool): sync all samples.
+        page_size (int or str, optional): number of samples requested per
+            page or "auto" to adapt page size to API response times.
+    """  # noqa: E501
+    Sync(
+        project_id,
+        Credentials(email=email, password=password, api_key=api_key),
+        SyncOptions(
+            host=host, database=database, full=full, page_size=page_size
+        ),
+    ).run()
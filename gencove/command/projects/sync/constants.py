@@ -0,0 +1,18 @@
+"""Project sync constants."""
+from typing import Optional, Union
+
+from gencove.constants import Optionals, SampleStatus
+
+# local database used by sync and query-samples unless given otherwise
+DEFAULT_DATABASE = "gencove-samples.db"
+# statuses matched by the "completed" status filter
+COMPLETED_STATUSES = (SampleStatus.SUCCEEDED.value, SampleStatus.FAILED.value)
+
+
+# pylint: disable=too-few-public-methods
+class SyncOptions(Optionals):
+    """SyncOptions model"""
+
+    database: Optional[str]
+    full: Optional[bool]
+    page_size: Optional[Union[int, str]]
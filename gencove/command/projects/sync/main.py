@@ -0,0 +1,143 @@
+"""Project sync subcommand."""
+import time
+
+import backoff
+
+from gencove.client import APIClientError, APIClientTimeout  # noqa: I100
+from gencove.command.base import Command
+from gencove.constants import (
+    STREAMED_PAGE_SIZE,
+    SampleSortBy,
+    SortOrder,
+)
+from gencove.exceptions import ValidationError
+
+from .constants import DEFAULT_DATABASE
+from .utils import MODIFIED_COLUMN, SamplesDatabase, sample_row
+from ...utils import PageSizer, is_valid_uuid
+
+
+class Sync(Command):
+    """Project sync command executor.
+
+    Samples are requested newest modified first. Once a sample modified
+    before the last sync is reached, the rest of the project is already in
+    the database and paging stops.
+    """
+
+    def __init__(self, project_id, credentials, options):
+        super().__init__(credentials, options)
+        self.project_id = project_id
+        self.database = options.database or DEFAULT_DATABASE
+        self.full = options.full
+        self.page_sizer = PageSizer(options.page_size, STREAMED_PAGE_SIZE)
+
+    def initialize(self):
+        """Initialize sync subcommand."""
+        self.login()
+
+    def validate(self):
+        """Validate command input."""
+        if is_valid_uuid(self.project_id) is False:
+            raise ValidationError("Project ID is not valid. Exiting.")
+
+    def execute(self):
+        synced = time.time()
+        with SamplesDatabase(self.database) as database:
+            watermark = (
+                None if self.full else database.get_watermark(self.project_id)
+            )
+            self.echo_debug(
+                "Syncing project {} modified since {}",
+                self.project_id,
+                watermark,
+            )
+            newest = None
+            count = 0
+            try:
+                for rows in self.get_modified_rows(watermark, synced):
+                    database.save_samples(rows)
+                    count += len(rows)
+                    for row in rows:
+                        modified = row[MODIFIED_COLUMN]
+                        if modified is not None and (
+                            newest is None or modified > newest
+                        ):
+                            newest = modified
+            except APIClientError as err:
+                if err.status_code == 404:
+                    self.echo_error(
+                        "Project {} does not exist.".format(self.project_id)
+                    )
+                raise
+            removed = database.finish_sync(
+                self.project_id, newest, synced, self.full
+            )
+        self.echo_info(
+            "Synced {} samples of project {} to {}".format(
+                count, self.project_id, self.database
+            )
+        )
+        if removed:
+            self.echo_info(
+                "Removed {} samples no longer in the project".format(removed)
+            )
+
+    def get_modified_rows(self, watermark, synced):
+        """Generate database rows of samples, page by page.
+
+        Args:
+            watermark (float): stop at samples modified before it, None
+                to get all samples
+            synced (float): timestamp of the sync run
+
+        Yields:
+            list[tuple]: rows of a page
+        """
+        more = True
+        next_link = None
+        while more:
+            self.echo_debug(
+                "Get samples page, page size: {}", self.page_sizer.size
+            )
+            start = time.monotonic()
+            try:
+                resp = self.get_samples(next_link)
+            except APIClientTimeout:
+                if not self.page_sizer.shrink():
+                    raise
+                continue
+            rows = []
+            for sample in self.page_sizer.measure(resp.results, start):
+                row = sample_row(self.project_id, sample, synced)
+                modified = row[MODIFIED_COLUMN]
+                if (
+                    watermark is not None
+                    and modified is not None
+                    and modified < watermark
+                ):
+                    more = False
+                    break
+                rows.append(row)
+            yield rows
+            if more:
+                next_link = resp.meta.next
+                more = next_link is not None
+
+    @backoff.on_exception(
+        backoff.expo,
+        (APIClientTimeout),
+        max_tries=2,
+        max_time=30,
+    )
+    def get_samples(self, next_link=None):
+        """Get samples page, newest modified first."""
+        return self.api_client.get_project_samples(
+            project_id=self.project_id,
+            next_link=next_link,
+            sort_by=SampleSortBy.MODIFIED.value,
+            sort_order=SortOrder.DESC.value,
+            lazy=True,
+            stream=True,
+            limit=self.page_sizer.size,
+        )
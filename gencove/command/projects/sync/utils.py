@@ -0,0 +1,214 @@
+"""Local SQLite mirror of project samples."""
+import json
+import sqlite3
+
+from gencove.constants import SampleArchiveStatus, SampleStatus
+
+from .constants import COMPLETED_STATUSES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    project_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    client_id TEXT,
+    status TEXT,
+    status_created TEXT,
+    archive_status TEXT,
+    modified REAL,
+    files TEXT,
+    synced REAL NOT NULL,
+    PRIMARY KEY (project_id, id)
+);
+CREATE INDEX IF NOT EXISTS samples_status
+    ON samples (project_id, status);
+CREATE INDEX IF NOT EXISTS samples_archive_status
+    ON samples (project_id, archive_status);
+CREATE INDEX IF NOT EXISTS samples_modified
+    ON samples (project_id, modified);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project_id TEXT PRIMARY KEY,
+    watermark REAL,
+    synced REAL NOT NULL
+);
+"""
+SAMPLE_COLUMNS = (
+    "project_id",
+    "id",
+    "client_id",
+    "status",
+    "status_created",
+    "archive_status",
+    "modified",
+    "files",
+    "synced",
+)
+MODIFIED_COLUMN = SAMPLE_COLUMNS.index("modified")
+
+
+def sample_row(project_id, sample, synced):
+    """Turn a project sample into a database row.
+
+    Download urls expire, so only file ids, types and sizes are kept.
+
+    Args:
+        project_id (str): project the sample belongs to
+        sample (SampleDetails or LazyModel): sample from project samples
+        synced (float): timestamp of the sync run
+
+    Returns:
+        tuple: values of SAMPLE_COLUMNS
+    """
+    last_status = sample.last_status
+    archive_last_status = sample.archive_last_status
+    files = [
+        {"id": str(file.id), "file_type": file.file_type, "size": file.size}
+        for file in sample.files or []
+    ]
+    return (
+        project_id,
+        str(sample.id),
+        sample.client_id,
+        last_status.status if last_status else None,
+        last_status.created.isoformat()
+        if last_status and last_status.created
+        else None,
+        archive_last_status.status if archive_last_status else None,
+        sample.modified.timestamp() if sample.modified else None,
+        json.dumps(files),
+        synced,
+    )
+
+
+class SamplesDatabase:
+    """SQLite database of project samples.
+
+    Use it as a context manager, so that the connection is closed.
+
+    Args:
+        path (str): path to database file, created if missing
+    """
+
+    def __init__(self, path):
+        # readers are not blocked while a sync is writing
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.connection.close()
+
+    def get_watermark(self, project_id):
+        """Return modification timestamp up to which project is in sync.
+
+        Returns:
+            float: timestamp or None if project was never synced
+        """
+        row = self.connection.execute(
+            "SELECT watermark FROM sync_state WHERE project_id = ?",
+            (project_id,),
+        ).fetchone()
+        return row["watermark"] if row else None
+
+    def is_synced(self, project_id):
+        """Check if project was synced at least once."""
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM sync_state WHERE project_id = ?", (project_id,)
+            ).fetchone()
+            is not None
+        )
+
+    def save_samples(self, rows):
+        """Insert or replace sample rows and commit."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO samples ({}) VALUES ({})".format(
+                    ", ".join(SAMPLE_COLUMNS),
+                    ", ".join("?" * len(SAMPLE_COLUMNS)),
+                ),
+                rows,
+            )
+
+    def finish_sync(self, project_id, watermark, synced, full=False):
+        """Record finished sync run.
+
+        Args:
+            project_id (str): synced project
+            watermark (float): newest modification timestamp seen, None
+                keeps the previous one
+            synced (float): timestamp of the sync run
+            full (bool): all samples were synced, rows of samples which
+                were not seen are removed
+
+        Returns:
+            int: number of removed samples
+        """
+        with self.connection:
+            removed = 0
+            if full:
+                removed = self.connection.execute(
+                    "DELETE FROM samples WHERE project_id = ? AND synced < ?",
+                    (project_id, synced),
+                ).rowcount
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "(project_id, watermark, synced) VALUES "
+                "(?, COALESCE(?, (SELECT watermark FROM sync_state "
+                "WHERE project_id = ?)), ?)",
+                (project_id, watermark, project_id, synced),
+            )
+        return removed
+
+    def query_samples(
+        self, project_id, status=None, archive_status=None, search=None
+    ):
+        """Filter samples of a project, newest modified first.
+
+        Args:
+            project_id (str): project to query
+            status (str, optional): SampleStatus value
+            archive_status (str, optional): SampleArchiveStatus value
+            search (str, optional): sample id or client id substring
+
+        Returns:
+            list[sqlite3.Row]
+        """
+        conditions = ["project_id = ?"]
+        params = [project_id]
+        if status == SampleStatus.COMPLETED.value:
+            placeholders = ", ".join("?" * len(COMPLETED_STATUSES))
+            conditions.append("status IN ({})".format(placeholders))
+            params.extend(COMPLETED_STATUSES)
+        elif status and status != SampleStatus.ALL.value:
+            conditions.append("status = ?")
+            params.append(status)
+        if archive_status and archive_status != SampleArchiveStatus.ALL.value:
+            conditions.append("archive_status = ?")
+            params.append(archive_status)
+        if search:
+            conditions.append(
+                "(instr(lower(id), lower(?)) OR "
+                "instr(lower(client_id), lower(?)))"
+            )
+            params.extend((search, search))
+        return self.connection.execute(
+            "SELECT * FROM samples WHERE {} ORDER BY modified DESC".format(
+                " AND ".join(conditions)
+            ),
+            params,
+        ).fetchall()
+
+
+def get_row(row):
+    """Build the data `projects list-samples` prints from a database row."""
+    return [
+        row["status_created"],
+        row["id"],
+        str(row["client_id"]),
+        row["status"],
+        row["archive_status"],
+    ]
@@ -0,0 +1,54 @@
+"""Sample bulk set metadata shell command definition."""
+import click
+
+from gencove.command.common_cli_options import add_options, common_options
+from gencove.constants import Credentials
+
+from .constants import BulkSetMetadataOptions
+from .main import BulkSetMetadata
+
+
+@click.command("bulk-set-metadata")
+@click.argument("rows_file", type=click.File("r"))
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False),
+    help="CSV file to which the result of each row is appended. Samples "
+    "that were assigned metadata in a report are skipped, so that an "
+    "interrupted run can be resumed.",
+)
+@add_options(common_options)
+# pylint: disable=too-many-arguments
+def bulk_set_metadata(
+    rows_file,
+    report,
+    host,
+    email,
+    password,
+    api_key,
+):  # noqa: D413,D301,D412 # pylint: disable=C0301
+    """Set metadata of many samples.
+
+    ROWS_FILE   CSV with sample_id and metadata columns, or JSON lines with
+    sample_id and metadata members. Use - to read from stdin.
+
+    Examples:
+
+        Set metadata from CSV, with metadata as JSON strings:
+
+            gencove samples bulk-set-metadata metadata.csv --report report.csv
+
+        Set metadata from JSON lines read from stdin:
+
+            cat metadata.jsonl | gencove samples bulk-set-metadata -
+    \f
+
+    Args:
+        rows_file (file): CSV or JSON lines with sample ids and metadata.
+        report (str, optional): path/to/report.csv
+    """  # noqa: E501
+    BulkSetMetadata(
+        rows_file,
+        Credentials(email=email, password=password, api_key=api_key),
+        BulkSetMetadataOptions(host=host, report=report),
+    ).run()
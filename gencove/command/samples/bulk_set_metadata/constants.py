@@ -0,0 +1,37 @@
+"""Bulk set metadata constants."""
+from enum import Enum, unique
+from typing import Any, Optional
+
+from pydantic import BaseModel  # pylint: disable=no-name-in-module
+
+from gencove.constants import Optionals  # noqa: I100
+
+SAMPLE_ID_COLUMN = "sample_id"
+METADATA_COLUMN = "metadata"
+REPORT_COLUMNS = ("row", SAMPLE_ID_COLUMN, "status", "message")
+
+
+@unique
+class RowStatus(Enum):
+    """RowStatus enum"""
+
+    OK = "ok"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+
+# pylint: disable=too-few-public-methods
+class MetadataRow(BaseModel):
+    """MetadataRow model"""
+
+    row: int
+    sample_id: str
+    metadata: Any
+    error: Optional[str]
+
+
+# pylint: disable=too-few-public-methods
+class BulkSetMetadataOptions(Optionals):
+    """BulkSetMetadataOptions model"""
+
+    report: Optional[str]
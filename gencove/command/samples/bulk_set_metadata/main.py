@@ -0,0 +1,143 @@
+"""Bulk set sample metadata subcommand."""
+import csv
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import backoff
+
+from gencove.client import (  # noqa: I100
+    APIClientError,
+    APIClientTimeout,
+    APIClientTooManyRequestsError,
+)
+from gencove.command.base import Command
+from gencove.exceptions import ValidationError
+from gencove.utils import MAX_CONCURRENCY
+
+from .constants import REPORT_COLUMNS, RowStatus
+from .utils import read_metadata_rows, read_report
+
+
+# pylint: disable=too-many-instance-attributes
+class BulkSetMetadata(Command):
+    """Bulk set metadata command executor.
+
+    Rows are assigned concurrently and each result is appended to the
+    report as soon as it is known, so an interrupted run can be resumed
+    with the same report.
+    """
+
+    def __init__(self, rows_file, credentials, options):
+        super().__init__(credentials, options)
+        self.rows_file = rows_file
+        self.report = options.report
+        self.assigned = set()
+        self.rows = None
+        self.counts = {status: 0 for status in RowStatus}
+        self.skipped = 0
+        self.report_file = None
+        self.report_writer = None
+
+    def initialize(self):
+        """Initialize bulk-set-metadata subcommand."""
+        self.login()
+        if self.report:
+            self.assigned = read_report(self.report)
+            self.echo_debug(
+                "{} samples already assigned metadata in {}",
+                len(self.assigned),
+                self.report,
+            )
+
+    def validate(self):
+        """Validate command input.
+
+        Raises:
+            ValidationError - if something is wrong with command parameters.
+        """
+        try:
+            self.rows = read_metadata_rows(self.rows_file)
+        except ValueError as err:
+            raise ValidationError(str(err)) from err
+
+    def execute(self):
+        """Assign metadata of all rows, a few requests at a time."""
+        if self.report:
+            with open(self.report, "a", newline="") as self.report_file:
+                self.report_writer = csv.writer(self.report_file)
+                if self.report_file.tell() == 0:
+                    self.report_writer.writerow(REPORT_COLUMNS)
+                self.assign_rows()
+        else:
+            self.assign_rows()
+
+        self.echo_info(
+            "Assigned metadata to {} samples, {} failed, {} invalid rows, "
+            "{} skipped as already assigned.".format(
+                self.counts[RowStatus.OK],
+                self.counts[RowStatus.FAILED],
+                self.counts[RowStatus.INVALID],
+                self.skipped,
+            )
+        )
+        if self.counts[RowStatus.FAILED] or self.counts[RowStatus.INVALID]:
+            raise ValidationError(
+                "Metadata was not assigned to all samples."
+            )
+
+    def assign_rows(self):
+        """Submit rows to a thread pool, keeping few rows in memory."""
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+            pending = set()
+            for row in self.rows:
+                if row.sample_id in self.assigned:
+                    self.skipped += 1
+                    continue
+                if row.error:
+                    self.record(row, RowStatus.INVALID, row.error)
+                    continue
+                pending.add(executor.submit(self.assign_metadata, row))
+                if len(pending) >= 2 * MAX_CONCURRENCY:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.record(*future.result())
+            for future in wait(pending).done:
+                self.record(*future.result())
+
+    def assign_metadata(self, row):
+        """Assign metadata of a row.
+
+        Returns:
+            tuple: row, RowStatus and message
+        """
+        try:
+            self.set_metadata(row.sample_id, row.metadata)
+        except APIClientError as err:
+            self.echo_debug(err)
+            return row, RowStatus.FAILED, err.message
+        return row, RowStatus.OK, ""
+
+    @backoff.on_exception(
+        backoff.expo,
+        (APIClientTooManyRequestsError, APIClientTimeout),
+        max_tries=10,
+    )
+    def set_metadata(self, sample_id, metadata):
+        """Assign metadata to a sample, retrying when rate limited."""
+        return self.api_client.set_metadata(sample_id, metadata)
+
+    def record(self, row, status, message):
+        """Count the result of a row and append it to the report."""
+        self.counts[status] += 1
+        if status == RowStatus.OK:
+            self.echo_debug(
+                "Assigned metadata to a sample {}", row.sample_id
+            )
+        else:
+            self.echo_warning(
+                "Row {} ({}): {}".format(row.row, row.sample_id, message)
+            )
+        if self.report_writer:
+            self.report_writer.writerow(
+                (row.row, row.sample_id, status.value, message)
+            )
+            self.report_file.flush()
@@ -0,0 +1,110 @@
+"""Bulk set metadata utilities."""
+import csv
+import itertools
+import os
+
+from gencove.command.utils import is_valid_uuid
+from gencove.serialization import loads
+
+from .constants import (
+    METADATA_COLUMN,
+    MetadataRow,
+    RowStatus,
+    SAMPLE_ID_COLUMN,
+)
+
+
+def _read_json_lines(lines):
+    for row, line in enumerate((line for line in lines if line.strip()), 1):
+        try:
+            data = loads(line)
+            sample_id = str(data[SAMPLE_ID_COLUMN])
+            metadata = data[METADATA_COLUMN]
+        except (ValueError, KeyError, TypeError):
+            yield MetadataRow(
+                row=row,
+                sample_id="",
+                error="Row must be a JSON object with {} and {}.".format(
+                    SAMPLE_ID_COLUMN, METADATA_COLUMN
+                ),
+            )
+            continue
+        if not is_valid_uuid(sample_id):
+            yield MetadataRow(
+                row=row, sample_id=sample_id, error="Sample ID is not valid."
+            )
+            continue
+        yield MetadataRow(row=row, sample_id=sample_id, metadata=metadata)
+
+
+def _read_csv(reader):
+    for row, record in enumerate(reader, 1):
+        sample_id = (record[SAMPLE_ID_COLUMN] or "").strip()
+        if not is_valid_uuid(sample_id):
+            yield MetadataRow(
+                row=row, sample_id=sample_id, error="Sample ID is not valid."
+            )
+            continue
+        try:
+            metadata = loads(record[METADATA_COLUMN] or "")
+        except ValueError:
+            yield MetadataRow(
+                row=row,
+                sample_id=sample_id,
+                error="Metadata JSON is not valid.",
+            )
+            continue
+        yield MetadataRow(row=row, sample_id=sample_id, metadata=metadata)
+
+
+def read_metadata_rows(lines):
+    """Read sample ids and their metadata from CSV or JSON lines.
+
+    CSV must have a header with `sample_id` and `metadata` columns, where
+    metadata is a JSON string. JSON lines are objects with `sample_id` and
+    `metadata` members. Lines are read as rows are consumed, invalid rows
+    are returned with an error.
+
+    Args:
+        lines (iterable of str): i.e. an open file
+
+    Returns:
+        iterator of MetadataRow
+
+    Raises:
+        ValueError: if CSV header does not have the required columns
+    """
+    lines = iter(lines)
+    first = next((line for line in lines if line.strip()), None)
+    if first is None:
+        return iter(())
+    lines = itertools.chain([first], lines)
+    if first.lstrip().startswith("{"):
+        return _read_json_lines(lines)
+    reader = csv.DictReader(lines)
+    if not {SAMPLE_ID_COLUMN, METADATA_COLUMN} <= set(reader.fieldnames):
+        raise ValueError(
+            "CSV header must have {} and {} columns.".format(
+                SAMPLE_ID_COLUMN, METADATA_COLUMN
+            )
+        )
+    return _read_csv(reader)
+
+
+def read_report(path):
+    """Return sample ids which were assigned metadata according to a report.
+
+    Args:
+        path (str): report of a previous run, might not exist
+
+    Returns:
+        set of str
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline="") as report_file:
+        return {
+            record[SAMPLE_ID_COLUMN]
+            for record in csv.DictReader(report_file)
+            if record.get("status") == RowStatus.OK.value
+        }
@@ -3,7 +3,7 @@ import requests
 
 
 from gencove.logger import echo_debug  # noqa: I100
-from gencove.utils import get_progress_bar
+from gencove.progress import TransferProgress, write_chunks
 
 from .constants import CHUNK_SIZE
 
@@ -40,16 +40,19 @@ def download_file(destination, download_url, no_progress=False):
         req.raise_for_status()
         echo_debug("Starting download")
 
-        if not no_progress:
-            pbar = get_progress_bar(
-                int(req.headers["content-length"]), "Downloading: "
+        # destination can be stdout
+        name = str(getattr(destination, "name", "-"))
+        progress = None if no_progress else TransferProgress("Downloading")
+        try:
+            write_chunks(
+                req.iter_content(chunk_size=CHUNK_SIZE),
+                destination,
+                progress,
+                name,
+                int(req.headers["content-length"]),
             )
-            pbar.start()
-        for chunk in req.iter_content(chunk_size=CHUNK_SIZE):
-            destination.write(chunk)
-            if not no_progress:
-                pbar.update(pbar.value + len(chunk))
-        if not no_progress:
-            pbar.finish()
+        finally:
+            if progress:
+                progress.close()
 
         echo_debug("Finished downloading")
@@ -1,6 +1,5 @@
 """Get sample metadata subcommand."""
 
-import json
 import os
 
 import backoff
@@ -9,6 +8,7 @@ from ...base import Command
 from ...utils import is_valid_uuid
 from .... import client
 from ....exceptions import ValidationError
+from ....serialization import dumps
 
 
 class GetMetadata(Command):
@@ -66,17 +66,13 @@ class GetMetadata(Command):
         """Output reformatted metadata JSON."""
         self.echo_debug("Outputting JSON.")
         if self.output_filename == "-":
-            self.echo_data(
-                json.dumps(metadata, indent=4, cls=client.CustomEncoder)
-            )
+            self.echo_data(dumps(metadata, indent=4))
         else:
             dirname = os.path.dirname(self.output_filename)
             if dirname and not os.path.exists(dirname):
                 os.makedirs(dirname)
             with open(self.output_filename, "w") as json_file:
-                json_file.write(
-                    json.dumps(metadata, indent=4, cls=client.CustomEncoder)
-                )
+                json_file.write(dumps(metadata, indent=4))
             self.echo_info(
                 "Sample metadata saved to {}".format(self.output_filename),
             )
@@ -1,7 +1,11 @@
 """Commands to be executed from command line."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    max_memory_option,
+)
 from gencove.constants import Credentials
 
 from .constants import UploadOptions
@@ -37,6 +41,7 @@ from .main import Upload
         "Only compatible with --run-project-id."
     ),
 )
+@max_memory_option
 def upload(  # pylint: disable=E0012,C0330,R0913
     source,
     destination,
@@ -48,6 +53,7 @@ def upload(  # pylint: disable=E0012,C0330,R0913
     output,
     no_progress,
     metadata,
+    max_memory,
 ):  # noqa: D301
     """Upload FASTQ files to Gencove's system.
 
@@ -80,13 +86,17 @@ def upload(  # pylint: disable=E0012,C0330,R0913
         no_progress (bool, optional, default False): do not show progress
             bar.
         metadata (str, optional): JSON metadata to be applied to all samples
+        max_memory (int): bytes of memory available for upload buffers.
     """
     Upload(
         source,
         destination,
         Credentials(email=email, password=password, api_key=api_key),
         UploadOptions(
-            host=host, project_id=run_project_id, metadata=metadata
+            host=host,
+            project_id=run_project_id,
+            metadata=metadata,
+            max_memory=max_memory,
         ),
         output,
         no_progress,
@@ -33,6 +33,7 @@ class UploadOptions(Optionals):
 
     project_id: Optional[str]
     metadata: Optional[str]
+    max_memory: Optional[int]
 
 
 ASSIGN_ERROR = (
@@ -52,6 +53,15 @@ class FastQ(BaseModel):
     path: str
 
 
+# pylint: disable=too-few-public-methods
+class TransferPlan(BaseModel):
+    """TransferPlan model"""
+
+    part_size: int
+    concurrency: int
+    parts: int
+
+
 R_NOTATION_MAP = {"R1": "R1", "R2": "R2", "r1": "R1", "r2": "R2"}
 
 
@@ -66,3 +76,6 @@ class PathTemplateParts(Enum):
 PATH_TEMPLATE = "{{{}}}_{{{}}}.fastq.gz".format(
     PathTemplateParts.client_id.value, PathTemplateParts.r_notation.value
 )
+# files uploaded at once, so that API requests and small files overlap with
+# uploads of other files; their parts share threads of one transfer manager
+UPLOAD_FILES_IN_FLIGHT = 3
@@ -11,26 +11,30 @@ from gencove.client import (  # noqa: I100
     APIClientError,
     APIClientTimeout,
     APIClientTooManyRequestsError,
-    CustomEncoder,
 )
 from gencove.command.base import Command
-from gencove.command.utils import is_valid_uuid
+from gencove.command.utils import is_valid_uuid, map_concurrently
 from gencove.constants import (
     FASTQ_MAP_EXTENSION,
     SampleAssignmentStatus,
     UPLOAD_PREFIX,
 )
 from gencove.exceptions import ValidationError
+from gencove.progress import TransferProgress
+from gencove.serialization import dumps
 from gencove.utils import (
+    MB,
     batchify,
     get_regular_progress_bar,
     get_s3_client_refreshable,
+    memory_budget,
 )
 
 from .constants import (
     ASSIGN_ERROR,
     FASTQ_EXTENSIONS,
     TMP_UPLOADS_WARNING,
+    UPLOAD_FILES_IN_FLIGHT,
     UploadStatuses,
 )
 from .exceptions import SampleSheetError, UploadError, UploadNotFound
@@ -39,7 +43,9 @@ from .utils import (
     get_filename_from_path,
     get_get_upload_details_retry_predicate,
     get_gncv_path,
+    get_transfer_manager,
     parse_fastqs_map_file,
+    plan_transfer,
     seek_files_to_upload,
     upload_file,
     upload_multi_file,
@@ -67,6 +73,10 @@ class Upload(Command):
         self.assigned_samples = []
         self.no_progress = no_progress
         self.metadata = options.metadata
+        if options.max_memory:
+            memory_budget.resize(options.max_memory)
+        self.transfer_manager = None
+        self.progress = None
 
     @staticmethod
     def generate_gncv_destination():
@@ -86,7 +96,7 @@ class Upload(Command):
         if os.path.isfile(self.source) and self.source.endswith(FASTQ_MAP_EXTENSION):  # noqa: E501
             self.echo_debug("Scanning fastqs map file")
             self.fastqs_map = parse_fastqs_map_file(self.source)
-            self.echo_debug("got fastq pairs: {}".format(self.fastqs_map))
+            self.echo_debug("got fastq pairs: {}", self.fastqs_map)
         else:
             self.echo_debug("Seeking files to upload")
             self.fastqs = list(seek_files_to_upload(self.source))
@@ -155,18 +165,42 @@ class Upload(Command):
         If project id was provided, all fastq files will
         be assigned to this project, after upload.
         """
+        # one plan for all files, so that they share one transfer manager;
+        # parts are small enough for the largest file to keep threads busy
+        plan = plan_transfer(
+            max(self.get_upload_sizes(), default=0),
+            budget=memory_budget.size,
+        )
+        self.echo_debug(
+            "Upload plan: parts of {}MB, concurrency {}",
+            plan.part_size // MB,
+            plan.concurrency,
+        )
         s3_client = get_s3_client_refreshable(
-            self.api_client.get_upload_credentials
+            self.api_client.get_upload_credentials,
+            max_pool_connections=plan.concurrency,
         )
-        try:
-            if self.fastqs:
-                self.upload_from_source(s3_client)
-            elif self.fastqs_map:
-                self.upload_from_map_file(s3_client)
-        except UploadError:
-            return
+        # threads and connections of the transfer manager are shared by all
+        # files in flight, and so are part buffers
+        self.transfer_manager = get_transfer_manager(s3_client, plan)
+        with self.transfer_manager, memory_budget.reserve(
+            plan.part_size * plan.concurrency
+        ):
+            # progress of all files is shown together
+            if not self.no_progress:
+                self.progress = TransferProgress("Uploading")
+            try:
+                if self.fastqs:
+                    self.upload_from_source(s3_client)
+                elif self.fastqs_map:
+                    self.upload_from_map_file(s3_client)
+            except UploadError:
+                return
+            finally:
+                if self.progress:
+                    self.progress.close()
 
-        self.echo_debug("Upload ids are now: {}".format(self.upload_ids))
+        self.echo_debug("Upload ids are now: {}", self.upload_ids)
         if self.project_id:
             self.echo_debug("Cooling down period.")
             sleep(10)
@@ -174,10 +208,25 @@ class Upload(Command):
             if self.output:
                 self.output_list()
 
+    def get_upload_sizes(self):
+        """Return sizes of files that will be uploaded."""
+        if self.fastqs:
+            return [os.path.getsize(file_path) for file_path in self.fastqs]
+        return [
+            sum(os.path.getsize(fastq) for fastq in fastqs)
+            for fastqs in self.fastqs_map.values()
+        ]
+
     def upload_from_source(self, s3_client):
         """Upload command with <source> argument provided."""
-        for file_path in self.fastqs:
-            upload = self.upload_from_file_path(file_path, s3_client)
+        uploads = map_concurrently(
+            lambda file_path: self.upload_from_file_path(
+                file_path, s3_client
+            ),
+            self.fastqs,
+            max_workers=UPLOAD_FILES_IN_FLIGHT,
+        )
+        for upload in uploads:
             if self.project_id and upload:
                 self.upload_ids.add(upload.id)
 
@@ -185,10 +234,14 @@ class Upload(Command):
 
     def upload_from_map_file(self, s3_client):
         """Upload fastq files from a csv file."""
-        for key, fastqs in self.fastqs_map.items():
-            upload = self.concatenate_and_upload_fastqs(
-                key, fastqs, s3_client
-            )
+        uploads = map_concurrently(
+            lambda item: self.concatenate_and_upload_fastqs(
+                *item, s3_client
+            ),
+            self.fastqs_map.items(),
+            max_workers=UPLOAD_FILES_IN_FLIGHT,
+        )
+        for upload in uploads:
             if self.project_id and upload:
                 self.upload_ids.add(upload.id)
 
@@ -223,6 +276,8 @@ class Upload(Command):
             upload_details.s3.bucket,
             upload_details.s3.object_name,
             self.no_progress,
+            transfer_manager=self.transfer_manager,
+            progress=self.progress,
         )
         return upload_details
 
@@ -274,6 +329,8 @@ class Upload(Command):
             bucket=upload_details.s3.bucket,
             object_name=upload_details.s3.object_name,
             no_progress=self.no_progress,
+            transfer_manager=self.transfer_manager,
+            progress=self.progress,
         )
         return upload_details
 
@@ -308,7 +365,7 @@ class Upload(Command):
             )
             return
 
-        self.echo_debug("Sample sheet now is: {}".format(samples))
+        self.echo_debug("Sample sheet now is: {}", samples)
 
         self.echo_debug(
             "Assigning samples to project ({})".format(self.project_id)
@@ -378,22 +435,21 @@ class Upload(Command):
                 raise UploadError
 
             for sample in sample_sheet:
-                self.echo_debug("Checking sample: {}".format(sample))
+                self.echo_debug("Checking sample: {}", sample)
                 add_it = False
                 if sample.fastq and sample.fastq.r1:
                     if sample.fastq.r1.upload in search_uploads:
                         add_it = True
                         search_uploads.remove(sample.fastq.r1.upload)
                         self.echo_debug(
-                            "Found sample for upload r1: {}".format(
-                                sample.fastq.r1.upload
-                            )
+                            "Found sample for upload r1: {}",
+                            sample.fastq.r1.upload,
                         )
                     else:
                         self.echo_debug(
-                            "R1 upload not found. sample {} uploads {}".format(
-                                sample, search_uploads
-                            )
+                            "R1 upload not found. sample {} uploads {}",
+                            sample,
+                            search_uploads,
                         )
                         raise UploadNotFound
                 if sample.fastq and sample.fastq.r2:
@@ -401,15 +457,14 @@ class Upload(Command):
                         add_it = True
                         search_uploads.remove(sample.fastq.r2.upload)
                         self.echo_debug(
-                            "Found sample for upload r2: {}".format(
-                                sample.fastq.r2.upload
-                            )
+                            "Found sample for upload r2: {}",
+                            sample.fastq.r2.upload,
                         )
                     else:
                         self.echo_debug(
-                            "R2 upload not found. sample {} uploads {}".format(
-                                sample, search_uploads
-                            )
+                            "R2 upload not found. sample {} uploads {}",
+                            sample,
+                            search_uploads,
                         )
                         raise UploadNotFound
 
@@ -418,7 +473,7 @@ class Upload(Command):
 
         if search_uploads:
             self.echo_debug(
-                "Have uploads without samples: {}".format(search_uploads)
+                "Have uploads without samples: {}", search_uploads
             )
             raise SampleSheetError
 
@@ -456,25 +511,20 @@ class Upload(Command):
             self.destination,
             SampleAssignmentStatus.UNASSIGNED.value,
             next_link,
+            lazy=True,
         )
 
     def output_list(self):
         """Output JSON of assigning samples to a project."""
         self.echo_debug("Outputting JSON.")
         if self.output == "-":
-            self.echo_data(
-                json.dumps(self.assigned_samples, indent=4, cls=CustomEncoder)
-            )
+            self.echo_data(dumps(self.assigned_samples, indent=4))
         else:
             dirname = os.path.dirname(self.output)
             if dirname and not os.path.exists(dirname):
                 os.makedirs(dirname)
             with open(self.output, "w") as json_file:
-                json_file.write(
-                    json.dumps(
-                        self.assigned_samples, indent=4, cls=CustomEncoder
-                    )
-                )
+                json_file.write(dumps(self.assigned_samples, indent=4))
             self.echo_info(
                 "Assigned samples response outputted to {}".format(
                     self.output
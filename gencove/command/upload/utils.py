@@ -4,13 +4,27 @@ import os
 import platform
 from collections import defaultdict
 
-from boto3.s3.transfer import TransferConfig
+from boto3.s3.transfer import (
+    ProgressCallbackInvoker,
+    TransferConfig,
+    create_transfer_manager,
+)
 
 from botocore.exceptions import ClientError
 
 from gencove.exceptions import ValidationError
 from gencove.logger import echo_debug, echo_info
-from gencove.utils import CHUNK_SIZE, get_progress_bar
+from gencove.progress import TransferProgress
+from gencove.utils import (
+    MAX_CONCURRENCY,
+    MAX_PARTS,
+    MAX_PART_SIZE,
+    MB,
+    MEMORY_BUDGET,
+    MIN_PART_SIZE,
+    PARTS_PER_THREAD,
+    memory_budget,
+)
 
 from .constants import (
     FASTQ_EXTENSIONS,
@@ -18,11 +32,211 @@ from .constants import (
     PATH_TEMPLATE,
     PathTemplateParts,
     R_NOTATION_MAP,
+    TransferPlan,
 )
 
 
+def _round_up(value, multiple):
+    return -(-value // multiple) * multiple
+
+
+def plan_transfer(
+    file_size,
+    budget=MEMORY_BUDGET,
+    max_concurrency=MAX_CONCURRENCY,
+):
+    """Pick multipart part size and concurrency for a file transfer.
+
+    Parts are small enough to keep all threads busy, but not smaller than
+    S3 allows for the file size, and parts of all concurrent threads fit
+    in the memory budget.
+
+    Args:
+        file_size (int): size of the file in bytes
+        budget (int): bytes available for part buffers
+        max_concurrency (int): maximum number of threads
+
+    Returns:
+        TransferPlan
+    """
+    # smallest part which keeps the number of parts within S3 limit
+    min_part_size = _round_up(
+        max(MIN_PART_SIZE, _round_up(file_size, MAX_PARTS) // MAX_PARTS), MB
+    )
+    part_size = file_size // (max_concurrency * PARTS_PER_THREAD)
+    part_size = min(
+        max(_round_up(part_size, MB), min_part_size), MAX_PART_SIZE
+    )
+
+    concurrency = max_concurrency
+    if part_size * concurrency > budget:
+        part_size = max(budget // concurrency // MB * MB, min_part_size)
+        concurrency = max(1, min(concurrency, budget // part_size))
+
+    parts = max(1, _round_up(file_size, part_size) // part_size)
+    return TransferPlan(
+        part_size=part_size,
+        concurrency=min(concurrency, parts),
+        parts=parts,
+    )
+
+
+def get_transfer_config(plan=None):
+    """Return S3 transfer configuration used for uploads.
+
+    Args:
+        plan (TransferPlan, optional): part size and concurrency to use,
+            defaults to a plan for a file of `MEMORY_BUDGET` size.
+    """
+    if plan is None:
+        plan = plan_transfer(MEMORY_BUDGET)
+    config = TransferConfig(
+        multipart_threshold=plan.part_size,
+        multipart_chunksize=plan.part_size,
+        use_threads=True,
+        max_concurrency=plan.concurrency,
+    )
+    # parts of non-seekable files are buffered, keep them within the plan
+    config.max_in_memory_upload_chunks = plan.concurrency
+    return config
+
+
+def get_transfer_manager(s3_client, plan):
+    """Return transfer manager which is shared by all uploads of a run.
+
+    Threads and connections of the S3 client are shared by all files, so
+    the client's connection pool should hold `plan.concurrency`
+    connections. Parts of all files have the part size of the plan, except
+    for files that would have more parts than S3 allows, for which the
+    transfer manager picks bigger parts. Use it as a context manager to shut
+    it down when uploads are done.
+
+    Args:
+        s3_client: Boto s3 client.
+        plan (TransferPlan): part size and concurrency of all uploads
+
+    Returns:
+        s3transfer.manager.TransferManager
+    """
+    return create_transfer_manager(s3_client, get_transfer_config(plan))
+
+
+def submit_upload(
+    transfer_manager, fileobj, bucket, object_name, callback=None
+):
+    """Start upload of a file without waiting for it to finish.
+
+    Args:
+        transfer_manager (TransferManager): see `get_transfer_manager`.
+        fileobj (str or file-like object): path or file to upload.
+        bucket (str): Bucket to upload to.
+        object_name (str): S3 object name.
+        callback (function, optional): called with number of bytes
+            uploaded, from upload threads.
+
+    Returns:
+        s3transfer.futures.TransferFuture
+    """
+    subscribers = None
+    if callback is not None:
+        subscribers = [ProgressCallbackInvoker(callback)]
+    return transfer_manager.upload(
+        fileobj, bucket, object_name, subscribers=subscribers
+    )
+
+
+# pylint: disable=too-many-arguments
+def _transfer(
+    s3_client,
+    fileobj,
+    size,
+    bucket,
+    object_name,
+    transfer_manager,
+    plan,
+    callback,
+):
+    if transfer_manager is not None:
+        # part buffers are reserved for the whole run by the owner of the
+        # shared transfer manager
+        submit_upload(
+            transfer_manager, fileobj, bucket, object_name, callback
+        ).result()
+    else:
+        if plan is None:
+            plan = plan_transfer(size, budget=memory_budget.size)
+        echo_debug(
+            "Upload plan for {}: {} parts of {}MB, concurrency {}",
+            object_name,
+            plan.parts,
+            plan.part_size // MB,
+            plan.concurrency,
+        )
+        upload_method = (
+            s3_client.upload_file
+            if isinstance(fileobj, str)
+            else s3_client.upload_fileobj
+        )
+        # part buffers of all concurrently uploaded parts
+        with memory_budget.reserve(plan.part_size * plan.concurrency):
+            upload_method(
+                fileobj,
+                bucket,
+                object_name,
+                Config=get_transfer_config(plan),
+                Callback=callback,
+            )
+
+
+# pylint: disable=too-many-arguments
+def _upload(
+    s3_client,
+    fileobj,
+    size,
+    bucket,
+    object_name,
+    no_progress,
+    transfer_manager,
+    plan,
+    progress,
+):
+    own_progress = None
+    if progress is None and not no_progress:
+        progress = own_progress = TransferProgress("Uploading")
+    callback = progress.add_file(object_name, size) if progress else None
+    try:
+        _transfer(
+            s3_client,
+            fileobj,
+            size,
+            bucket,
+            object_name,
+            transfer_manager,
+            plan,
+            callback,
+        )
+    except BaseException:
+        if progress:
+            progress.discard_file(object_name)
+        raise
+    else:
+        if progress:
+            progress.finish_file(object_name)
+    finally:
+        if own_progress:
+            own_progress.close()
+
+
+# pylint: disable=too-many-arguments
 def upload_file(
-    s3_client, file_name, bucket, object_name=None, no_progress=False
+    s3_client,
+    file_name,
+    bucket,
+    object_name=None,
+    no_progress=False,
+    transfer_manager=None,
+    plan=None,
+    progress=None,
 ):  # noqa: D413
     """Upload a file to an S3 bucket.
 
@@ -32,6 +246,13 @@ def upload_file(
         bucket (str): Bucket to upload to.
         object_name (str): S3 object name.
             If not specified then file_name is used
+        no_progress (bool): do not show progress bar.
+        transfer_manager (TransferManager, optional): shared transfer
+            manager, if not specified s3_client uploads the file on its own.
+        plan (TransferPlan, optional): part size to use without a transfer
+            manager, planned from the file size if not specified.
+        progress (TransferProgress, optional): shared progress of all
+            uploads, if not specified progress of this file is shown.
 
     Returns:
         True if file was uploaded, else False
@@ -42,29 +263,17 @@ def upload_file(
 
     # Upload the file
     try:
-        # Set desired multipart threshold value of 5GB
-        config = TransferConfig(
-            multipart_threshold=CHUNK_SIZE,
-            multipart_chunksize=CHUNK_SIZE,
-            use_threads=True,
-            max_concurrency=10,
-        )
-        if not no_progress:
-            progress_bar = get_progress_bar(
-                os.path.getsize(file_name), "Uploading: "
-            )
-            progress_bar.start()
-        s3_client.upload_file(
+        _upload(
+            s3_client,
             file_name,
+            os.path.getsize(file_name),
             bucket,
             object_name,
-            Config=config,
-            Callback=_progress_bar_update(progress_bar)
-            if not no_progress
-            else None,
+            no_progress,
+            transfer_manager,
+            plan,
+            progress,
         )
-        if not no_progress:
-            progress_bar.finish()
     except ClientError as err:
         echo_info("Failed to upload file {}: {}".format(file_name, err))
         return False
@@ -77,6 +286,9 @@ def upload_multi_file(
     bucket,
     object_name=None,  # pylint: disable=E0012,C0330
     no_progress=False,
+    transfer_manager=None,
+    plan=None,
+    progress=None,
 ):  # noqa: D413
     """Upload a file to an S3 bucket.
 
@@ -87,6 +299,13 @@ def upload_multi_file(
         bucket (str): Bucket to upload to.
         object_name (str): S3 object name.
             If not specified then file_name is used
+        no_progress (bool): do not show progress bar.
+        transfer_manager (TransferManager, optional): shared transfer
+            manager, if not specified s3_client uploads the file on its own.
+        plan (TransferPlan, optional): part size to use without a transfer
+            manager, planned from the file size if not specified.
+        progress (TransferProgress, optional): shared progress of all
+            uploads, if not specified progress of this file is shown.
 
     Returns:
         True if file was uploaded, else False
@@ -97,56 +316,23 @@ def upload_multi_file(
 
     # Upload the file
     try:
-        # Set desired multipart threshold value of 5GB
-        config = TransferConfig(
-            multipart_threshold=CHUNK_SIZE,
-            multipart_chunksize=CHUNK_SIZE,
-            use_threads=True,
-            max_concurrency=10,
-        )
-
-        if not no_progress:
-            progress_bar = get_progress_bar(
-                file_obj.get_size(), "Uploading: "
-            )
-            progress_bar.start()
-        s3_client.upload_fileobj(
+        _upload(
+            s3_client,
             file_obj,
+            file_obj.get_size(),
             bucket,
             object_name,
-            Config=config,
-            Callback=_progress_bar_update(progress_bar)
-            if not no_progress
-            else None,
+            no_progress,
+            transfer_manager,
+            plan,
+            progress,
         )
-        if not no_progress:
-            progress_bar.finish()
     except ClientError as err:
         echo_info("Failed to upload file {}: {}".format(file_obj.name, err))
         return False
     return True
 
 
-def _progress_bar_update(pbar):  # noqa: D413
-    """Update progress bar manually.
-
-    Helper method for S3 Transfer,
-    which needs a callback to update the progressbar.
-
-    Args:
-        pbar: progressbar.ProgressBar instance
-
-    Returns:
-        a function that in turn accepts chunk that is used to update the
-        progressbar.
-    """
-    # noqa: D202
-    def _update_pbar(chunk_uploaded_in_bytes):
-        pbar.update(pbar.value + chunk_uploaded_in_bytes)
-
-    return _update_pbar
-
-
 def seek_files_to_upload(path, path_root=""):
     """Generate a list of valid fastq files."""
     for root, dirs, files in os.walk(path):
@@ -155,7 +341,7 @@ def seek_files_to_upload(path, path_root=""):
             file_path = os.path.join(path_root, root, file)
 
             if file_path.lower().endswith(FASTQ_EXTENSIONS):
-                echo_debug("Found file to upload: {}".format(file_path))
+                echo_debug("Found file to upload: {}", file_path)
                 yield file_path
 
         dirs.sort()
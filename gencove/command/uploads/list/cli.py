@@ -1,7 +1,11 @@
 """Samples list shell command definition."""
 import click
 
-from gencove.command.common_cli_options import add_options, common_options
+from gencove.command.common_cli_options import (
+    add_options,
+    common_options,
+    output_format_option,
+)
 from gencove.constants import Credentials, SampleAssignmentStatus
 from gencove.utils import enum_as_dict
 
@@ -17,12 +21,18 @@ from .main import ListSampleSheet
     type=click.Choice(enum_as_dict(SampleAssignmentStatus).values()),
     default=SampleAssignmentStatus.ALL.value,
 )
+@output_format_option
 @add_options(common_options)
 def list_uploads(  # pylint: disable=E0012,C0330,R0913
-    search, status, host, email, password, api_key
+    search, status, output_format, host, email, password, api_key
 ):
     """List user uploads."""
     ListSampleSheet(
         Credentials(email=email, password=password, api_key=api_key),
-        UploadsOptions(host=host, status=status, search=search),
+        UploadsOptions(
+            host=host,
+            status=status,
+            search=search,
+            output_format=output_format,
+        ),
     ).run()
@@ -4,8 +4,9 @@ import backoff
 # pylint: disable=wrong-import-order
 from gencove.client import APIClientError, APIClientTimeout  # noqa: I100
 from gencove.command.base import Command
+from gencove.command.utils import RowWriter
 
-from .utils import get_line
+from .utils import COLUMNS, get_row
 
 
 class ListSampleSheet(Command):
@@ -30,13 +31,14 @@ class ListSampleSheet(Command):
             "status={} search_term={}".format(self.status, self.gncv_path)
         )
         try:
-            for uploads in self.get_paginated_sample_sheet():
-                if not uploads:
-                    self.echo_debug("No matching uploads found.")
-                    return
+            with RowWriter(COLUMNS, self.options.output_format) as writer:
+                for uploads in self.get_paginated_sample_sheet():
+                    if not uploads:
+                        self.echo_debug("No matching uploads found.")
+                        return
 
-                for upload in uploads:
-                    self.echo_data(get_line(upload))
+                    for upload in uploads:
+                        writer.write(get_row(upload))
         except APIClientError as err:
             if err.status_code == 404:
                 self.echo_error("Uploads do not exist.")
@@ -69,4 +71,5 @@ class ListSampleSheet(Command):
             gncv_path=self.gncv_path,
             assigned_status=self.status,
             next_link=next_link,
+            lazy=True,
         )
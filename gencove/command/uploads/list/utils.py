@@ -1,14 +1,23 @@
 """Utilities for processing and validating uploads from sample sheet."""
 
+# column names of rows, used as csv header and jsonl keys
+COLUMNS = (
+    "client_id",
+    "r1_upload",
+    "r1_destination_path",
+    "r2_upload",
+    "r2_destination_path",
+)
 
-def get_line(upload):
+
+def get_row(upload):
     """Build a list of relevant data to be printed.
 
     Args:
         upload (dict): object from sample sheet
 
     Returns:
-        list(str): list of relevant data to be printed
+        list(str): relevant data to be printed
     """
     parts = [
         str(upload.client_id),
@@ -19,4 +28,4 @@ def get_line(upload):
         parts.append(str(upload.fastq.r2.upload))
         parts.append(upload.fastq.r2.destination_path)
 
-    return "\t".join(parts)
+    return parts
@@ -1,6 +1,47 @@
 """Common utils used in multiple commands."""
+import csv
+import io
 import json
+import re
+import time
 import uuid
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from gencove.client import APIClientTimeout  # noqa: I100
+from gencove.constants import (
+    JOB_FAILED_STATUSES,
+    MAX_PAGE_SIZE,
+    MAX_POLL_INTERVAL,
+    MIN_PAGE_SIZE,
+    OUTPUT_BUFFER_ROWS,
+    OutputFormat,
+    PAGE_SIZE,
+    PAGE_SIZE_AUTO,
+    POLL_INTERVAL,
+    POLL_INTERVAL_FACTOR,
+    WAIT_FAILED_EXIT_CODE,
+    WAIT_TIMEOUT_EXIT_CODE,
+)
+from gencove.logger import (
+    echo_data,
+    echo_debug,
+    echo_error,
+    echo_info,
+    is_debug,
+)
+from gencove.serialization import dumps
+from gencove.utils import MAX_CONCURRENCY
+
+SAMPLE_IDS_SEPARATOR_RE = re.compile(r"[\s,]+")
+# canonical form of uuid version 4, other forms are checked by uuid module
+UUID4_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}\Z",
+    re.IGNORECASE,
+)
 
 
 def sanitize_string(output):
@@ -23,6 +64,41 @@ def is_valid_uuid(candidate):
         return False
 
 
+def find_invalid_uuids(candidates):
+    """Find strings which are not valid uuid version 4 strings.
+
+    candidates (iterable of str): uuids to check
+
+    Returns:
+        list of str: invalid uuids, in the order of candidates
+    """
+    return [
+        candidate
+        for candidate in candidates
+        if not UUID4_RE.match(candidate) and not is_valid_uuid(candidate)
+    ]
+
+
+def read_sample_ids(lines):
+    """Read unique sample ids from lines of a file.
+
+    Ids are separated by commas or whitespace, only the first occurrence of
+    an id is kept.
+
+    Args:
+        lines (iterable of str): i.e. an open file
+
+    Yields:
+        str: sample id
+    """
+    seen = set()
+    for line in lines:
+        for sample_id in SAMPLE_IDS_SEPARATOR_RE.split(line):
+            if sample_id and sample_id not in seen:
+                seen.add(sample_id)
+                yield sample_id
+
+
 def is_valid_json(candidate):
     """Test if provided string is a valid JSON.
 
@@ -36,3 +112,236 @@ def is_valid_json(candidate):
         return True
     except ValueError:
         return False
+
+
+def in_shard(sample_id, shard=None):
+    """Test if sample belongs to a shard.
+
+    Samples are partitioned by a stable hash of their id, so every sample
+    belongs to exactly one of the shards, regardless of where or in which
+    order samples are processed.
+
+    Args:
+        sample_id (str or UUID): sample id
+        shard (tuple of int, optional): 1-based shard index and number of
+            shards, if not given every sample is processed
+
+    Returns:
+        bool
+    """
+    if not shard:
+        return True
+    index, count = shard
+    return zlib.crc32(str(sample_id).lower().encode()) % count == index - 1
+
+
+def map_concurrently(func, items, max_workers=MAX_CONCURRENCY):
+    """Map function over items on a thread pool, yielding results in order.
+
+    Items are submitted only a few ahead of the consumer, so memory does
+    not grow with the number of items.
+
+    Args:
+        func (function): called with each item
+        items (iterable): i.e. samples of paginated API responses
+        max_workers (int): number of threads
+
+    Yields:
+        results of func
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class PageSizer:
+    """Page size used to traverse paginated API responses.
+
+    In adaptive mode page size is doubled while the time per item keeps
+    dropping and halved when API request times out.
+
+    Args:
+        page_size (int or str, optional): fixed page size or "auto"
+        default (int): page size to use if page size is not fixed
+    """
+
+    def __init__(self, page_size=None, default=PAGE_SIZE):
+        self.adaptive = page_size == PAGE_SIZE_AUTO
+        if page_size is None or self.adaptive:
+            self.size = default
+        else:
+            self.size = int(page_size)
+        self._growing = self.adaptive
+        self._time_per_item = None
+
+    def record(self, items, seconds):
+        """Adapt page size after a page of items was retrieved."""
+        if not self._growing or items < self.size:
+            return
+        time_per_item = seconds / items
+        if (
+            self._time_per_item is not None
+            and time_per_item >= self._time_per_item
+        ):
+            # no gain from bigger pages, keep the current size
+            self._growing = False
+            echo_debug("Page size settled at {}", self.size)
+            return
+        self._time_per_item = time_per_item
+        if self.size < MAX_PAGE_SIZE:
+            self.size = min(self.size * 2, MAX_PAGE_SIZE)
+            echo_debug("Page size increased to {}", self.size)
+
+    def shrink(self):
+        """Halve page size after a timeout.
+
+        Returns:
+            bool: True if page size was reduced and request can be retried
+        """
+        if not self.adaptive or self.size <= MIN_PAGE_SIZE:
+            return False
+        self.size = max(self.size // 2, MIN_PAGE_SIZE)
+        self._growing = False
+        echo_debug("Page size decreased to {}", self.size)
+        return True
+
+    def measure(self, items, start):
+        """Yield from items and record how long it took to read them.
+
+        Time the consumer spends on an item is not counted, so that slow
+        output does not make pages smaller.
+
+        Args:
+            items (iterable): results of a single page
+            start (float): `time.monotonic()` when the page was requested
+        """
+        count = 0
+        elapsed = 0
+        resumed = start
+        for item in items:
+            elapsed += time.monotonic() - resumed
+            count += 1
+            yield item
+            resumed = time.monotonic()
+        elapsed += time.monotonic() - resumed
+        self.record(count, elapsed)
+
+
+class RowWriter:
+    """Buffered writer of tabular command output.
+
+    Rows are formatted as they are written and echoed in chunks, instead of
+    one echo per row. With debug output on, rows are echoed one by one, each
+    with a timestamp.
+
+    Use it as a context manager, so that buffered rows are echoed.
+
+    Args:
+        columns (tuple): column names, used for csv header and jsonl keys
+        output_format (str, optional): OutputFormat value, defaults to tsv
+        buffer_rows (int, optional): rows echoed at once
+    """
+
+    def __init__(
+        self, columns, output_format=None, buffer_rows=OUTPUT_BUFFER_ROWS
+    ):
+        self.columns = columns
+        self.output_format = output_format or OutputFormat.TSV.value
+        self.buffer_rows = buffer_rows
+        self._lines = []
+        self._csv_buffer = io.StringIO()
+        self._csv_writer = csv.writer(self._csv_buffer, lineterminator="")
+        if self.output_format == OutputFormat.CSV.value:
+            self._lines.append(self._format_csv(columns))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def _format_csv(self, values):
+        self._csv_buffer.seek(0)
+        self._csv_buffer.truncate()
+        self._csv_writer.writerow(values)
+        return self._csv_buffer.getvalue()
+
+    def format(self, values):
+        """Format a row as a line of output."""
+        if self.output_format == OutputFormat.JSONL.value:
+            return dumps(dict(zip(self.columns, values)))
+        values = ["" if value is None else value for value in values]
+        if self.output_format == OutputFormat.CSV.value:
+            return self._format_csv(values)
+        return "\t".join(sanitize_string(value) for value in values)
+
+    def write(self, values):
+        """Add a row, echoing buffered rows once the buffer is full."""
+        self._lines.append(self.format(values))
+        if len(self._lines) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """Echo buffered rows."""
+        if not self._lines:
+            return
+        if is_debug():
+            for line in self._lines:
+                echo_data(line)
+        else:
+            echo_data("\n".join(self._lines))
+        self._lines = []
+
+
+def wait_for_job(fetch, description, succeeded_statuses, timeout=None):
+    """Poll a server job in-process until it finishes.
+
+    Polls are further apart while the status does not change. Timeouts of
+    single polls are not fatal, the job is polled again.
+
+    Args:
+        fetch (function): returns the job, with `last_status`
+        description (str): what is being waited for, used in messages
+        succeeded_statuses (tuple of str): statuses of the finished job,
+            which differ between job types
+        timeout (int, optional): seconds to wait at most
+
+    Returns:
+        the job once it succeeded
+
+    Raises:
+        click.exceptions.Exit: with WAIT_FAILED_EXIT_CODE if the job failed
+            or WAIT_TIMEOUT_EXIT_CODE if it did not finish in time
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    interval = POLL_INTERVAL
+    last_status = None
+    while True:
+        try:
+            job = fetch()
+        except APIClientTimeout as err:
+            echo_debug("Polling {} timed out: {}", description, err.message)
+            job = None
+        status = job.last_status.status if job and job.last_status else None
+        if status is not None and status != last_status:
+            echo_info("{} is {}".format(description, status))
+            last_status = status
+            interval = POLL_INTERVAL
+        if status in succeeded_statuses:
+            return job
+        if status in JOB_FAILED_STATUSES:
+            echo_error("{} failed.".format(description))
+            raise click.exceptions.Exit(WAIT_FAILED_EXIT_CODE)
+        if deadline is not None and time.monotonic() + interval > deadline:
+            echo_error(
+                "{} did not finish in {} seconds.".format(description, timeout)
+            )
+            raise click.exceptions.Exit(WAIT_TIMEOUT_EXIT_CODE)
+        echo_debug("Polling {} again in {}s", description, interval)
+        time.sleep(interval)
+        interval = min(interval * POLL_INTERVAL_FACTOR, MAX_POLL_INTERVAL)
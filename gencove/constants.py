@@ -89,6 +89,15 @@ class SortOrder(Enum):
     DESC = "desc"
 
 
+@unique
+class OutputFormat(Enum):
+    """OutputFormat enum"""
+
+    TSV = "tsv"
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
 # pylint: disable=too-few-public-methods
 class Credentials(BaseModel):
     """Credentials model"""
@@ -103,6 +112,9 @@ class Optionals(BaseModel):
     """Optionals model"""
 
     host: Optional[str]
+    output_format: Optional[str]
+    wait: Optional[bool]
+    wait_timeout: Optional[int]
 
 
 @unique
@@ -126,3 +138,34 @@ MAX_RETRY_TIME_SECONDS = 300  # 5 minutes
 FASTQ_MAP_EXTENSION = ".fastq-map.csv"
 UPLOAD_PREFIX = "gncv://"
 ASSIGN_BATCH_SIZE = 200
+PAGE_SIZE = 200
+# page size for paginated responses parsed while they are read
+STREAMED_PAGE_SIZE = 1000
+MIN_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 10000
+# page size value which adapts page size to API response times
+PAGE_SIZE_AUTO = "auto"
+STREAM_CHUNK_SIZE = 64 * 1024
+# times a streamed page is requested again if its connection is interrupted
+STREAM_RETRIES = 3
+# rows of tabular output echoed at once
+OUTPUT_BUFFER_ROWS = 1000
+# statuses of server jobs which do not change anymore: merging VCF files
+# succeeds with "success", creating a batch with "succeeded"
+MERGED_VCF_SUCCEEDED_STATUSES = ("success",)
+BATCH_SUCCEEDED_STATUSES = (SampleStatus.SUCCEEDED.value,)
+JOB_FAILED_STATUSES = (SampleStatus.FAILED.value,)
+# seconds between polls of a running job, grows up to the max while the
+# status does not change
+POLL_INTERVAL = 5
+MAX_POLL_INTERVAL = 60
+POLL_INTERVAL_FACTOR = 1.5
+# exit codes of commands waiting for a job, apart from 1 and 2 which click
+# uses for aborts and usage errors
+WAIT_FAILED_EXIT_CODE = 4
+WAIT_TIMEOUT_EXIT_CODE = 3
+# seconds responses of slowly changing resources are reused for, when
+# the response cache is enabled with GENCOVE_CACHE_DIR
+PIPELINE_CAPABILITIES_CACHE_TTL = 24 * 60 * 60
+PROJECT_BATCH_TYPES_CACHE_TTL = 60 * 60
+BASESPACE_PROJECTS_CACHE_TTL = 10 * 60
@@ -69,10 +69,38 @@ def echo_info(msg, **kwargs):
         _echo(msg, err=True, **kwargs)
 
 
-def echo_debug(msg, **kwargs):
-    """Output click echo msg only if debug is on."""
-    if LOG_LEVEL == DEBUG:
-        _echo_with_datetime(msg, err=True, **kwargs)
+def is_debug():
+    """Return True if debug output is enabled."""
+    return LOG_LEVEL == DEBUG
+
+
+def _evaluate(value):
+    """Call value if it is a callable, otherwise return it unchanged."""
+    return value() if callable(value) else value
+
+
+def echo_debug(msg, *args, **kwargs):
+    """Output click echo msg only if debug is on.
+
+    Message building is deferred until debug is known to be on, so it is
+    cheap to call from hot paths:
+
+        echo_debug("Response is {}", response.content)
+        echo_debug(lambda: "Expensive {}".format(compute()))
+
+    Args:
+        msg (str or callable): message or a format string; if callable,
+            it is called to produce the message.
+        *args: format arguments for msg; callables are called before
+            formatting.
+        **kwargs: passed to click.echo
+    """
+    if LOG_LEVEL != DEBUG:
+        return
+    msg = _evaluate(msg)
+    if args:
+        msg = msg.format(*(_evaluate(arg) for arg in args))
+    _echo_with_datetime(msg, err=True, **kwargs)
 
 
 def echo_warning(msg, **kwargs):
@@ -3,7 +3,10 @@ from datetime import datetime
 from typing import Any, List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
 
 
 # pylint: disable=too-few-public-methods
@@ -281,3 +284,87 @@ class BaseSpaceBioSample(BaseModel):
 
     meta: ResponseMeta
     results: Optional[List[BaseSpaceBioSampleDetail]]
+
+
+class LazyModel:
+    """Read-only view of a trusted API response.
+
+    Behaves like `model(**data)` for attribute access, but each field is
+    only validated on first access. Nested models and lists of nested models
+    are wrapped lazily as well, so listing commands that print a few fields
+    of large pages skip validating everything else.
+    """
+
+    __slots__ = ("_model", "_data", "_cache")
+
+    def __init__(self, model, data):
+        self._model = model
+        self._data = data
+        self._cache = None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._cache is None:
+            self._cache = {}
+        elif name in self._cache:
+            return self._cache[name]
+        field = self._model.__fields__.get(name)
+        if field is None:
+            raise AttributeError(
+                "'{}' object has no attribute '{}'".format(
+                    self._model.__name__, name
+                )
+            )
+        value = self._parse_field(field)
+        self._cache[name] = value
+        return value
+
+    def _parse_field(self, field):
+        if field.name not in self._data:
+            if field.required:
+                raise ValidationError(
+                    [ErrorWrapper(MissingError(), loc=field.name)],
+                    self._model,
+                )
+            return field.get_default()
+        value = self._data[field.name]
+        if value is None:
+            return None
+        if isinstance(field.type_, type) and issubclass(
+            field.type_, BaseModel
+        ):
+            if field.shape == SHAPE_SINGLETON and isinstance(value, dict):
+                return LazyModel(field.type_, value)
+            if field.shape == SHAPE_LIST and isinstance(value, list):
+                return [
+                    LazyModel(field.type_, item)
+                    if isinstance(item, dict)
+                    else item
+                    for item in value
+                ]
+        value, errors = field.validate(
+            value, {}, loc=field.name, cls=self._model
+        )
+        if errors:
+            raise ValidationError([errors], self._model)
+        return value
+
+    def __iter__(self):
+        for name in self._model.__fields__:
+            yield name, getattr(self, name)
+
+    def __repr__(self):
+        return "{}(lazy, {!r})".format(self._model.__name__, self._data)
+
+    def to_model(self):
+        """Return fully validated model instance."""
+        return self._model(**self._data)
+
+    def to_dict(self):
+        """Return the response data as it was received, not validated."""
+        return self._data
+
+    def dict(self, **kwargs):
+        """Same as `BaseModel.dict` of the validated model."""
+        return self.to_model().dict(**kwargs)
@@ -0,0 +1,214 @@
+"""Progress of file transfers.
+
+Transfers report transferred bytes from any thread, progress is drawn at
+a fixed rate by its own thread: as a single line redrawn in place on a
+terminal, or as periodic lines when output goes to a log.
+"""
+import os
+import sys
+import threading
+import time
+from datetime import timedelta
+from itertools import islice
+
+# seconds between redraws of the progress line on a terminal
+TTY_INTERVAL = 0.2
+# seconds between progress lines when output is not a terminal
+LOG_INTERVAL = 30
+# number of files shown with their own progress
+MAX_FILES_SHOWN = 3
+
+
+def format_size(nbytes):
+    """Format number of bytes using the largest fitting unit."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if nbytes < 1024:
+            break
+        nbytes /= 1024
+    else:
+        unit = "TB"
+    if unit == "B":
+        return "{}B".format(int(nbytes))
+    return "{:.1f}{}".format(nbytes, unit)
+
+
+def _percent(done, total):
+    return 100 * done // total if total else 100
+
+
+# pylint: disable=too-many-instance-attributes
+class TransferProgress:
+    """Aggregate progress of concurrent file transfers.
+
+    Use it as a context manager, or close it, so that the final progress is
+    drawn and the drawing thread stops.
+
+    Args:
+        action (str): what is being done, i.e. "Uploading"
+        stream (file, optional): where to draw progress, defaults to stderr
+        interval (float, optional): seconds between redraws
+    """
+
+    def __init__(self, action, stream=None, interval=None):
+        self.action = action
+        self._stream = stream or sys.stderr
+        self._interactive = self._stream.isatty()
+        if interval is None:
+            interval = TTY_INTERVAL if self._interactive else LOG_INTERVAL
+        self._interval = interval
+        self._lock = threading.Lock()
+        # file name: [transferred bytes, size]
+        self._files = {}
+        self._transferred = 0
+        self._total = 0
+        self._finished_files = 0
+        self._start = time.monotonic()
+        self._line_length = 0
+        self._drawn = False
+        self._closed = threading.Event()
+        self._ticker = threading.Thread(target=self._tick, daemon=True)
+        self._ticker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add_file(self, name, size):
+        """Start tracking a file transfer.
+
+        Only the base name of the file is shown, but the whole name has to
+        be unique among files being transferred. Adding a file which is
+        already tracked, i.e. when its transfer is retried, starts its
+        progress over instead of counting it twice.
+
+        Returns:
+            function: callback which takes the number of bytes transferred
+        """
+        with self._lock:
+            if name in self._files:
+                transferred, previous_size = self._files[name]
+                self._transferred -= transferred
+                self._total -= previous_size
+            self._files[name] = [0, size]
+            self._total += size
+
+        def _update(nbytes):
+            self.update(name, nbytes)
+
+        return _update
+
+    def update(self, name, nbytes):
+        """Add transferred bytes of a file, safe to call from any thread."""
+        with self._lock:
+            self._files[name][0] += nbytes
+            self._transferred += nbytes
+
+    def finish_file(self, name):
+        """Stop tracking a file transfer which is done."""
+        with self._lock:
+            transferred, size = self._files.pop(name)
+            # transfers might report less, i.e. when resumed
+            self._transferred += size - transferred
+            self._finished_files += 1
+
+    def discard_file(self, name):
+        """Stop tracking a file transfer which failed."""
+        with self._lock:
+            transferred, size = self._files.pop(name)
+            self._transferred -= transferred
+            self._total -= size
+
+    def close(self):
+        """Stop drawing and draw final progress.
+
+        When output is not a terminal, transfers which finished before the
+        first periodic line are not reported.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._ticker.join()
+        if self._interactive:
+            self._draw(time.monotonic())
+            self._stream.write("\n")
+            self._stream.flush()
+        elif self._drawn:
+            self._draw(time.monotonic())
+
+    def _tick(self):
+        # redrawn even without updates, so that speed and ETA stay current
+        while not self._closed.wait(self._interval):
+            self._draw(time.monotonic())
+
+    def _render(self, now):
+        elapsed = now - self._start
+        speed = self._transferred / elapsed if elapsed > 0 else 0
+        parts = [
+            "{}: {}%".format(
+                self.action, _percent(self._transferred, self._total)
+            ),
+            "{}/{}".format(
+                format_size(self._transferred), format_size(self._total)
+            ),
+            "{}/s".format(format_size(speed)),
+        ]
+        if speed and self._total > self._transferred:
+            eta = (self._total - self._transferred) / speed
+            parts.append("ETA {}".format(timedelta(seconds=int(eta))))
+        if self._files:
+            files = [
+                "{} {}%".format(os.path.basename(name), _percent(done, size))
+                for name, (done, size) in islice(
+                    self._files.items(), MAX_FILES_SHOWN
+                )
+            ]
+            if len(self._files) > MAX_FILES_SHOWN:
+                files.append(
+                    "+{}".format(len(self._files) - MAX_FILES_SHOWN)
+                )
+            parts.append("[{}]".format(", ".join(files)))
+        if self._finished_files:
+            parts.append("{} done".format(self._finished_files))
+        return " ".join(parts)
+
+    def _draw(self, now):
+        # only the drawing thread, and close once it stopped, write output
+        with self._lock:
+            line = self._render(now)
+        if self._interactive:
+            padding = " " * max(self._line_length - len(line), 0)
+            self._stream.write("\r" + line + padding)
+            self._line_length = len(line)
+        else:
+            self._stream.write(line + "\n")
+        self._stream.flush()
+        self._drawn = True
+
+
+def write_chunks(chunks, destination, progress=None, name=None, size=None):
+    """Write transferred chunks, tracking them as a file of the progress.
+
+    If writing fails, the file is no longer tracked by the progress.
+
+    Args:
+        chunks (iterable of bytes): transferred data
+        destination (file): where to write the data
+        progress (TransferProgress, optional): progress of the transfer
+        name (str, optional): file name shown in progress
+        size (int, optional): expected number of bytes
+    """
+    if progress is None:
+        for chunk in chunks:
+            destination.write(chunk)
+        return
+    update_progress = progress.add_file(name, size)
+    try:
+        for chunk in chunks:
+            destination.write(chunk)
+            update_progress(len(chunk))
+    except BaseException:
+        progress.discard_file(name)
+        raise
+    progress.finish_file(name)
@@ -0,0 +1,349 @@
+"""JSON serialization of API payloads and command outputs.
+
+orjson is used when it is installed, otherwise the standard library json
+module is used. Output of `dumps` is the same in both cases: objects orjson
+encodes differently, i.e. NaN and infinity, are left to json.
+"""
+import codecs
+import datetime
+import json
+import math
+import re
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from gencove.models import LazyModel  # noqa: I100
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# orjson indents with 2 spaces; doubling the leading indentation of every
+# line gives the 4 spaces used by the outputs. JSON strings never contain
+# a raw newline, so every line starts with indentation only.
+INDENT_2_RE = re.compile(rb"^((?:  )+)", re.MULTILINE)
+# Floats that orjson renders differently from `repr(float)`:
+# exponents without sign/padding and small numbers without an exponent.
+# Numbers are always the last token on their line in indented output.
+ORJSON_FLOAT_RE = re.compile(
+    r"(?:^|(?<= ))(-?\d+(?:\.\d+)?e-?\d+|-?0\.0000\d*)(?=,?$)",
+    re.MULTILINE,
+)
+NON_ASCII_RE = re.compile(r"[^\x00-\x7e]")
+# orjson does not keep integers over 64 bits exact, these are left to json
+LONG_DIGITS_RE = re.compile(rb"[0-9]{19}")
+WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+NUMBER_TAIL_RE = re.compile(r"[0-9.eE+-]*")
+
+
+def model_to_dict(model):
+    """Turn pydantic model into a `dict` in a single pass.
+
+    Equivalent to
+    `{**model.dict(exclude_unset=True), **model.dict(exclude_none=True)}`:
+    explicitly set fields are kept even if None, nested values have None
+    fields removed.
+
+    Args:
+        model (BaseModel): pydantic model instance
+
+    Returns:
+        dict
+    """
+    data = model.dict(exclude_none=True)
+    result = {
+        name: data.get(name)
+        for name in model.__fields__
+        if name in model.__fields_set__
+    }
+    if len(result) != len(data):
+        for name, value in data.items():
+            if name not in result:
+                result[name] = value
+    return result
+
+
+def _default(o):
+    """Encode objects that orjson does not know about."""
+    if isinstance(o, BaseModel):
+        return model_to_dict(o)
+    if isinstance(o, LazyModel):
+        return o.to_dict()
+    raise TypeError
+
+
+def _payload_default(o):
+    """Encode objects of API payloads, lazy models are validated first."""
+    if isinstance(o, LazyModel):
+        return model_to_dict(o.to_model())
+    return _default(o)
+
+
+class CustomEncoder(json.JSONEncoder):
+    """JSON encoder that knows how to encode `datetime`, `UUID`,
+    `pydantic.BaseModel` and `LazyModel` objects.
+    """
+
+    # pylint: disable=method-hidden
+    def default(self, o):
+        """Override default method of JSONEncoder."""
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        if isinstance(o, BaseModel):
+            return model_to_dict(o)
+        if isinstance(o, LazyModel):
+            return o.to_dict()
+        if isinstance(o, UUID):
+            return str(o)
+        return json.JSONEncoder.default(self, o)
+
+
+class PayloadEncoder(CustomEncoder):
+    """JSON encoder of API payloads, lazy models are validated first."""
+
+    # pylint: disable=method-hidden
+    def default(self, o):
+        """Override default method of CustomEncoder."""
+        if isinstance(o, LazyModel):
+            return model_to_dict(o.to_model())
+        return super().default(o)
+
+
+def _has_non_finite_float(obj):
+    """Check if obj contains NaN or infinity, which orjson encodes as null."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite_float(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite_float(value) for value in obj)
+    if isinstance(obj, (BaseModel, LazyModel)):
+        return _has_non_finite_float(_default(obj))
+    return False
+
+
+def _orjson_dumps(obj, option=None, default=_default):
+    """Dump using orjson, or return None if json output would differ.
+
+    Raises:
+        TypeError: if orjson cannot encode obj
+    """
+    raw = orjson.dumps(obj, default=default, option=option)
+    # null is also output for None, objects are checked only if it occurs
+    if b"null" in raw and _has_non_finite_float(obj):
+        return None
+    return raw
+
+
+def _escape_non_ascii(match):
+    """Escape a character the same way `json.dumps` does."""
+    code = ord(match.group(0))
+    if code < 0x10000:
+        return "\\u{0:04x}".format(code)
+    code -= 0x10000
+    return "\\u{0:04x}\\u{1:04x}".format(
+        0xD800 | ((code >> 10) & 0x3FF), 0xDC00 | (code & 0x3FF)
+    )
+
+
+def _repr_float(match):
+    return repr(float(match.group(1)))
+
+
+def _orjson_dumps_indented(obj):
+    """Dump using orjson, formatted exactly like `json.dumps(indent=4)`.
+
+    Returns None if the output would differ.
+    """
+    raw = _orjson_dumps(obj, option=orjson.OPT_INDENT_2)
+    if raw is None:
+        return None
+    raw = INDENT_2_RE.sub(rb"\1\1", raw)
+    try:
+        output = raw.decode("ascii")
+    except UnicodeDecodeError:
+        output = NON_ASCII_RE.sub(_escape_non_ascii, raw.decode("utf-8"))
+    else:
+        if "\x7f" in output:
+            output = NON_ASCII_RE.sub(_escape_non_ascii, output)
+    return ORJSON_FLOAT_RE.sub(_repr_float, output)
+
+
+def dumps(obj, indent=None):
+    """Serialize obj to a JSON formatted string.
+
+    Same output as `json.dumps(obj, cls=CustomEncoder, indent=indent)`.
+
+    Args:
+        obj: object to serialize
+        indent (int, optional): indentation level
+
+    Returns:
+        str
+    """
+    if orjson is not None and indent == 4:
+        try:
+            output = _orjson_dumps_indented(obj)
+        except TypeError:
+            # e.g. integers over 64 bits or non-string keys
+            output = None
+        if output is not None:
+            return output
+    return json.dumps(obj, cls=CustomEncoder, indent=indent)
+
+
+def dumps_payload(payload):
+    """Serialize API request payload.
+
+    Unlike outputs, lazy models in payloads are validated, so that only
+    model fields are sent to the API.
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            raw = _orjson_dumps(payload, default=_payload_default)
+        except TypeError:
+            raw = None
+        if raw is not None:
+            return raw
+    return json.dumps(payload, cls=PayloadEncoder).encode("utf-8")
+
+
+def loads(data):
+    """Deserialize JSON from bytes or str."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if orjson is not None and not LONG_DIGITS_RE.search(data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # let json decide if it is valid and raise the usual error
+            pass
+    return json.loads(data)
+
+
+class _ChunksReader:
+    """Buffer over an iterable of bytes chunks for incremental parsing."""
+
+    decoder = json.JSONDecoder()
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+
+    def fill(self):
+        """Read next chunk into the buffer, return False if there is none."""
+        for chunk in self._chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                pos = self.pos
+                self.buf = self.buf[pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Return next non-whitespace character or empty string at the end."""
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        """Consume next non-whitespace character, which must be in chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                "Expecting one of '{}'".format(chars), self.buf, self.pos
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode next JSON value, reading more chunks as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # a number at the end of the buffer might continue in next chunk
+            if (
+                isinstance(value, (int, float))
+                and NUMBER_TAIL_RE.match(self.buf, end).end() == len(self.buf)
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+class JSONObjectStream:
+    """Incrementally parsed JSON object with one streamed array member.
+
+    Top-level members before the streamed array are parsed on creation and
+    available in `fields`. Items of the array are parsed one at a time while
+    iterating, so memory does not grow with the length of the array.
+    Members after the array are added to `fields` once iteration is done.
+
+    Args:
+        chunks (iterable of bytes): JSON document, e.g.
+            `response.iter_content()`
+        key (str): name of the array member to stream
+    """
+
+    def __init__(self, chunks, key="results"):
+        self.key = key
+        self.fields = {}
+        self._reader = _ChunksReader(chunks)
+        self._items = self._parse()
+        # parse members up to the streamed array
+        next(self._items, None)
+
+    def __iter__(self):
+        return self._items
+
+    def _parse(self):
+        reader = self._reader
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.pos += 1
+            yield None
+            return
+        started = False
+        while True:
+            name = reader.value()
+            reader.expect(":")
+            if name == self.key and reader.peek() == "[" and not started:
+                started = True
+                reader.pos += 1
+                yield None
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value()
+                        if reader.expect(",]") == "]":
+                            break
+            else:
+                self.fields[name] = reader.value()
+            if reader.expect(",}") == "}":
+                break
+        if not started:
+            yield None
+
+    def finish(self):
+        """Parse the rest of the document, skipping unread items."""
+        for _ in self._items:
+            pass
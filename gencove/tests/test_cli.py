@@ -0,0 +1,42 @@
+"""Test command line interface entry point."""
+import subprocess  # nosec
+import sys
+
+from click.testing import CliRunner
+
+from gencove import cli
+
+
+def test_cli_startup_does_not_import_commands():
+    """Test that heavy dependencies are imported only when needed."""
+    code = (
+        "import sys\n"
+        "from gencove.cli import cli\n"
+        "heavy = ('boto3', 'botocore', 'progressbar', 'gencove.client')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    output = subprocess.run(  # nosec
+        [sys.executable, "-c", code],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    assert output.strip() == ""
+
+
+def test_cli_lists_lazy_commands():
+    """Test that all commands are listed in help."""
+    runner = CliRunner()
+    res = runner.invoke(cli.cli, ["--help"])
+    assert res.exit_code == 0
+    for name in cli.COMMANDS:
+        assert "  {} ".format(name) in res.output
+
+
+def test_cli_loads_command():
+    """Test that command is imported when invoked."""
+    runner = CliRunner()
+    res = runner.invoke(cli.cli, ["webhooks", "--help"])
+    assert res.exit_code == 0
+    assert "verify" in res.output
+    assert cli.download.name == "download"
@@ -3,12 +3,16 @@ import io
 import json
 import os
 import sys
-from uuid import uuid4
+import threading
+from itertools import chain, repeat
+from uuid import UUID, uuid4
 
 from click import echo
 from click.testing import CliRunner
 
-from gencove.cli import download
+import requests
+
+from gencove.cli import download  # noqa: I100
 from gencove.client import APIClient
 from gencove.models import (
     ProjectSamples,
@@ -879,3 +883,588 @@ def test_project_id_provided_filter_not_archived(mocker):
         mocked_get_metadata.assert_not_called()
         mocked_download_file.assert_not_called()
         mocked_sample_details.assert_not_called()
+
+
+def test_download_template_collisions(mocker):
+    """Test colliding file paths are reported before any download."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        mocker.patch.object(APIClient, "login", return_value=None)
+        sample_ids = [str(uuid4()), str(uuid4())]
+        mocked_sample_details = mocker.patch.object(
+            APIClient,
+            "get_sample_details",
+            side_effect=[
+                SampleDetails(
+                    **{
+                        "id": sample_id,
+                        "client_id": "1",
+                        "last_status": {
+                            "id": str(uuid4()),
+                            "status": "succeeded",
+                            "created": "2020-07-28T12:46:22.719862Z",
+                        },
+                        "archive_last_status": {
+                            "id": str(uuid4()),
+                            "status": "available",
+                            "created": "2020-07-28T12:46:22.719862Z",
+                            "transition_cutoff": (
+                                "2020-08-28T12:46:22.719862Z"
+                            ),
+                        },
+                        "files": [
+                            {
+                                "id": str(uuid4()),
+                                "file_type": "txt",
+                                "download_url": "https://foo.com/bar.txt",
+                            }
+                        ],
+                    }
+                )
+                for sample_id in sample_ids
+            ],
+        )
+        mocked_qc_metrics = mocker.patch.object(
+            APIClient, "get_sample_qc_metrics"
+        )
+        mocked_download_file = mocker.patch(
+            "gencove.command.download.main.download_file"
+        )
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--sample-ids",
+                ",".join(sample_ids),
+                "--email",
+                "foo@bar.com",
+                "--password",
+                "123",
+                "--download-template",
+                "{client_id}/{default_filename}",
+            ],
+        )
+        assert res.exit_code == 0
+        assert mocked_sample_details.call_count == 2
+        assert "Bad template!" in res.output
+        assert "2 files would be saved to cli_test_data/1/bar.txt" in (
+            res.output
+        )
+        mocked_qc_metrics.assert_not_called()
+        mocked_download_file.assert_not_called()
+        assert not os.path.exists("cli_test_data")
+
+
+def test_download_template_unknown_token(mocker):
+    """Test unknown template tokens are rejected before downloading."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        mocker.patch.object(APIClient, "login", return_value=None)
+        mocked_sample_details = mocker.patch.object(
+            APIClient, "get_sample_details"
+        )
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--sample-ids",
+                "0",
+                "--email",
+                "foo@bar.com",
+                "--password",
+                "123",
+                "--download-template",
+                "{client_id}/{sample_name}",
+            ],
+        )
+        assert res.exit_code == 1
+        assert "Unknown download template tokens: sample_name" in res.output
+        mocked_sample_details.assert_not_called()
+
+
+def test_download_refreshes_expired_url(mocker):
+    """Test download url of a file is refreshed after error 403."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        mocker.patch.object(APIClient, "login", return_value=None)
+        sample_id = str(uuid4())
+
+        def _sample_details(download_url):
+            return SampleDetails(
+                **{
+                    "id": sample_id,
+                    "client_id": "1",
+                    "last_status": {
+                        "id": str(uuid4()),
+                        "status": "succeeded",
+                        "created": "2020-07-28T12:46:22.719862Z",
+                    },
+                    "archive_last_status": {
+                        "id": str(uuid4()),
+                        "status": "available",
+                        "created": "2020-07-28T12:46:22.719862Z",
+                        "transition_cutoff": "2020-08-28T12:46:22.719862Z",
+                    },
+                    "files": [
+                        {
+                            "id": str(uuid4()),
+                            "file_type": "txt",
+                            "download_url": download_url,
+                        }
+                    ],
+                }
+            )
+
+        mocked_sample_details = mocker.patch.object(
+            APIClient,
+            "get_sample_details",
+            side_effect=[
+                _sample_details("https://foo.com/bar.txt?v=1"),
+                _sample_details("https://foo.com/bar.txt?v=2"),
+            ],
+        )
+        expired = requests.Response()
+        expired.status_code = 403
+        mocked_download_file = mocker.patch(
+            "gencove.command.download.main.download_file",
+            side_effect=[requests.exceptions.HTTPError(response=expired), 1],
+        )
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--sample-ids",
+                sample_id,
+                "--email",
+                "foo@bar.com",
+                "--password",
+                "123",
+                "--file-types",
+                "txt",
+            ],
+        )
+        assert res.exit_code == 0
+        assert mocked_sample_details.call_count == 2
+        assert mocked_download_file.call_args_list[1][0][1] == (
+            "https://foo.com/bar.txt?v=2"
+        )
+
+
+def _manifest_sample(sample_id, download_url):
+    return {
+        "gencove_id": sample_id,
+        "client_id": "1",
+        "last_status": {"status": "succeeded"},
+        "files": {
+            "txt": {"id": str(uuid4()), "download_url": download_url}
+        },
+    }
+
+
+def test_download_from_manifest(mocker):
+    """Test files of a JSON or JSON lines manifest are downloaded."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        mocked_login = mocker.patch.object(APIClient, "login")
+        mocked_sample_details = mocker.patch.object(
+            APIClient, "get_sample_details"
+        )
+        mocked_download_file = mocker.patch(
+            "gencove.command.download.main.download_file"
+        )
+        sample_ids = [str(uuid4()), str(uuid4())]
+        samples = [
+            _manifest_sample(sample_id, "https://foo.com/bar.txt")
+            for sample_id in sample_ids
+        ]
+        with open("urls.json", "w") as manifest:
+            json.dump(samples, manifest, indent=4)
+        with open("urls.jsonl", "w") as manifest:
+            for sample in samples:
+                manifest.write(json.dumps(sample) + "\n")
+
+        for manifest in ("urls.json", "urls.jsonl"):
+            mocked_download_file.reset_mock()
+            res = runner.invoke(
+                download,
+                ["cli_test_data", "--from-manifest", manifest],
+            )
+            assert res.exit_code == 0
+            assert sorted(
+                call[0] for call in mocked_download_file.call_args_list
+            ) == sorted(
+                (
+                    f"cli_test_data/1/{sample_id}/bar.txt",
+                    "https://foo.com/bar.txt",
+                    True,
+                    False,
+                )
+                for sample_id in sample_ids
+            )
+        mocked_login.assert_not_called()
+        mocked_sample_details.assert_not_called()
+
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--from-manifest",
+                "urls.json",
+                "--sample-ids",
+                sample_ids[0],
+            ],
+        )
+        assert res.exit_code == 1
+        assert "Cannot use project id or sample ids" in res.output
+
+        with open("invalid.json", "w") as manifest:
+            json.dump([{"client_id": "1"}], manifest)
+        res = runner.invoke(
+            download, ["cli_test_data", "--from-manifest", "invalid.json"]
+        )
+        assert res.exit_code == 1
+        assert "Invalid manifest invalid.json" in res.output
+
+
+def test_download_from_manifest_refreshes_expired_url(mocker):
+    """Test expired download urls of a manifest are refreshed."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        sample_id = str(uuid4())
+        with open("urls.json", "w") as manifest:
+            json.dump(
+                [_manifest_sample(sample_id, "https://foo.com/bar.txt?v=1")],
+                manifest,
+            )
+        mocked_sample_details = mocker.patch.object(
+            APIClient,
+            "get_sample_details",
+            return_value=SampleDetails(
+                id=sample_id,
+                files=[
+                    {
+                        "id": str(uuid4()),
+                        "file_type": "txt",
+                        "download_url": "https://foo.com/bar.txt?v=2",
+                    }
+                ],
+            ),
+        )
+        expired = requests.Response()
+        expired.status_code = 403
+        mocked_download_file = mocker.patch(
+            "gencove.command.download.main.download_file",
+            side_effect=[requests.exceptions.HTTPError(response=expired), 1],
+        )
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--from-manifest",
+                "urls.json",
+                "--api-key",
+                "foo",
+                "--no-progress",
+            ],
+        )
+        assert res.exit_code == 0
+        mocked_sample_details.assert_called_once_with(sample_id)
+        assert mocked_download_file.call_args_list[1][0][1] == (
+            "https://foo.com/bar.txt?v=2"
+        )
+
+
+def test_download_shard(mocker):
+    """Test only samples of the shard are downloaded."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        mocker.patch.object(APIClient, "login", return_value=None)
+        mocked_sample_details = mocker.patch.object(
+            APIClient,
+            "get_sample_details",
+            side_effect=lambda sample_id: SampleDetails(
+                id=sample_id,
+                client_id="1",
+                last_status={"id": str(uuid4()), "status": "succeeded"},
+                archive_last_status={
+                    "id": str(uuid4()),
+                    "status": "available",
+                },
+                files=[],
+            ),
+        )
+        sample_ids = [str(UUID(int=i, version=4)) for i in range(20)]
+        downloaded = []
+        for shard in ("1/3", "2/3", "3/3"):
+            mocked_sample_details.reset_mock()
+            res = runner.invoke(
+                download,
+                [
+                    "cli_test_data",
+                    "--sample-ids",
+                    ",".join(sample_ids),
+                    "--file-types",
+                    "txt",
+                    "--api-key",
+                    "foo",
+                    "--shard",
+                    shard,
+                ],
+            )
+            assert res.exit_code == 0
+            downloaded.extend(
+                str(call[0][0])
+                for call in mocked_sample_details.call_args_list
+            )
+        assert sorted(downloaded) == sorted(sample_ids)
+
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--sample-ids",
+                ",".join(sample_ids),
+                "--shard",
+                "4/3",
+            ],
+        )
+        assert res.exit_code == 2
+        assert "must be a shard index and number of shards" in res.output
+
+
+def test_download_saves_qc_and_metadata_concurrently(mocker):
+    """Test QC metrics and metadata are saved while files download."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        mocker.patch.object(APIClient, "login", return_value=None)
+        sample_id = str(uuid4())
+        mocker.patch.object(
+            APIClient,
+            "get_sample_details",
+            return_value=SampleDetails(
+                id=sample_id,
+                client_id="1",
+                last_status={"id": str(uuid4()), "status": "succeeded"},
+                archive_last_status={
+                    "id": str(uuid4()),
+                    "status": "available",
+                },
+                files=[
+                    {
+                        "id": str(uuid4()),
+                        "file_type": "txt",
+                        "download_url": "https://foo.com/bar.txt",
+                    }
+                ],
+            ),
+        )
+        metadata_saved = threading.Event()
+
+        def _get_metadata(_sample_id):
+            metadata_saved.set()
+            return SampleMetadata(metadata={"foo": "bar"})
+
+        mocker.patch.object(
+            APIClient,
+            "get_sample_qc_metrics",
+            return_value=SampleQC(results=[], meta={}),
+        )
+        mocker.patch.object(
+            APIClient, "get_metadata", side_effect=_get_metadata
+        )
+        # deliverable download waits for metadata, which is planned before
+        mocked_download_file = mocker.patch(
+            "gencove.command.download.main.download_file",
+            side_effect=lambda *args: metadata_saved.wait(5),
+        )
+        res = runner.invoke(
+            download,
+            ["cli_test_data", "--sample-ids", sample_id, "--api-key", "foo"],
+        )
+        assert res.exit_code == 0
+        mocked_download_file.assert_called_once()
+        assert metadata_saved.is_set()
+        with open(
+            f"cli_test_data/1/{sample_id}/{sample_id}_metadata.json"
+        ) as metadata_file:
+            assert json.load(metadata_file)["metadata"] == {"foo": "bar"}
+
+
+def _mock_restore_archived(mocker, archive_statuses):
+    """Mock a project with an available and an archived sample.
+
+    Archived sample has the given archive statuses when it is listed and
+    then polled.
+    """
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocker.patch("gencove.command.download.main.POLL_INTERVAL", 0)
+    available_id = str(uuid4())
+    archived_id = str(uuid4())
+    mocked_project_samples = mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        return_value=ProjectSamples(
+            results=[{"id": available_id}, {"id": archived_id}],
+            meta={"next": None},
+        ),
+    )
+    archive_statuses = iter(archive_statuses)
+
+    def _get_sample_details(sample_id):
+        status = "available"
+        if str(sample_id) == archived_id:
+            status = next(archive_statuses)
+        return SampleDetails(
+            id=sample_id,
+            client_id="1",
+            last_status={"id": str(uuid4()), "status": "succeeded"},
+            archive_last_status={"id": str(uuid4()), "status": status},
+            files=[
+                {
+                    "id": str(uuid4()),
+                    "file_type": "txt",
+                    "download_url": f"https://foo.com/{sample_id}.txt",
+                }
+            ],
+        )
+
+    mocker.patch.object(
+        APIClient, "get_sample_details", side_effect=_get_sample_details
+    )
+    mocked_restore = mocker.patch.object(
+        APIClient, "restore_project_samples", return_value=None
+    )
+    mocked_download_file = mocker.patch(
+        "gencove.command.download.main.download_file"
+    )
+    return (
+        available_id,
+        archived_id,
+        mocked_project_samples,
+        mocked_restore,
+        mocked_download_file,
+    )
+
+
+def test_download_restore_archived(mocker):
+    """Test archived samples are restored and downloaded once restored."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        (
+            available_id,
+            archived_id,
+            mocked_project_samples,
+            mocked_restore,
+            mocked_download_file,
+        ) = _mock_restore_archived(
+            mocker, ["archived", "restore_requested", "restored"]
+        )
+        project_id = str(uuid4())
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--project-id",
+                project_id,
+                "--file-types",
+                "txt",
+                "--restore-archived",
+                "--api-key",
+                "foo",
+            ],
+        )
+        assert res.exit_code == 0
+        assert (
+            mocked_project_samples.call_args[1]["sample_archive_status"]
+            == "all"
+        )
+        mocked_restore.assert_called_once_with(
+            project_id=UUID(project_id), sample_ids=[archived_id]
+        )
+        downloaded = [
+            call[0][1] for call in mocked_download_file.call_args_list
+        ]
+        assert downloaded == [
+            f"https://foo.com/{available_id}.txt",
+            f"https://foo.com/{archived_id}.txt",
+        ]
+        assert f"Sample {archived_id} restored" in res.output
+
+
+def test_download_restore_archived__failed(mocker):
+    """Test failed restore is reported once other samples are downloaded."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        available_id, archived_id, _, _, mocked_download_file = (
+            # still archived right after the restore request
+            _mock_restore_archived(
+                mocker,
+                ["archived", "archived", "restore_requested", "archived"],
+            )
+        )
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--project-id",
+                str(uuid4()),
+                "--file-types",
+                "txt",
+                "--restore-archived",
+                "--api-key",
+                "foo",
+            ],
+        )
+        assert res.exit_code == 4
+        assert f"Restore of sample {archived_id} failed" in res.output
+        mocked_download_file.assert_called_once()
+        assert mocked_download_file.call_args[0][1] == (
+            f"https://foo.com/{available_id}.txt"
+        )
+
+
+def test_download_restore_archived__timeout(mocker):
+    """Test samples not restored in time are reported."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        _, _, _, _, mocked_download_file = _mock_restore_archived(
+            mocker, chain(["archived"], repeat("restore_requested"))
+        )
+        mocker.patch("gencove.command.download.main.POLL_INTERVAL", 0.1)
+        res = runner.invoke(
+            download,
+            [
+                "cli_test_data",
+                "--project-id",
+                str(uuid4()),
+                "--file-types",
+                "txt",
+                "--restore-archived",
+                "--wait-timeout",
+                "1",
+                "--api-key",
+                "foo",
+            ],
+        )
+        assert res.exit_code == 3
+        assert "1 archived samples were not restored in time" in res.output
+        mocked_download_file.assert_called_once()
+
+
+def test_download_restore_archived_requires_project_id(mocker):
+    """Test restoring archived samples is refused without a project id."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    res = runner.invoke(
+        download,
+        [
+            "cli_test_data",
+            "--sample-ids",
+            str(uuid4()),
+            "--restore-archived",
+            "--api-key",
+            "foo",
+        ],
+    )
+    assert res.exit_code == 1
+    assert "Restoring archived samples requires a project id." in res.output
@@ -3,6 +3,7 @@ import io
 import json
 import os
 import sys
+import threading
 from uuid import uuid4
 
 from click import echo
@@ -969,3 +970,70 @@ def test_upload_retry_after_unauthorized(mocker):
         # Call count = upload details + refresh jwt + retry upload details
         assert mocked_request.call_count == 3
         assert force_refresh_jwt is False
+
+
+def test_upload__bad_max_memory(mocker):
+    """Test memory budget has to be a valid size."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        os.mkdir("cli_test_data")
+        with open("cli_test_data/test.fastq.gz", "w") as fastq_file:
+            fastq_file.write("AAABBB")
+        mocked_login = mocker.patch.object(
+            APIClient, "login", return_value=None
+        )
+        res = runner.invoke(
+            upload,
+            [
+                "cli_test_data",
+                "--email",
+                "foo@bar.com",
+                "--password",
+                "123",
+                "--max-memory",
+                "1M",
+            ],
+        )
+        assert res.exit_code == 2
+        mocked_login.assert_not_called()
+        assert "Invalid value for '--max-memory'" in res.output
+
+
+def test_upload__files_in_flight(mocker):
+    """Test that several files are uploaded at once."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        os.mkdir("cli_test_data")
+        for name in ("test_1.fastq.gz", "test_2.fastq.gz"):
+            with open(f"cli_test_data/{name}", "w") as fastq_file:
+                fastq_file.write("AAABBB")
+
+        mocker.patch.object(APIClient, "login", return_value=None)
+        mocked_get_credentials = mocker.patch(
+            "gencove.command.upload.main.get_s3_client_refreshable"
+        )
+        mocker.patch.object(
+            APIClient,
+            "get_upload_details",
+            return_value=UploadsPostData(
+                id=str(uuid4()),
+                last_status={"id": str(uuid4()), "status": ""},
+                s3={"bucket": "test", "object_name": "test"},
+            ),
+        )
+        # each upload waits for the other one to start
+        started = threading.Barrier(2, timeout=5)
+        mocked_upload_file = mocker.patch(
+            "gencove.command.upload.main.upload_file",
+            side_effect=lambda **kwargs: started.wait(),
+        )
+        res = runner.invoke(
+            upload, ["cli_test_data", "--api-key", "foo", "--no-progress"]
+        )
+
+        assert res.exit_code == 0
+        assert mocked_upload_file.call_count == 2
+        # files in flight share threads and connections
+        assert (
+            mocked_get_credentials.call_args[1]["max_pool_connections"] == 1
+        )
@@ -214,3 +214,35 @@ def test_get_batch__not_empty__slow_response_retry(mocker):
     mocked_login.assert_called_once()
     assert mocked_get_batch.call_count == 2
     mocked_download_file.assert_not_called()
+
+
+def test_get_batch__wait_timeout(mocker):
+    """Test waiting for a batch which does not finish in time."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    batch_id = str(uuid4())
+    mocked_get_batch = mocker.patch.object(
+        APIClient,
+        "get_batch",
+        return_value=BatchDetail(
+            id=batch_id,
+            last_status=dict(
+                id=str(uuid4()),
+                status="running",
+                created="2020-08-02T22:13:54.547167Z",
+            ),
+        ),
+    )
+    monotonic = iter(range(0, 1000, 5))
+    mocker.patch(
+        "gencove.command.utils.time.monotonic",
+        side_effect=lambda: next(monotonic),
+    )
+    mocker.patch("gencove.command.utils.time.sleep")
+    res = runner.invoke(
+        get_batch,
+        [batch_id, "--wait", "--wait-timeout", "20", "--api-key", "foo"],
+    )
+    assert res.exit_code == 3
+    assert "did not finish in 20 seconds" in res.output
+    assert mocked_get_batch.call_count > 1
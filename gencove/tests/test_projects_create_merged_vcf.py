@@ -7,9 +7,13 @@ from uuid import uuid4
 from click import echo
 from click.testing import CliRunner
 
-from gencove.client import APIClient, APIClientError  # noqa: I100
+from gencove.client import (  # noqa: I100
+    APIClient,
+    APIClientError,
+    APIClientTimeout,
+)
 from gencove.command.projects.cli import create_merged_vcf
-from gencove.models import ProjectMergeVCFs
+from gencove.models import Project, ProjectMergeVCFs
 
 
 def test_create_merged_vcf__bad_project_id(mocker):
@@ -341,3 +345,136 @@ def test_create_merged_vcf__success(mocker):
     assert (
         "Issued merge request for project {}".format(project_id) in res.output
     )
+
+
+def test_create_merged_vcf__wait(mocker):
+    """Test merged file is waited for and downloaded."""
+    project_id = str(uuid4())
+    merge_id = str(uuid4())
+
+    def _merge(status):
+        return ProjectMergeVCFs(
+            id=merge_id,
+            last_status=dict(
+                id=str(uuid4()),
+                status=status,
+                created="2020-07-28T12:46:22.719862Z",
+            ),
+        )
+
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocker.patch.object(
+        APIClient, "create_merged_vcf", return_value=_merge("running")
+    )
+    mocked_retrieve_merged_vcf = mocker.patch.object(
+        APIClient,
+        "retrieve_merged_vcf",
+        side_effect=[
+            _merge("running"),
+            _merge("running"),
+            _merge("success"),
+        ],
+    )
+    mocked_get_project = mocker.patch.object(
+        APIClient,
+        "get_project",
+        return_value=Project(
+            id=project_id,
+            files=[
+                dict(
+                    id=str(uuid4()),
+                    file_type="impute-vcf-merged",
+                    download_url="https://foo.com/bar.vcf.bgz",
+                )
+            ],
+        ),
+    )
+    mocked_sleep = mocker.patch("gencove.command.utils.time.sleep")
+    mocked_download_file = mocker.patch(
+        "gencove.command.projects.get_merged_vcf.main.download.utils."
+        "download_file"
+    )
+    res = runner.invoke(
+        create_merged_vcf,
+        [project_id, "--wait", "--no-progress", "--api-key", "foo"],
+    )
+    assert res.exit_code == 0
+    assert mocked_retrieve_merged_vcf.call_count == 3
+    # polls are further apart while status does not change
+    assert [call[0][0] for call in mocked_sleep.call_args_list] == [5, 7.5]
+    mocked_get_project.assert_called_once_with(project_id)
+    mocked_download_file.assert_called_once_with(
+        "bar.vcf.bgz", "https://foo.com/bar.vcf.bgz", no_progress=True
+    )
+
+
+def test_create_merged_vcf__wait_download_retried(mocker):
+    """Test download after waiting is retried when API times out."""
+    project_id = str(uuid4())
+    merge = ProjectMergeVCFs(
+        id=str(uuid4()),
+        last_status=dict(
+            id=str(uuid4()),
+            status="success",
+            created="2020-07-28T12:46:22.719862Z",
+        ),
+    )
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocker.patch.object(APIClient, "create_merged_vcf", return_value=merge)
+    mocker.patch.object(APIClient, "retrieve_merged_vcf", return_value=merge)
+    mocked_get_project = mocker.patch.object(
+        APIClient,
+        "get_project",
+        side_effect=[
+            APIClientTimeout("Could not connect to the api server"),
+            Project(
+                id=project_id,
+                files=[
+                    dict(
+                        id=str(uuid4()),
+                        file_type="impute-vcf-merged",
+                        download_url="https://foo.com/bar.vcf.bgz",
+                    )
+                ],
+            ),
+        ],
+    )
+    mocker.patch("gencove.command.utils.time.sleep")
+    mocked_download_file = mocker.patch(
+        "gencove.command.projects.get_merged_vcf.main.download.utils."
+        "download_file"
+    )
+    res = runner.invoke(
+        create_merged_vcf,
+        [project_id, "--wait", "--no-progress", "--api-key", "foo"],
+    )
+    assert res.exit_code == 0
+    assert mocked_get_project.call_count == 2
+    mocked_download_file.assert_called_once_with(
+        "bar.vcf.bgz", "https://foo.com/bar.vcf.bgz", no_progress=True
+    )
+
+
+def test_create_merged_vcf__wait_failed(mocker):
+    """Test waiting for a failed merge exits with a distinct code."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    merge = ProjectMergeVCFs(
+        id=str(uuid4()),
+        last_status=dict(
+            id=str(uuid4()),
+            status="failed",
+            created="2020-07-28T12:46:22.719862Z",
+        ),
+    )
+    mocker.patch.object(APIClient, "create_merged_vcf", return_value=merge)
+    mocker.patch.object(APIClient, "retrieve_merged_vcf", return_value=merge)
+    mocked_get_project = mocker.patch.object(APIClient, "get_project")
+    res = runner.invoke(
+        create_merged_vcf, [str(uuid4()), "--wait", "--api-key", "foo"]
+    )
+    assert res.exit_code == 4
+    assert "failed" in res.output
+    mocked_get_project.assert_not_called()
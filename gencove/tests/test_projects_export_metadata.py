@@ -0,0 +1,147 @@
+"""Test project export metadata command."""
+import csv
+import json
+from uuid import uuid4
+
+from click.testing import CliRunner
+
+import pytest
+
+from gencove.client import APIClient, APIClientError  # noqa: I100
+from gencove.command.projects.cli import export_metadata
+from gencove.models import ProjectSamples, SampleMetadata
+
+
+def _mock_project(mocker, count=25):
+    """Mock two pages of project samples and their metadata."""
+    samples = [
+        {"id": str(uuid4()), "client_id": "client-{}".format(i)}
+        for i in range(count)
+    ]
+    half = count // 2
+    mocked_get_project_samples = mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        side_effect=[
+            ProjectSamples(
+                results=samples[:half],
+                meta={"next": "https://foo.com/?offset={}".format(half)},
+            ),
+            ProjectSamples(results=samples[half:], meta={"next": None}),
+        ],
+    )
+    metadata = {sample["id"]: {"index": i} for i, sample in enumerate(samples)}
+    mocked_get_metadata = mocker.patch.object(
+        APIClient,
+        "get_metadata",
+        side_effect=lambda sample_id: SampleMetadata(
+            metadata=metadata[str(sample_id)]
+        ),
+    )
+    return samples, mocked_get_project_samples, mocked_get_metadata
+
+
+def test_export_metadata__jsonl_stdout(mocker):
+    """Test metadata of all pages is exported in order as JSON lines."""
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    samples, mocked_get_project_samples, mocked_get_metadata = _mock_project(
+        mocker
+    )
+    res = runner.invoke(
+        export_metadata,
+        [str(uuid4()), "--email", "foo@bar.com", "--password", "123"],
+    )
+    assert res.exit_code == 0
+    mocked_login.assert_called_once()
+    assert mocked_get_project_samples.call_count == 2
+    assert mocked_get_metadata.call_count == len(samples)
+    rows = [json.loads(line) for line in res.output.splitlines()]
+    assert rows == [
+        {
+            "sample_id": sample["id"],
+            "client_id": sample["client_id"],
+            "metadata": {"index": i},
+        }
+        for i, sample in enumerate(samples)
+    ]
+
+
+def test_export_metadata__csv_file(mocker):
+    """Test metadata is exported to CSV deduced from file extension."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    samples, _, _ = _mock_project(mocker, count=4)
+    with runner.isolated_filesystem():
+        res = runner.invoke(
+            export_metadata,
+            [str(uuid4()), "--output", "metadata.csv", "--api-key", "foo"],
+        )
+        assert res.exit_code == 0
+        assert "Metadata of 4 samples exported to metadata.csv" in res.output
+        with open("metadata.csv", newline="") as metadata_file:
+            rows = list(csv.DictReader(metadata_file))
+    assert [
+        (row["sample_id"], json.loads(row["metadata"])) for row in rows
+    ] == [(sample["id"], {"index": i}) for i, sample in enumerate(samples)]
+
+
+def test_export_metadata__parquet(mocker):
+    """Test metadata is exported to parquet."""
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    samples, _, _ = _mock_project(mocker, count=4)
+    with runner.isolated_filesystem():
+        res = runner.invoke(
+            export_metadata,
+            [str(uuid4()), "--output", "metadata.parquet", "--api-key", "foo"],
+        )
+        assert res.exit_code == 0
+        table = pyarrow_parquet.read_table("metadata.parquet")
+    assert table.column("sample_id").to_pylist() == [
+        sample["id"] for sample in samples
+    ]
+
+
+def test_export_metadata__parquet_without_pyarrow(mocker):
+    """Test parquet output is rejected when pyarrow is missing."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocker.patch(
+        "gencove.command.projects.export_metadata.main.has_pyarrow",
+        return_value=False,
+    )
+    mocked_get_project_samples = mocker.patch.object(
+        APIClient, "get_project_samples"
+    )
+    res = runner.invoke(
+        export_metadata,
+        [
+            str(uuid4()),
+            "--format",
+            "parquet",
+            "--output",
+            "metadata.parquet",
+            "--api-key",
+            "foo",
+        ],
+    )
+    assert res.exit_code == 1
+    assert "Parquet output requires pyarrow" in res.output
+    mocked_get_project_samples.assert_not_called()
+
+
+def test_export_metadata__no_project(mocker):
+    """Test project that does not exist."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        side_effect=APIClientError(message="", status_code=404),
+    )
+    project_id = str(uuid4())
+    res = runner.invoke(export_metadata, [project_id, "--api-key", "foo"])
+    assert res.exit_code == 1
+    assert "Project {} does not exist.".format(project_id) in res.output
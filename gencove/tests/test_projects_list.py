@@ -308,3 +308,54 @@ def test_list_projects__with_unexpected_keys(mocker):
         )
     )
     assert output_line.getvalue() == res.output.encode()
+
+
+def test_list_projects__shared_pipeline_capabilities(mocker):
+    """Test pipeline capabilities are fetched once per pipeline."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    pipeline_id = MOCKED_PIPELINE_CAPABILITY["id"]
+    projects = [
+        dict(MOCKED_PROJECTS["results"][0], id=str(uuid4()))
+        for _ in range(3)
+    ]
+    other_pipeline = dict(
+        MOCKED_PIPELINE_CAPABILITY, id=str(uuid4()), name="other"
+    )
+    projects.append(
+        dict(
+            MOCKED_PROJECTS["results"][0],
+            id=str(uuid4()),
+            pipeline_capabilities=other_pipeline["id"],
+        )
+    )
+    mocker.patch.object(
+        APIClient,
+        "list_projects",
+        side_effect=[
+            Projects(meta=dict(next="next"), results=projects[:2]),
+            Projects(meta=dict(next=None), results=projects[2:]),
+        ],
+    )
+    pipelines = {
+        pipeline_id: PipelineCapabilities(**MOCKED_PIPELINE_CAPABILITY),
+        other_pipeline["id"]: PipelineCapabilities(**other_pipeline),
+    }
+    mocked_get_pipeline_capabilities = mocker.patch.object(
+        APIClient,
+        "get_pipeline_capabilities",
+        side_effect=lambda pipeline_id: pipelines[str(pipeline_id)],
+    )
+    res = runner.invoke(
+        list_projects, ["--email", "foo@bar.com", "--password", "123"]
+    )
+    assert res.exit_code == 0
+    assert mocked_get_pipeline_capabilities.call_count == 2
+    lines = res.output.splitlines()
+    assert len(lines) == 4
+    assert [line.split("\t")[-1] for line in lines] == [
+        "test capability",
+        "test capability",
+        "test capability",
+        "other",
+    ]
@@ -0,0 +1,120 @@
+"""Test project QC summary command."""
+from uuid import uuid4
+
+from click.testing import CliRunner
+
+from gencove.client import APIClient  # noqa: I100
+from gencove.command.projects.cli import qc_summary
+from gencove.command.projects.qc_summary.utils import percentile
+from gencove.models import ProjectSamples, SampleQC
+
+
+def _sample_qc(coverage, status="pass"):
+    return SampleQC(
+        meta={},
+        results=[
+            {
+                "quality_control_type": {"key": "coverage", "type": "float"},
+                "quality_control": {
+                    "value_expected": 1.0,
+                    "value_measured": coverage,
+                    "status": status,
+                },
+            },
+            {
+                "quality_control_type": {"key": "sex", "type": "str"},
+                "quality_control": {"status": "pass"},
+            },
+        ],
+    )
+
+
+def test_percentile():
+    """Test percentiles are interpolated linearly."""
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0) == 1.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+    assert abs(percentile([1.0, 2.0, 3.0, 4.0], 5) - 1.15) < 1e-9
+    assert percentile([7.0], 95) == 7.0
+
+
+def test_qc_summary(mocker):
+    """Test QC of all samples is summarized with outliers."""
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    sample_ids = [str(uuid4()) for _ in range(20)]
+    mocked_get_project_samples = mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        return_value=ProjectSamples(
+            results=[{"id": sample_id} for sample_id in sample_ids],
+            meta={"next": None},
+        ),
+    )
+    outlier_id = sample_ids[3]
+    mocked_qc_metrics = mocker.patch.object(
+        APIClient,
+        "get_sample_qc_metrics",
+        side_effect=lambda sample_id: _sample_qc(100.0, "fail")
+        if sample_id == outlier_id
+        else _sample_qc(1.0),
+    )
+    with runner.isolated_filesystem():
+        res = runner.invoke(
+            qc_summary,
+            [
+                str(uuid4()),
+                "--outliers",
+                "outliers.tsv",
+                "--email",
+                "foo@bar.com",
+                "--password",
+                "123",
+            ],
+        )
+        assert res.exit_code == 0
+        with open("outliers.tsv") as outliers_file:
+            outliers = outliers_file.read().splitlines()
+    mocked_login.assert_called_once()
+    mocked_get_project_samples.assert_called_once()
+    assert mocked_get_project_samples.call_args[1]["sample_status"] == (
+        "completed"
+    )
+    assert mocked_qc_metrics.call_count == 20
+    lines = res.output.splitlines()
+    assert lines[0].split("\t") == [
+        "key",
+        "samples",
+        "pass",
+        "fail",
+        "mean",
+        "std",
+        "min",
+        "p5",
+        "median",
+        "p95",
+        "max",
+        "outliers",
+    ]
+    assert lines[1].split("\t") == [
+        "coverage",
+        "20",
+        "19",
+        "1",
+        "5.95",
+        "21.5765",
+        "1",
+        "1",
+        "1",
+        "5.95",
+        "100",
+        "1",
+    ]
+    assert lines[2].split("\t") == ["sex", "20", "20", "0"] + [""] * 7 + [
+        "0"
+    ]
+    assert outliers == [
+        "key\tsample_id\tvalue_measured\tz_score",
+        "coverage\t{}\t100\t4.3589".format(outlier_id),
+    ]
+    assert "1 outliers saved to outliers.tsv" in res.output
@@ -203,3 +203,57 @@ def test_restore_project_samples__success(mocker):
     mocked_login.assert_called_once()
     mocked_restore_project_samples.assert_called_once()
     assert "Request to restore samples accepted" in res.output
+
+
+def test_restore_project_samples__sample_ids_file(mocker):
+    """Test restore project samples with sample ids read from stdin."""
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    mocked_restore_project_samples = mocker.patch.object(
+        APIClient, "restore_project_samples", return_value=None
+    )
+    project_id = str(uuid4())
+    sample_ids = [str(uuid4()) for _ in range(3)]
+
+    res = runner.invoke(
+        restore_project_samples,
+        [
+            project_id,
+            "--email",
+            "foo@bar.com",
+            "--password",
+            "123",
+            "--sample-ids-file",
+            "-",
+        ],
+        input="{}\n{},{}\n\n{}\n".format(
+            sample_ids[0], sample_ids[1], sample_ids[2], sample_ids[0]
+        ),
+    )
+    assert res.exit_code == 0
+    mocked_login.assert_called_once()
+    mocked_restore_project_samples.assert_called_once_with(
+        project_id=project_id, sample_ids=sample_ids
+    )
+
+    res = runner.invoke(
+        restore_project_samples,
+        [project_id, "--sample-ids-file", "-"],
+        input="{}\nfoo\nbar\n".format(sample_ids[0]),
+    )
+    assert res.exit_code == 2
+    assert "2 sample ids are not valid: foo, bar" in res.output
+
+    res = runner.invoke(
+        restore_project_samples,
+        [
+            project_id,
+            "--sample-ids",
+            sample_ids[0],
+            "--sample-ids-file",
+            "-",
+        ],
+        input=sample_ids[1],
+    )
+    assert res.exit_code == 2
+    assert "Use either --sample-ids or --sample-ids-file" in res.output
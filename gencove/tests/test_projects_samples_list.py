@@ -1,13 +1,21 @@
 """Test project list samples command."""
 import io
+import json
 import sys
 from datetime import datetime, timedelta
 from uuid import uuid4
 
 from click.testing import CliRunner
 
-from gencove.client import APIClient, APIClientError, APIClientTimeout
+from requests.exceptions import ChunkedEncodingError
+
+from gencove.client import (  # noqa: I100
+    APIClient,
+    APIClientError,
+    APIClientTimeout,
+)
 from gencove.command.projects.cli import list_project_samples
+from gencove.constants import STREAMED_PAGE_SIZE
 from gencove.logger import echo_data
 from gencove.models import ProjectSamples
 
@@ -171,3 +179,268 @@ def test_list_project_samples(mocker):
         )
     )
     assert output_line.getvalue() == res.output.encode()
+
+
+def test_list_project_samples__streamed_pages(mocker):
+    """Test project samples are read from streamed paginated responses."""
+
+    def _sample(client_id):
+        return {
+            "id": str(uuid4()),
+            "client_id": client_id,
+            "last_status": {
+                "id": str(uuid4()),
+                "created": "2020-07-28T12:46:22.719862",
+                "status": "succeeded",
+            },
+            "archive_last_status": {
+                "id": str(uuid4()),
+                "status": "available",
+                "created": "2020-07-28T12:46:22.719862",
+            },
+        }
+
+    pages = [
+        {
+            "meta": {"count": 3, "next": "https://next?offset=2"},
+            "results": [_sample("client 1"), _sample("client 2")],
+        },
+        # meta can come after the results
+        {"results": [_sample("client 3")], "meta": {"count": 3}},
+    ]
+
+    class StreamedResponse:
+        """Streamed response mock."""
+
+        status_code = 200
+
+        def __init__(self, page):
+            self.body = json.dumps(page).encode()
+            self.closed = False
+
+        def iter_content(self, chunk_size):
+            """Return body in small chunks."""
+            assert chunk_size
+            body = self.body
+            while body:
+                yield body[:7]
+                body = body[7:]
+
+        def close(self):
+            """Close response."""
+            self.closed = True
+
+    responses = [StreamedResponse(page) for page in pages]
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    mocked_get = mocker.patch("gencove.client.get", side_effect=responses)
+
+    res = runner.invoke(
+        list_project_samples,
+        [str(uuid4()), "--email", "foo@bar.com", "--password", "123"],
+    )
+    assert res.exit_code == 0
+    mocked_login.assert_called_once()
+    assert mocked_get.call_count == 2
+    assert mocked_get.call_args[1]["stream"] is True
+    assert mocked_get.call_args[1]["params"]["limit"] == STREAMED_PAGE_SIZE
+    assert all(response.closed for response in responses)
+    lines = res.output.splitlines()
+    assert [line.split("\t")[2] for line in lines] == [
+        "client 1",
+        "client 2",
+        "client 3",
+    ]
+
+
+def test_list_project_samples__interrupted_page(mocker):
+    """Test interrupted page is read again without repeating samples."""
+    samples = [
+        {
+            "id": str(uuid4()),
+            "client_id": "client {}".format(index),
+            "last_status": {
+                "id": str(uuid4()),
+                "created": "2020-07-28T12:46:22.719862",
+                "status": "succeeded",
+            },
+            "archive_last_status": {
+                "id": str(uuid4()),
+                "status": "available",
+                "created": "2020-07-28T12:46:22.719862",
+            },
+        }
+        for index in range(3)
+    ]
+    body = json.dumps({"meta": {"next": None}, "results": samples}).encode()
+
+    class StreamedResponse:
+        """Streamed response mock, interrupted after some bytes."""
+
+        status_code = 200
+
+        def __init__(self, interrupt_at=None):
+            self.interrupt_at = interrupt_at
+
+        def iter_content(self, chunk_size):
+            """Return body, raise if the connection is interrupted."""
+            assert chunk_size
+            if self.interrupt_at is None:
+                yield body
+                return
+            yield body[: self.interrupt_at]
+            raise ChunkedEncodingError("Connection broken")
+
+        def close(self):
+            """Close response."""
+
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocker.patch("gencove.client.time.sleep")
+    # interrupted after the second sample
+    interrupt_at = body.index(samples[2]["id"].encode())
+    mocked_get = mocker.patch(
+        "gencove.client.get",
+        side_effect=[StreamedResponse(interrupt_at), StreamedResponse()],
+    )
+
+    res = runner.invoke(
+        list_project_samples,
+        [str(uuid4()), "--email", "foo@bar.com", "--password", "123"],
+    )
+    assert res.exit_code == 0
+    assert mocked_get.call_count == 2
+    lines = res.output.splitlines()
+    assert [line.split("\t")[2] for line in lines] == [
+        "client 0",
+        "client 1",
+        "client 2",
+    ]
+
+
+def test_list_project_samples__page_size(mocker):
+    """Test project samples are requested with given page size."""
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    mocked_get_project_samples = mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        return_value=ProjectSamples(results=[], meta=dict(next=None)),
+    )
+    res = runner.invoke(
+        list_project_samples,
+        [
+            str(uuid4()),
+            "--email",
+            "foo@bar.com",
+            "--password",
+            "123",
+            "--page-size",
+            "500",
+        ],
+    )
+    assert res.exit_code == 0
+    mocked_login.assert_called_once()
+    assert mocked_get_project_samples.call_args[1]["limit"] == 500
+
+
+def test_list_project_samples__bad_page_size(mocker):
+    """Test page size has to be a number or auto."""
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    res = runner.invoke(
+        list_project_samples,
+        [
+            str(uuid4()),
+            "--email",
+            "foo@bar.com",
+            "--password",
+            "123",
+            "--page-size",
+            "many",
+        ],
+    )
+    assert res.exit_code == 2
+    mocked_login.assert_not_called()
+    assert "Invalid value for '--page-size'" in res.output
+
+
+def test_list_project_samples__auto_page_size_shrinks(mocker):
+    """Test adaptive page size is decreased when API times out."""
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    mocked_get_project_samples = mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        side_effect=[
+            APIClientTimeout("Could not connect to the api server"),
+            APIClientTimeout("Could not connect to the api server"),
+            ProjectSamples(results=[], meta=dict(next=None)),
+        ],
+    )
+    res = runner.invoke(
+        list_project_samples,
+        [
+            str(uuid4()),
+            "--email",
+            "foo@bar.com",
+            "--password",
+            "123",
+            "--page-size",
+            "auto",
+        ],
+    )
+    assert res.exit_code == 0
+    mocked_login.assert_called_once()
+    assert mocked_get_project_samples.call_count == 3
+    limits = [
+        call[1]["limit"] for call in mocked_get_project_samples.call_args_list
+    ]
+    assert limits == [
+        STREAMED_PAGE_SIZE,
+        STREAMED_PAGE_SIZE,
+        STREAMED_PAGE_SIZE // 2,
+    ]
+
+
+def test_list_project_samples__output_format(mocker):
+    """Test project samples are output as csv and json lines."""
+    sample = {
+        "id": str(uuid4()),
+        "client_id": "client\tid",
+        "last_status": {
+            "id": str(uuid4()),
+            "created": datetime(2021, 1, 1).isoformat(),
+            "status": "succeeded",
+        },
+        "archive_last_status": {"id": str(uuid4()), "status": "available"},
+    }
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        return_value=ProjectSamples(
+            meta=dict(count=1, next=None), results=[sample]
+        ),
+    )
+    args = [str(uuid4()), "--api-key", "foo", "--format"]
+
+    res = runner.invoke(list_project_samples, args + ["csv"])
+    assert res.exit_code == 0
+    assert res.output.splitlines() == [
+        "status_created,id,client_id,status,archive_status",
+        "2021-01-01T00:00:00,{},client\tid,succeeded,available".format(
+            sample["id"]
+        ),
+    ]
+
+    res = runner.invoke(list_project_samples, args + ["jsonl"])
+    assert res.exit_code == 0
+    assert json.loads(res.output) == {
+        "status_created": "2021-01-01T00:00:00",
+        "id": sample["id"],
+        "client_id": "client\tid",
+        "status": "succeeded",
+        "archive_status": "available",
+    }
@@ -240,3 +240,33 @@ def test_status_merged_vcf__success(mocker):
         )
     )
     assert output_line.getvalue() in res.output.encode()
+
+
+def test_status_merged_vcf__wait_success(mocker):
+    """Test waiting for a merge stops once its status is success."""
+    project_id = str(uuid4())
+
+    def _merge(status):
+        return ProjectMergeVCFs(
+            id=project_id,
+            last_status={
+                "id": str(uuid4()),
+                "status": status,
+                "created": "2020-07-28T12:46:22.719862+00:00",
+            },
+        )
+
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocked_retrieve_merged_vcf = mocker.patch.object(
+        APIClient,
+        "retrieve_merged_vcf",
+        side_effect=[_merge("running"), _merge("success")],
+    )
+    mocker.patch("gencove.command.utils.time.sleep")
+    res = runner.invoke(
+        status_merged_vcf, [project_id, "--wait", "--api-key", "foo"]
+    )
+    assert res.exit_code == 0
+    assert mocked_retrieve_merged_vcf.call_count == 2
+    assert "success" in res.output
@@ -0,0 +1,127 @@
+"""Test project sync and query-samples commands."""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from click.testing import CliRunner
+
+from gencove.client import APIClient  # noqa: I100
+from gencove.command.projects.cli import query_samples, sync
+from gencove.models import ProjectSamples
+
+NOW = datetime(2021, 6, 1, 12, 0, 0)
+
+
+def _sample(client_id, status, archive_status, minutes_ago):
+    return {
+        "id": str(uuid4()),
+        "client_id": client_id,
+        "modified": (NOW - timedelta(minutes=minutes_ago)).isoformat(),
+        "last_status": {
+            "id": str(uuid4()),
+            "status": status,
+            "created": NOW.isoformat(),
+        },
+        "archive_last_status": {
+            "id": str(uuid4()),
+            "status": archive_status,
+        },
+        "files": [
+            {
+                "id": str(uuid4()),
+                "file_type": "impute-vcf",
+                "size": 10,
+                "download_url": "https://foo.com/bar.vcf.gz",
+            }
+        ],
+    }
+
+
+def _query(project_id, *args):
+    res = CliRunner().invoke(
+        query_samples, [project_id, "--database", "samples.db", *args]
+    )
+    assert res.exit_code == 0
+    return [line.split("\t")[2] for line in res.output.splitlines()]
+
+
+def test_sync_and_query_samples(mocker):
+    """Test samples are synced incrementally and queried locally."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    project_id = str(uuid4())
+    samples = [
+        _sample("client 1", "succeeded", "available", 1),
+        _sample("client 2", "failed", "archived", 2),
+        _sample("client 3", "running", "available", 3),
+    ]
+    mocked_get_project_samples = mocker.patch.object(
+        APIClient,
+        "get_project_samples",
+        side_effect=[
+            ProjectSamples(results=samples[:2], meta={"next": "next"}),
+            ProjectSamples(results=samples[2:], meta={"next": None}),
+        ],
+    )
+    args = ["--database", "samples.db", "--api-key", "foo"]
+    with runner.isolated_filesystem():
+        res = runner.invoke(sync, [project_id, *args])
+        assert res.exit_code == 0
+        assert mocked_get_project_samples.call_count == 2
+        assert mocked_get_project_samples.call_args[1]["sort_by"] == (
+            "modified"
+        )
+        assert mocked_get_project_samples.call_args[1]["sort_order"] == (
+            "desc"
+        )
+        assert "Synced 3 samples" in res.output
+
+        assert _query(project_id) == ["client 1", "client 2", "client 3"]
+        assert _query(project_id, "--status", "completed") == [
+            "client 1",
+            "client 2",
+        ]
+        assert _query(project_id, "--status", "running") == ["client 3"]
+        assert _query(project_id, "--archive-status", "archived") == [
+            "client 2"
+        ]
+        assert _query(project_id, "--search", "CLIENT 3") == ["client 3"]
+
+        # only samples modified since the last sync are requested
+        samples[2] = dict(
+            samples[2],
+            modified=NOW.isoformat(),
+            last_status=dict(samples[2]["last_status"], status="succeeded"),
+        )
+        mocked_get_project_samples.reset_mock()
+        mocked_get_project_samples.side_effect = [
+            ProjectSamples(
+                results=[samples[2], samples[0], samples[1]],
+                meta={"next": "next"},
+            ),
+            ProjectSamples(results=[], meta={"next": None}),
+        ]
+        res = runner.invoke(sync, [project_id, *args])
+        assert res.exit_code == 0
+        mocked_get_project_samples.assert_called_once()
+        assert _query(project_id, "--status", "running") == []
+        assert _query(project_id) == ["client 3", "client 1", "client 2"]
+
+        # full sync removes samples no longer in the project
+        mocked_get_project_samples.side_effect = [
+            ProjectSamples(results=samples[2:], meta={"next": None}),
+        ]
+        res = runner.invoke(sync, [project_id, "--full", *args])
+        assert res.exit_code == 0
+        assert "Removed 2 samples" in res.output
+        assert _query(project_id) == ["client 3"]
+
+
+def test_query_samples__not_synced():
+    """Test querying a project which was not synced."""
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        res = runner.invoke(
+            query_samples, [str(uuid4()), "--database", "samples.db"]
+        )
+        assert res.exit_code == 1
+        assert "Run gencove projects sync first" in res.output
@@ -0,0 +1,118 @@
+"""Test samples bulk set metadata command."""
+
+import csv
+import json
+from uuid import uuid4
+
+from click.testing import CliRunner
+
+from gencove.client import APIClient, APIClientError
+from gencove.command.samples.cli import bulk_set_metadata
+
+
+def test_bulk_set_metadata__csv_with_report(mocker):
+    """Test metadata from CSV is assigned and reported per row."""
+    runner = CliRunner()
+    mocked_login = mocker.patch.object(APIClient, "login", return_value=None)
+    mocked_set_metadata = mocker.patch.object(APIClient, "set_metadata")
+    sample_ids = [str(uuid4()) for _ in range(3)]
+
+    with runner.isolated_filesystem():
+        with open("metadata.csv", "w", newline="") as metadata_file:
+            writer = csv.writer(metadata_file)
+            writer.writerow(["sample_id", "metadata"])
+            writer.writerow([sample_ids[0], json.dumps({"foo": "bar"})])
+            writer.writerow([sample_ids[1], "null"])
+            writer.writerow(["1111", "{}"])
+            writer.writerow([sample_ids[2], "{not json"])
+        res = runner.invoke(
+            bulk_set_metadata,
+            [
+                "metadata.csv",
+                "--report",
+                "report.csv",
+                "--email",
+                "foo@bar.com",
+                "--password",
+                "123",
+            ],
+        )
+        assert res.exit_code == 1
+        mocked_login.assert_called_once()
+        assert sorted(
+            call[0] for call in mocked_set_metadata.call_args_list
+        ) == sorted([(sample_ids[0], {"foo": "bar"}), (sample_ids[1], None)])
+        assert "Sample ID is not valid" in res.output
+        assert "Metadata JSON is not valid" in res.output
+        assert "Assigned metadata to 2 samples, 0 failed, 2 invalid" in (
+            res.output
+        )
+        with open("report.csv", newline="") as report_file:
+            report = sorted(
+                (record["row"], record["status"])
+                for record in csv.DictReader(report_file)
+            )
+        assert report == [
+            ("1", "ok"),
+            ("2", "ok"),
+            ("3", "invalid"),
+            ("4", "invalid"),
+        ]
+
+        # resume, only rows that were not assigned are processed
+        mocked_set_metadata.reset_mock()
+        with open("metadata.csv", "a", newline="") as metadata_file:
+            csv.writer(metadata_file).writerow([sample_ids[2], "{}"])
+        res = runner.invoke(
+            bulk_set_metadata,
+            ["metadata.csv", "--report", "report.csv", "--api-key", "foo"],
+        )
+        assert res.exit_code == 1
+        mocked_set_metadata.assert_called_once_with(sample_ids[2], {})
+        assert "2 skipped as already assigned" in res.output
+
+
+def test_bulk_set_metadata__json_lines_stdin(mocker):
+    """Test metadata from JSON lines on stdin, with a failed request."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    sample_ids = [str(uuid4()) for _ in range(25)]
+    missing_id = sample_ids[7]
+
+    def _set_metadata(sample_id, metadata):
+        if sample_id == missing_id:
+            raise APIClientError(message="Not found", status_code=404)
+        return metadata
+
+    mocked_set_metadata = mocker.patch.object(
+        APIClient, "set_metadata", side_effect=_set_metadata
+    )
+    res = runner.invoke(
+        bulk_set_metadata,
+        ["-", "--email", "foo@bar.com", "--password", "123"],
+        input="".join(
+            json.dumps({"sample_id": sample_id, "metadata": [i]}) + "\n"
+            for i, sample_id in enumerate(sample_ids)
+        ),
+    )
+    assert res.exit_code == 1
+    assert mocked_set_metadata.call_count == 25
+    assert "Row 8 ({}): Not found".format(missing_id) in res.output
+    assert "Assigned metadata to 24 samples, 1 failed" in res.output
+
+
+def test_bulk_set_metadata__bad_csv_header(mocker):
+    """Test CSV without required columns is rejected."""
+    runner = CliRunner()
+    mocker.patch.object(APIClient, "login", return_value=None)
+    mocked_set_metadata = mocker.patch.object(APIClient, "set_metadata")
+    res = runner.invoke(
+        bulk_set_metadata,
+        ["-", "--api-key", "foo"],
+        input="id,meta\n{},{{}}\n".format(uuid4()),
+    )
+    assert res.exit_code == 1
+    assert "CSV header must have sample_id and metadata columns" in (
+        res.output
+    )
+    mocked_set_metadata.assert_not_called()
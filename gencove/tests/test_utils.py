@@ -1,24 +1,72 @@
 """Tests for utils of Gencove CLI."""
 import csv
+import datetime
+import io
+import json
 import os
+import threading
+import time
 from enum import Enum
+from uuid import UUID, uuid4
 
 from click.testing import CliRunner
 
+from pydantic import ValidationError as ModelValidationError
+
+import pytest
+
+from gencove.cache import ResponseCache  # noqa: I100
+from gencove.client import APIClient, default_headers
+from gencove.command.download.constants import DownloadPlanItem
+from gencove.command.download.exceptions import DownloadTemplateError
 from gencove.command.download.utils import (
-    _get_prefix_parts,
-    build_file_path,
-    get_download_template_format_params,
+    DownloadTemplate,
+    create_directories,
+    find_collisions,
 )
 from gencove.command.upload.utils import (
     _validate_header,
+    get_transfer_manager,
     parse_fastqs_map_file,
+    plan_transfer,
     upload_file,
 )
-from gencove.command.utils import is_valid_uuid
-from gencove.constants import DOWNLOAD_TEMPLATE, DownloadTemplateParts
+from gencove.command.utils import (
+    PageSizer,
+    RowWriter,
+    find_invalid_uuids,
+    in_shard,
+    is_valid_uuid,
+    read_sample_ids,
+)
+from gencove.constants import (
+    DOWNLOAD_TEMPLATE,
+    DownloadTemplateParts,
+    MAX_PAGE_SIZE,
+    MIN_PAGE_SIZE,
+)
 from gencove.exceptions import ValidationError
-from gencove.utils import enum_as_dict
+from gencove.logger import echo_debug
+from gencove.models import LazyModel, ProjectSamples, SampleDetails
+from gencove.progress import TransferProgress, format_size, write_chunks
+from gencove.serialization import (
+    CustomEncoder,
+    JSONObjectStream,
+    dumps,
+    dumps_payload,
+    loads,
+    model_to_dict,
+)
+from gencove.utils import (
+    GB,
+    MAX_PARTS,
+    MB,
+    MIN_PART_SIZE,
+    MemoryBudget,
+    enum_as_dict,
+    parse_size,
+)
+from gencove.version import version
 
 
 def test_upload_file(mocker):
@@ -37,6 +85,66 @@ def test_upload_file(mocker):
         mocked_s3_client.upload_file.assert_called_once()
 
 
+def test_upload_file__shared_transfer_manager(mocker):
+    """Test uploads through a transfer manager shared between files."""
+    mocked_create_transfer_manager = mocker.patch(
+        "gencove.command.upload.utils.create_transfer_manager"
+    )
+    mocked_transfer_manager = mocked_create_transfer_manager.return_value
+    mocked_transfer_manager.__enter__.return_value = mocked_transfer_manager
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        with open("foo.txt", "w") as fastq_file:
+            fastq_file.write("AAABBB")
+        mocked_s3_client = mocker.Mock()
+        plan = plan_transfer(500 * MB)
+        with get_transfer_manager(mocked_s3_client, plan) as manager:
+            for object_name in ("foo-1.txt", "foo-2.txt"):
+                assert upload_file(
+                    mocked_s3_client,
+                    "foo.txt",
+                    "foo-bucket",
+                    object_name=object_name,
+                    no_progress=True,
+                    transfer_manager=manager,
+                )
+    mocked_s3_client.upload_file.assert_not_called()
+    mocked_create_transfer_manager.assert_called_once()
+    config = mocked_create_transfer_manager.call_args[0][1]
+    assert config.multipart_chunksize == plan.part_size
+    assert config.max_concurrency == plan.concurrency
+    assert mocked_transfer_manager.upload.call_count == 2
+    mocked_transfer_manager.upload.assert_called_with(
+        "foo.txt", "foo-bucket", "foo-2.txt", subscribers=None
+    )
+    assert mocked_transfer_manager.upload.return_value.result.call_count == 2
+    mocked_transfer_manager.__exit__.assert_called_once()
+
+
+def test_plan_transfer():
+    """Test part size and concurrency are picked from the file size."""
+    plan = plan_transfer(MB)
+    assert plan.parts == 1
+    assert plan.concurrency == 1
+    assert plan.part_size == MIN_PART_SIZE
+
+    # enough parts to keep all threads busy
+    plan = plan_transfer(500 * MB)
+    assert plan.concurrency == 10
+    assert plan.parts > 3 * plan.concurrency
+    assert plan.part_size % MB == 0
+
+    # big files stay within memory budget and S3 parts limit
+    for size in (200 * GB, 2000 * GB):
+        plan = plan_transfer(size, budget=512 * MB)
+        assert plan.parts <= MAX_PARTS
+        assert plan.parts * plan.part_size >= size
+        assert (
+            plan.part_size * plan.concurrency <= 512 * MB
+            or plan.concurrency == 1
+        )
+
+
 def test_download_template_tokens():
     """Ensure download tokens are only the ones defined."""
     assert [
@@ -48,101 +156,71 @@ def test_download_template_tokens():
     ] == list(enum_as_dict(DownloadTemplateParts).values())
 
 
-# pylint: disable=too-many-locals
-def test_build_file_path():
-    """Test token combinations when building a file path."""
+def test_download_template__tokens():
+    """Test token combinations when rendering a file path."""
     client_id = "12345"
     gencove_id = "1"
-    deliverable = {
-        "download_url": "https://example.com/file.txt",
-        "file_type": "txt",
+    expected_paths = {
+        DOWNLOAD_TEMPLATE: "12345/1/file.txt",
+        "{client_id}": "12345",
+        "{gencove_id}": "1",
+        "{file_type}": "txt",
+        "{file_extension}": "txt",
+        "{default_filename}": "file.txt",
+        "{default_filename}.{file_extension}": "file.txt.txt",
+        "{default_filename}.{client_id}": "file.txt.12345",
+        "{client_id}.{default_filename}": "12345.file.txt",
+        "{file_extension}_{client_id}": "txt_12345",
+        "{client_id}-{gencove_id}_{file_type}": "12345-1_txt",
+        "{client_id}-{gencove_id}_{file_type}.vcf.gz": "12345-1_txt.vcf.gz",
     }
-    # file with prefix will never have client_id and gencove_id. 0 is default
-    file_with_prefix0 = "{client_id}/{gencove_id}/{default_filename}".format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
-    file_with_prefix1 = "{client_id}".format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
-    file_with_prefix2 = "{gencove_id}".format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
-    file_with_prefix3 = "{file_type}"
-    file_with_prefix4 = "{file_extension}"
-    file_with_prefix5 = "{default_filename}"
-    file_with_prefix6 = "{default_filename}.{file_extension}"
-    file_with_prefix7 = "{default_filename}.{client_id}".format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
-    file_with_prefix8 = "{client_id}.{default_filename}".format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
-    file_with_prefix9 = "{file_extension}_{client_id}".format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
-    download_to = "."
-    runner = CliRunner()
-    with runner.isolated_filesystem():
-        result = build_file_path(deliverable, file_with_prefix0, download_to)
-        # default_filename is always a full filename with any extensions
-        assert result == "./{}/{}/{}".format(
-            client_id, gencove_id, "file.txt"
-        )
-        result = build_file_path(deliverable, file_with_prefix1, download_to)
-        assert result == "./{}".format(client_id)
-        result = build_file_path(deliverable, file_with_prefix2, download_to)
-        assert result == "./{}".format(gencove_id)
-        result = build_file_path(deliverable, file_with_prefix3, download_to)
-        assert result == "./{}".format("txt")
-        result = build_file_path(deliverable, file_with_prefix4, download_to)
-        assert result == "./{}".format("txt")
-        result = build_file_path(deliverable, file_with_prefix5, download_to)
-        assert result == "./{}".format("file.txt")
-        result = build_file_path(deliverable, file_with_prefix6, download_to)
-        assert result == "./{}.{}".format("file.txt", "txt")
-        result = build_file_path(deliverable, file_with_prefix7, download_to)
-        assert result == "./{}.{}".format("file.txt", client_id)
-        result = build_file_path(deliverable, file_with_prefix8, download_to)
-        assert result == "./{}.{}".format(client_id, "file.txt")
-        result = build_file_path(deliverable, file_with_prefix9, download_to)
-        assert result == "./{}_{}".format("txt", client_id)
-
-
-def test___get_filename_dirs_prefix():
-    """Test proper processing of parts in download template."""
-    client_id = "12345"
-    gencove_id = "1"
-    template = DOWNLOAD_TEMPLATE.format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
+    for template, expected_path in expected_paths.items():
+        assert DownloadTemplate(template).file_path(
+            ".", client_id, gencove_id, "txt", "file.txt"
+        ) == os.path.join(".", expected_path)
 
-    resp = _get_prefix_parts(template)
 
-    assert resp.dirs == "{}/{}".format(client_id, gencove_id)
-    assert resp.filename == "{{{}}}".format(
-        DownloadTemplateParts.DEFAULT_FILENAME.value
+def test_download_template():
+    """Test template is rendered for each file and validated once."""
+    template = DownloadTemplate(
+        "{client_id}/{{{gencove_id}}}/{file_type}.{file_extension}"
     )
-    assert resp.file_extension == ""
-
-    template2 = "{client_id}-{gencove_id}_{file_type}".format(
-        **get_download_template_format_params(client_id, gencove_id)
+    assert (
+        template.file_path("out", "c1", "g1", "bam", "s.sorted.bam")
+        == "out/c1/{g1}/bam.sorted.bam"
     )
-    resp = _get_prefix_parts(template2)
-    assert resp.dirs == ""
-    assert resp.filename == "{}-{}_{{{}}}".format(
-        client_id, gencove_id, DownloadTemplateParts.FILE_TYPE.value
+    assert DownloadTemplate(DOWNLOAD_TEMPLATE).file_path(
+        ".", "c1", "g1", "bam", "s.bam"
+    ) == os.path.join(".", "c1", "g1", "s.bam")
+
+    with pytest.raises(DownloadTemplateError):
+        DownloadTemplate("{client_id}/{foo}")
+    with pytest.raises(DownloadTemplateError):
+        DownloadTemplate("{client_id")
+
+
+def test_download_plan(tmp_path):
+    """Test collisions are found and directories created once."""
+    plan = tuple(
+        DownloadPlanItem(
+            sample_id=sample_id,
+            file_type=file_type,
+            file_path=str(tmp_path / sample_id / "{}.txt".format(name)),
+        )
+        for sample_id, file_type, name in (
+            ("1", "qc", "qc"),
+            ("1", "metadata", "metadata"),
+            ("2", "qc", "same"),
+            ("2", "metadata", "same"),
+        )
     )
-    assert resp.file_extension == ""
+    with pytest.raises(TypeError):
+        plan[0].file_path = "foo"
+    assert find_collisions(plan) == [(str(tmp_path / "2" / "same.txt"), 2)]
+    assert find_collisions(plan[:2]) == []
 
-    template3 = "{client_id}-{gencove_id}_{file_type}.vcf.gz".format(
-        **get_download_template_format_params(client_id, gencove_id)
-    )
-    resp = _get_prefix_parts(template3)
-    assert resp.dirs == ""
-    assert resp.filename == "{}-{}_{{{}}}".format(
-        client_id, gencove_id, DownloadTemplateParts.FILE_TYPE.value
-    )
-    assert resp.file_extension == "vcf.gz"
+    create_directories(plan)
+    assert sorted(os.listdir(tmp_path)) == ["1", "2"]
 
 
 def test_parse_fastqs_map_file():
@@ -310,3 +388,558 @@ def test_enum_as_dict():
         "KEY2": "key2",
         "KEY3": "key3",
     }
+
+
+def test_echo_debug__lazy_when_debug_off(mocker):
+    """Test that debug message arguments are not evaluated if debug is off."""
+    mocker.patch("gencove.logger.LOG_LEVEL", "INFO")
+    mocked_echo = mocker.patch("gencove.logger._echo_with_datetime")
+    expensive = mocker.Mock(return_value="foo")
+
+    echo_debug("Value is {}", expensive)
+    echo_debug(expensive)
+
+    expensive.assert_not_called()
+    mocked_echo.assert_not_called()
+
+
+def test_echo_debug__formats_when_debug_on(mocker):
+    """Test that debug message is built from format args and callables."""
+    mocker.patch("gencove.logger.LOG_LEVEL", "DEBUG")
+    mocked_echo = mocker.patch("gencove.logger._echo_with_datetime")
+
+    echo_debug("Value is {} and {}", lambda: "foo", 1)
+    mocked_echo.assert_called_once_with("Value is foo and 1", err=True)
+
+    mocked_echo.reset_mock()
+    echo_debug(lambda: "bar")
+    mocked_echo.assert_called_once_with("bar", err=True)
+
+    mocked_echo.reset_mock()
+    echo_debug("No {} formatting")
+    mocked_echo.assert_called_once_with("No {} formatting", err=True)
+
+
+def _sample_details():
+    return SampleDetails(
+        **{
+            "id": str(uuid4()),
+            "client_id": None,
+            "last_status": {
+                "id": str(uuid4()),
+                "status": "succeeded",
+                "note": None,
+                "created": "2020-07-28T12:46:22.719862Z",
+            },
+            "files": [
+                {
+                    "id": str(uuid4()),
+                    "file_type": "txt",
+                    "download_url": "https://foo.com/bar.txt",
+                }
+            ],
+        }
+    )
+
+
+def test_model_to_dict():
+    """Test that single pass model conversion matches the merged dicts."""
+    sample = _sample_details()
+    expected = {
+        **sample.dict(exclude_unset=True),
+        **sample.dict(exclude_none=True),
+    }
+    result = model_to_dict(sample)
+    assert result == expected
+    assert list(result) == list(expected)
+    assert result["client_id"] is None
+    assert "note" not in result["last_status"]
+
+
+def test_dumps__same_output_as_json(mocker):
+    """Test that dumps output is the same with and without orjson."""
+    data = [
+        {
+            "sample": _sample_details(),
+            "created": datetime.datetime(
+                2020, 1, 1, 10, 0, 0, 123, tzinfo=datetime.timezone.utc
+            ),
+            "id": uuid4(),
+            "floats": [0.1, 1e16, 1.23e-7, 0.00001, -2.0, 1e-4],
+            "text": "tab\t quote\" unicode \u00e9 \U0001F600 del \x7f",
+            "big": 2 ** 70,
+            "empty": [{}, []],
+        },
+    ]
+    expected = json.dumps(data, cls=CustomEncoder, indent=4)
+
+    assert dumps(data, indent=4) == expected
+    del data[0]["big"]
+    expected = json.dumps(data, cls=CustomEncoder, indent=4)
+    assert dumps(data, indent=4) == expected
+    assert dumps(data) == json.dumps(data, cls=CustomEncoder)
+    not_finite = [float("nan"), float("inf"), -float("inf"), None]
+    assert dumps({"not_finite": not_finite}, indent=4) == json.dumps(
+        {"not_finite": not_finite}, cls=CustomEncoder, indent=4
+    )
+
+    mocker.patch("gencove.serialization.orjson", None)
+    assert dumps(data, indent=4) == expected
+
+
+def test_dumps_payload_and_loads():
+    """Test that payload round trips."""
+    sample = _sample_details()
+    payload = {"uploads": [sample], "metadata": {"foo": [1, 2.5, None]}}
+    assert loads(dumps_payload(payload)) == json.loads(
+        json.dumps(payload, cls=CustomEncoder)
+    )
+    assert loads(b'{"big": 123456789012345678901234567890}') == {
+        "big": 123456789012345678901234567890
+    }
+
+
+def test_lazy_model__validates_on_access():
+    """Test that lazy model returns the same values as validated model."""
+    sample = _sample_details()
+    data = json.loads(json.dumps(sample, cls=CustomEncoder))
+    page = {"meta": {"next": None}, "results": [data]}
+    lazy_page = LazyModel(ProjectSamples, page)
+    lazy_sample = lazy_page.results[0]
+
+    assert lazy_page.meta.next is None
+    assert isinstance(lazy_sample.id, UUID)
+    assert lazy_sample.id == sample.id
+    assert lazy_sample.client_id is None
+    assert lazy_sample.archive_last_status is None
+    assert lazy_sample.last_status.created == sample.last_status.created
+    assert lazy_sample.files[0].download_url == sample.files[0].download_url
+    assert dict(lazy_sample.last_status) == dict(sample.last_status)
+    assert lazy_sample.to_model() == sample
+    assert dumps([lazy_sample], indent=4) == dumps([sample], indent=4)
+    # payloads are validated, unknown fields are not sent to the API
+    payload = {"uploads": [LazyModel(SampleDetails, {**data, "foo": 1})]}
+    assert loads(dumps_payload(payload)) == {
+        "uploads": [json.loads(json.dumps(sample, cls=CustomEncoder))]
+    }
+    with pytest.raises(ModelValidationError):
+        dumps_payload({"uploads": [LazyModel(SampleDetails, {"id": "foo"})]})
+    with pytest.raises(AttributeError):
+        lazy_sample.foo  # pylint: disable=pointless-statement
+
+
+def test_lazy_model__invalid_field():
+    """Test that invalid or missing fields fail when accessed."""
+    lazy_sample = LazyModel(SampleDetails, {"id": "foo", "client_id": "1"})
+    assert lazy_sample.client_id == "1"
+    with pytest.raises(ModelValidationError):
+        lazy_sample.id  # pylint: disable=pointless-statement
+    with pytest.raises(ModelValidationError):
+        LazyModel(SampleDetails, {}).id  # pylint: disable=W0106
+
+
+def test_json_object_stream():
+    """Test that streamed array items and other members are parsed."""
+    document = {
+        "meta": {"count": 3, "next": None},
+        "results": [{"id": 1, "name": "\u00e9"}, 12345, 1.5e-7, [], None],
+        "extra": "value",
+    }
+    raw = json.dumps(document, indent=2, ensure_ascii=False).encode()
+    for chunk_size in (1, 3, 64, len(raw)):
+        chunks = [
+            raw[start:end]
+            for start, end in zip(
+                range(0, len(raw), chunk_size),
+                range(chunk_size, len(raw) + chunk_size, chunk_size),
+            )
+        ]
+        stream = JSONObjectStream(chunks)
+        assert stream.fields == {"meta": document["meta"]}
+        assert list(stream) == document["results"]
+        assert stream.fields == {
+            "meta": document["meta"],
+            "extra": "value",
+        }
+
+
+def test_json_object_stream__no_results():
+    """Test stream of an object without the streamed member."""
+    stream = JSONObjectStream([b'{"meta": {"next": null}}'])
+    assert list(stream) == []
+    assert stream.fields == {"meta": {"next": None}}
+
+    stream = JSONObjectStream([b'{"results": [1, 2]}'])
+    stream.finish()
+    assert stream.fields == {}
+
+    with pytest.raises(ValueError):
+        list(JSONObjectStream([b'{"results": [1, 2']))
+
+
+def test_page_sizer__fixed():
+    """Test fixed page size is never changed."""
+    page_sizer = PageSizer(500, default=200)
+    page_sizer.record(500, 10)
+    page_sizer.record(500, 1)
+    assert page_sizer.size == 500
+    assert page_sizer.shrink() is False
+    assert page_sizer.size == 500
+    assert PageSizer(None, default=200).size == 200
+
+
+def test_page_sizer__adaptive():
+    """Test adaptive page size grows while time per item drops."""
+    page_sizer = PageSizer("auto", default=100)
+    page_sizer.record(100, 1.0)
+    assert page_sizer.size == 200
+    # partial pages do not tell anything about the page size
+    page_sizer.record(150, 0.1)
+    assert page_sizer.size == 200
+    page_sizer.record(200, 1.0)
+    assert page_sizer.size == 400
+    # no gain, size is kept from now on
+    page_sizer.record(400, 4.0)
+    assert page_sizer.size == 400
+    page_sizer.record(400, 0.1)
+    assert page_sizer.size == 400
+
+    assert page_sizer.shrink() is True
+    assert page_sizer.size == 200
+    page_sizer.size = MIN_PAGE_SIZE
+    assert page_sizer.shrink() is False
+
+    page_sizer = PageSizer("auto", default=MAX_PAGE_SIZE)
+    page_sizer.record(MAX_PAGE_SIZE, 1.0)
+    assert page_sizer.size == MAX_PAGE_SIZE
+
+
+def test_page_sizer__measure(mocker):
+    """Test page results are passed through and their reading is timed."""
+    # each result and the end of the page is read in 0.25s, the consumer
+    # spends 5s on each result
+    mocker.patch(
+        "gencove.command.utils.time.monotonic",
+        side_effect=[1.25, 6.25, 6.5, 11.5, 11.75, 16.75, 17.0],
+    )
+    page_sizer = PageSizer("auto", default=3)
+    mocked_record = mocker.patch.object(page_sizer, "record")
+    assert list(page_sizer.measure(iter([1, 2, 3]), 1.0)) == [1, 2, 3]
+    mocked_record.assert_called_once_with(3, 1.0)
+
+
+def test_version_and_default_headers_are_cached(mocker):
+    """Test that version files are read once per process."""
+    version.cache_clear()
+    default_headers.cache_clear()
+    mocked_get_data = mocker.patch(
+        "gencove.version.pkgutil.get_data", return_value=b"1\n"
+    )
+    try:
+        assert version() == "1.1.1"
+        assert version() == "1.1.1"
+        assert mocked_get_data.call_count == 3
+        headers = dict(default_headers())
+        assert headers["Gencove-cli-version"] == "1.1.1"
+        assert default_headers() is default_headers()
+    finally:
+        version.cache_clear()
+        default_headers.cache_clear()
+
+
+def test_read_sample_ids():
+    """Test sample ids are read unique, in order and validated together."""
+    sample_ids = [str(uuid4()) for _ in range(3)]
+    lines = io.StringIO(
+        "{} ,{}\n\n {}\n{}\r\nfoo\n".format(
+            sample_ids[0], sample_ids[1], sample_ids[2], sample_ids[1]
+        )
+    )
+    result = list(read_sample_ids(lines))
+    assert result == sample_ids + ["foo"]
+    assert find_invalid_uuids(result) == ["foo"]
+    assert find_invalid_uuids([sample_ids[0].upper()]) == []
+    assert find_invalid_uuids([sample_ids[0].replace("-", "")]) == []
+
+
+def test_in_shard():
+    """Test samples are split into disjoint and stable shards."""
+    sample_ids = [str(UUID(int=i, version=4)) for i in range(1000)]
+    shards = [
+        [s_id for s_id in sample_ids if in_shard(s_id, (index, 4))]
+        for index in range(1, 5)
+    ]
+    assert sorted(s_id for shard in shards for s_id in shard) == sorted(
+        sample_ids
+    )
+    assert all(150 < len(shard) < 350 for shard in shards)
+    # same shard for UUID objects and upper case ids
+    assert in_shard(UUID(shards[1][0]), (2, 4))
+    assert in_shard(shards[1][0].upper(), (2, 4))
+    assert all(in_shard(s_id) for s_id in sample_ids)
+
+
+def test_parse_size():
+    """Test sizes with units are converted to bytes."""
+    assert parse_size("1024") == 1024
+    assert parse_size("512M") == 512 * MB
+    assert parse_size("2g") == 2 * GB
+    assert parse_size("1.5GB") == int(1.5 * GB)
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_memory_budget():
+    """Test reservations wait for memory released by others."""
+    budget = MemoryBudget(100)
+    reserved = []
+
+    def reserve():
+        with budget.reserve(60):
+            reserved.append(True)
+
+    with budget.reserve(60) as nbytes:
+        assert nbytes == 60
+        thread = threading.Thread(target=reserve)
+        thread.start()
+        thread.join(0.1)
+        assert not reserved
+    thread.join(5)
+    assert reserved
+
+    # bigger than the budget waits for the whole budget
+    with budget.reserve(1000) as nbytes:
+        assert nbytes == 100
+
+    budget.resize(200)
+    with budget.reserve(150) as nbytes:
+        assert nbytes == 150
+
+
+def test_transfer_progress__log_lines():
+    """Test progress of concurrent transfers is aggregated."""
+    stream = io.StringIO()
+    progress = TransferProgress("Uploading", stream=stream, interval=3600)
+    callbacks = [
+        progress.add_file("dir-{}/R1.fastq.gz".format(idx), 1000)
+        for idx in range(4)
+    ]
+
+    def transfer(callback):
+        for _ in range(100):
+            callback(10)
+
+    threads = [
+        threading.Thread(target=transfer, args=(callback,))
+        for callback in callbacks
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # nothing is drawn before the interval passes
+    assert stream.getvalue() == ""
+
+    progress._draw(progress._start + 1)  # pylint: disable=protected-access
+    line = stream.getvalue()
+    assert line.startswith("Uploading: 100% 3.9KB/3.9KB 3.9KB/s ")
+    assert "[R1.fastq.gz 100%, R1.fastq.gz 100%, R1.fastq.gz 100%, +1]" in (
+        line
+    )
+
+    for idx in range(4):
+        progress.finish_file("dir-{}/R1.fastq.gz".format(idx))
+    progress.close()
+    assert stream.getvalue().splitlines()[-1].endswith(" 4 done")
+
+
+def test_transfer_progress__terminal():
+    """Test progress line is redrawn in place on a terminal."""
+
+    class Terminal(io.StringIO):
+        """Interactive stream."""
+
+        def isatty(self):
+            """Pretend to be a terminal."""
+            return True
+
+    stream = Terminal()
+    progress = TransferProgress("Downloading", stream=stream, interval=3600)
+    with progress:
+        update = progress.add_file("file.txt", 100)
+        update(50)
+        # drawn by the drawing thread once the interval passes
+        progress._draw(time.monotonic())  # pylint: disable=protected-access
+        update(50)
+        progress.finish_file("file.txt")
+    output = stream.getvalue()
+    assert output.count("\r") == 2
+    assert output.endswith("\n")
+    assert "Downloading: 50% 50B/100B" in output
+
+
+def test_transfer_progress__redrawn_without_updates():
+    """Test progress is redrawn while a transfer does not report bytes."""
+    stream = io.StringIO()
+    progress = TransferProgress("Uploading", stream=stream, interval=0.01)
+    update = progress.add_file("file.txt", 100)
+    update(50)
+    deadline = time.monotonic() + 5
+    while stream.getvalue().count("\n") < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    progress.close()
+    lines = stream.getvalue().splitlines()
+    assert len(lines) >= 2
+    assert all(line.startswith("Uploading: 50% 50B/100B") for line in lines)
+
+
+def test_transfer_progress__failed_file():
+    """Test failed transfer is no longer counted."""
+    stream = io.StringIO()
+    progress = TransferProgress("Downloading", stream=stream, interval=3600)
+    progress.add_file("done.txt", 100)(100)
+    progress.finish_file("done.txt")
+
+    def fail():
+        yield b"x" * 30
+        raise ConnectionError("broken")
+
+    with pytest.raises(ConnectionError):
+        write_chunks(fail(), io.BytesIO(), progress, "failed.txt", 100)
+    progress._draw(progress._start + 1)  # pylint: disable=protected-access
+    progress.close()
+    assert stream.getvalue().startswith("Downloading: 100% 100B/100B ")
+    assert "failed.txt" not in stream.getvalue()
+
+
+def test_transfer_progress__retried_file():
+    """Test retried transfer of a file is not counted twice."""
+    stream = io.StringIO()
+    progress = TransferProgress("Downloading", stream=stream, interval=3600)
+    update = progress.add_file("file.txt", 100)
+    update(30)
+    # retry resumes with the rest of the file
+    update = progress.add_file("file.txt", 70)
+    update(70)
+    progress.finish_file("file.txt")
+    progress._draw(progress._start + 1)  # pylint: disable=protected-access
+    progress.close()
+    assert stream.getvalue().startswith("Downloading: 100% 70B/70B ")
+
+
+def test_format_size():
+    """Test sizes are formatted with the largest fitting unit."""
+    assert format_size(10) == "10B"
+    assert format_size(1536) == "1.5KB"
+    assert format_size(3 * GB) == "3.0GB"
+    assert format_size(2048 * GB) == "2.0TB"
+
+
+def test_response_cache__evicts_least_recently_used(mocker, tmpdir):
+    """Test cache entries over the size limit are evicted."""
+    mocker.patch("gencove.cache.time.time", return_value=1.5)
+    cache = ResponseCache(str(tmpdir), evict_every=1)
+    cache.set("size", {"value": "x" * 50})
+    entry_size = os.path.getsize(os.path.join(str(tmpdir), "size.json"))
+    os.remove(os.path.join(str(tmpdir), "size.json"))
+    cache.max_size = 3 * entry_size
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.set(key, {"value": "x" * 50})
+        path = os.path.join(str(tmpdir), key + ".json")
+        os.utime(path, (i, i))
+    assert cache.get("a") is not None
+    cache.set("d", {"value": "x" * 50})
+    assert cache.get("b") is None
+    assert cache.get("a")["body"] == {"value": "x" * 50}
+    assert cache.get("c") is not None
+    assert cache.get("d") is not None
+    assert not [name for name in os.listdir(str(tmpdir)) if ".tmp" in name]
+
+
+def test_response_cache__evicts_every_few_writes(mocker, tmpdir):
+    """Test cache directory is not scanned on every write."""
+    cache = ResponseCache(str(tmpdir), evict_every=3)
+    mocked_evict = mocker.patch.object(cache, "evict")
+    for key in "abcdefg":
+        cache.set(key, {"value": key})
+    # first write of the process and then every third one
+    assert mocked_evict.call_count == 3
+
+
+def test_api_client__response_cache(mocker, tmpdir):
+    """Test slowly changing responses are cached and revalidated."""
+
+    class Response:
+        """Response mock."""
+
+        def __init__(self, status_code, body=None, etag=None):
+            self.status_code = status_code
+            self.content = json.dumps(body).encode() if body else b""
+            self.headers = {"ETag": etag} if etag else {}
+
+    pipeline = {"id": str(uuid4()), "name": "pipeline"}
+    mocker.patch.dict(os.environ, {"GENCOVE_CACHE_DIR": str(tmpdir)})
+    mocked_get = mocker.patch(
+        "gencove.client.get",
+        side_effect=[Response(200, pipeline, '"v1"'), Response(304)],
+    )
+    mocked_time = mocker.patch("gencove.cache.time.time", return_value=0)
+    mocker.patch("gencove.client.time.time", return_value=0)
+    api_client = APIClient()
+    api_client.set_api_key("foo")
+    assert api_client.get_pipeline_capabilities(pipeline["id"]).name == (
+        "pipeline"
+    )
+    # fresh entry is used without contacting the API, by any client
+    other_client = APIClient()
+    other_client.set_api_key("foo")
+    assert other_client.get_pipeline_capabilities(pipeline["id"]).name == (
+        "pipeline"
+    )
+    assert mocked_get.call_count == 1
+
+    # stale entry is revalidated
+    mocked_time.return_value = 25 * 60 * 60
+    mocker.patch("gencove.client.time.time", return_value=25 * 60 * 60)
+    assert api_client.get_pipeline_capabilities(pipeline["id"]).name == (
+        "pipeline"
+    )
+    assert mocked_get.call_count == 2
+    assert mocked_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+
+    # other users do not share cached responses
+    mocked_get.side_effect = [Response(200, pipeline)]
+    other_user = APIClient()
+    other_user.set_api_key("bar")
+    other_user.get_pipeline_capabilities(pipeline["id"])
+    assert mocked_get.call_count == 3
+    assert "If-None-Match" not in mocked_get.call_args[1]["headers"]
+
+
+def test_row_writer(mocker):
+    """Test rows are formatted and echoed in chunks."""
+    mocked_echo_data = mocker.patch("gencove.command.utils.echo_data")
+    with RowWriter(("id", "name"), buffer_rows=2) as writer:
+        writer.write(["1", "foo\tbar"])
+        mocked_echo_data.assert_not_called()
+        writer.write(["2", None])
+        writer.write(["3", "baz"])
+    assert [call[0][0] for call in mocked_echo_data.call_args_list] == [
+        "1\tfoo bar\n2\t",
+        "3\tbaz",
+    ]
+
+    mocked_echo_data.reset_mock()
+    with RowWriter(("id", "name"), "csv") as writer:
+        writer.write(["1", "foo\tbar, baz"])
+    mocked_echo_data.assert_called_once_with(
+        'id,name\n1,"foo\tbar, baz"'
+    )
+
+    mocked_echo_data.reset_mock()
+    with RowWriter(("id", "name"), "jsonl") as writer:
+        writer.write(["1", "foo\tbar"])
+        writer.write(["2", None])
+    mocked_echo_data.assert_called_once_with(
+        '{"id": "1", "name": "foo\\tbar"}\n{"id": "2", "name": null}'
+    )
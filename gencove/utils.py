@@ -1,32 +1,104 @@
 """Gencove CLI utils."""
 import os
 import re
-
-import boto3
-
-from botocore.credentials import RefreshableCredentials
-from botocore.session import get_session
+import threading
+from contextlib import contextmanager
 
 import click
 
-import progressbar
-
 from gencove.client import APIClientError  # noqa: I100
 from gencove.logger import echo_debug, echo_error, echo_info, echo_warning
 
 KB = 1024
 MB = KB * 1024
 GB = MB * 1024
-NUM_MB_IN_CHUNK = 100
-CHUNK_SIZE = NUM_MB_IN_CHUNK * MB
+# number of threads, and S3 connections, shared by all file transfers
+MAX_CONCURRENCY = 10
+# S3 multipart upload limits
+MAX_PARTS = 10000
+MIN_PART_SIZE = 8 * MB
+MAX_PART_SIZE = 5 * GB
+# memory used by part buffers of all concurrently transferred parts
+MEMORY_BUDGET = 512 * MB
+# parts per thread, so that threads are busy until the end of a transfer
+PARTS_PER_THREAD = 4
 FILENAME_RE = re.compile("filename=(.+)")
 
 
-def get_s3_client_refreshable(refresh_method):
+class MemoryBudget:
+    """Bytes of memory shared by buffers of all concurrent transfers.
+
+    Transfers reserve the memory their buffers will use and wait until
+    enough of it is released by other transfers.
+
+    Args:
+        size (int): budget in bytes
+    """
+
+    def __init__(self, size=MEMORY_BUDGET):
+        self.size = size
+        self._available = size
+        self._condition = threading.Condition()
+
+    def resize(self, size):
+        """Change the budget, memory that is already reserved stays so."""
+        with self._condition:
+            self._available += size - self.size
+            self.size = size
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, nbytes):
+        """Hold nbytes of the budget, waiting until they are available."""
+        with self._condition:
+            # a single reservation can not be bigger than the whole budget
+            nbytes = min(nbytes, self.size)
+            while self._available < nbytes:
+                self._condition.wait()
+            self._available -= nbytes
+        try:
+            yield nbytes
+        finally:
+            with self._condition:
+                self._available += nbytes
+                self._condition.notify_all()
+
+
+# shared by all transfers of the process
+memory_budget = MemoryBudget()  # pylint: disable=invalid-name
+
+
+def parse_size(value):
+    """Parse size in bytes with an optional K, M or G suffix, i.e. "512M".
+
+    Returns:
+        int: number of bytes
+
+    Raises:
+        ValueError: if value is not a valid size
+    """
+    units = {"K": KB, "M": MB, "G": GB}
+    value = str(value).strip().upper().rstrip("B")
+    multiplier = 1
+    if value and value[-1] in units:
+        multiplier = units[value[-1]]
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def get_s3_client_refreshable(refresh_method, max_pool_connections=None):
     """Return thread-safe s3 client with refreshable credentials.
 
     :param refresh_method: function that can get fresh credentials
+    :param max_pool_connections: size of the connection pool, should match
+        number of concurrent transfers using the client
     """
+    # boto3 is slow to import, import it only for commands that need it
+    # pylint: disable=import-outside-toplevel
+    import boto3
+    from botocore.config import Config
+    from botocore.credentials import RefreshableCredentials
+    from botocore.session import get_session
 
     def refresh_to_dict():
         """Turn pydantic model into `dict`. Needed for botocore."""
@@ -44,35 +116,9 @@ def get_s3_client_refreshable(refresh_method):
     return boto3_session.client(
         "s3",
         endpoint_url=os.environ.get("GENCOVE_LOCALSTACK_S3_ENDPOINT") or None,
-    )
-
-
-def get_progress_bar(total_size, action):
-    """Get progressbar.ProgressBar instance for file transfer.
-
-    Args:
-        total_size: int
-        action: str that will be prepended to the progressbar.
-            i.e "Uploading: " or "Downloading: "
-
-    Returns:
-        progressbar.ProgressBar instance
-    """
-    return progressbar.ProgressBar(
-        max_value=total_size,
-        widgets=[
-            action,
-            progressbar.Percentage(),
-            " ",
-            progressbar.Bar(marker="#", left="[", right="]"),
-            " ",
-            progressbar.ETA(),
-            " ",
-            progressbar.Timer(),
-            " ",
-            progressbar.FileTransferSpeed(),
-        ],
-        redirect_stdout=True,
+        config=Config(max_pool_connections=max_pool_connections)
+        if max_pool_connections
+        else None,
     )
 
 
@@ -87,6 +133,8 @@ def get_regular_progress_bar(total_size, action):
     Returns:
         progressbar.ProgressBar instance
     """
+    import progressbar  # pylint: disable=import-outside-toplevel
+
     return progressbar.ProgressBar(
         max_value=total_size,
         redirect_stdout=True,
@@ -1,9 +1,11 @@
 """Utility to generate version string."""
 import pkgutil
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def version():
-    """Return version string."""
+    """Return version string, read once per process."""
     major = pkgutil.get_data(__package__, "version/A-major").strip()
     minor = pkgutil.get_data(__package__, "version/B-minor").strip()
     patch = pkgutil.get_data(__package__, "version/C-patch").strip()
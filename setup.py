@@ -40,6 +40,12 @@ setup(
         "backoff==1.10.0",
         "pydantic==1.8.2",
     ],
+    extras_require={
+        # Faster JSON encoding and decoding of API responses and outputs
+        "fast": ["orjson>=3.5"],
+        # Parquet output of `projects export-metadata`
+        "parquet": ["pyarrow>=3.0"],
+    },
     setup_requires=["pytest-runner"],
     tests_require=["pytest", "pytest-mock"],
     entry_points="""